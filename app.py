@@ -1,59 +1,54 @@
-import argparse, json, sys, re
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
+import argparse, json, os, sys, re, threading, time
 from rule_engine import RuleEngine, EvaluationError
-from providers.mock_provider import MockProvider
-from providers.ollama_provider import OllamaProvider
-from providers.openrouter_provider import OpenRouterProvider
+from engine_metrics import report_stats
+from json_extract import extract_json_object
+from providers.cache import CachingProvider
+from providers.registry import builtin_providers, create_provider, get_provider_class
+
+# Imports lourds (matplotlib, requests via les providers, numpy, pools) faits à la demande :
+# le coût de démarrage suit ce que la commande utilise réellement.
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "providers")
 
 
 # --- plotting Hilbert B ---
-def visualize_hilbertB():
+def visualize_hilbertB(out=None, source=None):
     """
-    Illustration simple de Hilbert B : ovales imbriqués et séparés.
+    Illustration de Hilbert B : ovales imbriqués et séparés (ou l'arrangement JSON SOURCE).
+    Avec OUT, image écrite sans écran (Agg, PNG/SVG selon l'extension) ; sinon fenêtre pyplot.
     """
-    fig, ax = plt.subplots(figsize=(6,6))
-    ax.set_aspect("equal")
-    ax.set_title("Hilbert B – Ovale, Nids et Distributions")
-
-    # Exemple de nid imbriqué
-    ax.add_patch(Circle((0,0), 1, fill=False, color="blue", lw=2))
-    ax.add_patch(Circle((0,0), 0.8, fill=False, color="red", lw=2))
-    ax.add_patch(Circle((0,0), 0.6, fill=False, color="green", lw=2))
+    from hilbertB.arrangement import Arrangement, example_arrangement
+    from hilbertB.render import draw_arrangement, render_arrangement
 
-    # Exemple de nids disjoints
-    ax.add_patch(Circle((-0.6,-0.6), 0.3, fill=False, color="purple", lw=2))
-    ax.add_patch(Circle((0.6,0.6), 0.4, fill=False, color="orange", lw=2))
-
-    ax.set_xlim(-1.5,1.5)
-    ax.set_ylim(-1.5,1.5)
+    arr = Arrangement.load(source) if source else example_arrangement()
+    title = "Hilbert B – Ovale, Nids et Distributions"
+    if out:
+        info = render_arrangement(arr, out, title=title)
+        print(f"Figure écrite : {out} ({info['drawn']} ovale(s), {info['culled']} écarté(s))")
+        return info
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.set_title(title)
+    draw_arrangement(ax, arr)
     plt.show()
 
 
-
 # ---------- Sanitizer utils ----------
-def _extract_inner_json(text: str) -> str:
-    """Retourne le JSON pur { ... } depuis un texte avec blabla / ```json ... ``` / etc."""
-    try:
-        json.loads(text)
-        return text
-    except Exception:
-        pass
-    m = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, flags=re.S|re.I)
-    if m:
-        return m.group(1)
-    m = re.search(r"(\{.*\})", text, flags=re.S)
-    return m.group(1) if m else text
-
 def sanitize_payload(payload):
     """
-    - Si provider renvoie une string -> extraire le JSON pur.
+    - Si provider renvoie une string -> extraire le JSON pur (un seul passage, cf. json_extract).
     - Garante: dsl=str, evals=list[str], final=str.
     - Si dsl est une liste/objet -> convertir en lignes 'DEFINE ... WITH ...'.
     - Si dsl est une string MAIS contient un JSON entre ```...``` -> on l’extrait et on reconstruit.
     """
     if isinstance(payload, str):
-        payload = json.loads(_extract_inner_json(payload))
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            found = extract_json_object(payload)
+            if found is None:
+                raise
+            payload = found
 
     dsl = payload.get("dsl", "")
     evals = payload.get("evals", [])
@@ -61,14 +56,11 @@ def sanitize_payload(payload):
 
     # Cas 1 : dsl == string mais contient un JSON (code fence) -> extrait
     if isinstance(dsl, str) and "```" in dsl:
-        inner = _extract_inner_json(dsl)
-        try:
-            inner_obj = json.loads(inner)
+        inner_obj = extract_json_object(dsl)
+        if inner_obj is not None:
             dsl   = inner_obj.get("dsl", dsl)
             evals = inner_obj.get("evals", evals) or evals
             final = inner_obj.get("final", final) or final
-        except Exception:
-            pass
 
     # Cas 2 : dsl arrive comme une LISTE -> la convertir en lignes DEFINE … WITH …
     if isinstance(dsl, list):
@@ -104,24 +96,120 @@ def sanitize_payload(payload):
 # ---------- /Sanitizer utils ----------
 
 
-def main():
+def make_provider(name: str, model: str, cache_dir: str = None, cache_ttl: float = 7 * 24 * 3600):
+    provider = create_provider(name, model=model)
+    if cache_dir:
+        provider = CachingProvider(provider, cache_dir, ttl=cache_ttl)
+    return provider
+
+
+def solve_problem(provider, problem: str, orientation: str = "+", tests=None,
+                  no_evals: bool = False, engine_factory=RuleEngine, pool=None, timed: bool = False) -> dict:
+    """
+    Un problème de bout en bout (provider -> sanitize -> DSL -> evals), sans affichage.
+    Returns {"payload", "evals", "tests", "timings"}; eval/test items are
+    {"expr", "result", "error"}. Timings are in seconds per stage.
+    With an EnginePool (engine_pool.py), a DSL already seen reuses its compiled engine.
+    timed=True adds each evaluation's duration in nanoseconds ("ns") for the results store.
+    """
+    timings = {}
+    t0 = time.perf_counter()
+    raw_payload = provider.solve(problem)
+    t1 = time.perf_counter()
+    payload = sanitize_payload(raw_payload)
+    t2 = time.perf_counter()
+    timings["provider"], timings["sanitize"] = t1 - t0, t2 - t1
+    result = {"payload": payload, "evals": [], "tests": [], "timings": timings}
+    if not payload.get("dsl", "").strip():
+        result["error"] = "Aucune DSL reçue"
+        timings["total"] = t2 - t0
+        return result
+
+    if pool is not None:
+        engine = pool.get(payload["dsl"], orientation)
+    else:
+        engine = engine_factory(orientation=orientation)
+        engine.load_rules_from_text(payload["dsl"])
+    t3 = time.perf_counter()
+    timings["load"] = t3 - t2
+
+    def run(exprs):
+        out = []
+        for e in exprs:
+            t = time.perf_counter_ns()
+            try:
+                item = {"expr": e, "result": engine.evaluate_expression(e), "error": None}
+            except EvaluationError as ex:
+                item = {"expr": e, "result": None, "error": str(ex)}
+            if timed:
+                item["ns"] = time.perf_counter_ns() - t
+            out.append(item)
+        return out
+
+    if not no_evals:
+        result["evals"] = run(payload.get("evals", []))
+    result["tests"] = run(tests or [])
+    t4 = time.perf_counter()
+    timings["evals"], timings["total"] = t4 - t3, t4 - t0
+    return result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        return batch_main(argv[1:])
+    if argv and argv[0] == "sweep":
+        from sweep import main as sweep_main
+        return sweep_main(argv[1:])
+    if argv and argv[0] == "patchwork":
+        from hilbertB.patchwork import main as patchwork_main
+        return patchwork_main(argv[1:])
+    if argv and argv[0] == "schemes":
+        from hilbertB.schemes import main as schemes_main
+        return schemes_main(argv[1:])
+    if argv and argv[0] == "render":
+        from hilbertB.render import main as render_main
+        return render_main(argv[1:])
+    if argv and argv[0] == "results":
+        from results_store import main as results_main
+        return results_main(argv[1:])
+    if argv and argv[0] == "curve":
+        from hilbertB.curves import main as curve_main
+        return curve_main(argv[1:])
+
     p = argparse.ArgumentParser(description="Conceptual Solver IA (⊘/∞)")
-    p.add_argument("--provider", choices=["ollama", "openrouter", "mock"], default="mock")
+    p.add_argument("--provider", default="mock",
+                   help=f"{' | '.join(builtin_providers())} ou un provider déclaré en entry point")
     p.add_argument("--model", default="llama3.1")
     p.add_argument("--problem", required=True)
     p.add_argument("--orientation", choices=["+","-"], default="+")
     p.add_argument("--test", action="append")
     p.add_argument("--no-evals", action="store_true")
-    p.add_argument("--plot", action="store_true", help="Visualiser Hilbert B (ovales imbriqués/disjoints)")
-    args = p.parse_args()
+    p.add_argument("--plot", nargs="?", const="", metavar="ARRANGEMENT",
+                   help="Visualiser Hilbert B (ovales imbriqués/disjoints, ou un arrangement JSON)")
+    p.add_argument("--out", help="avec --plot : fichier image (PNG/SVG) au lieu d'une fenêtre")
+    p.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache disque des réponses provider")
+    p.add_argument("--cache-ttl", type=float, default=7 * 24 * 3600, help="Durée de vie du cache (s)")
+    p.add_argument("--no-cache", action="store_true", help="Toujours interroger le provider")
+    p.add_argument("--stream", action="store_true", help="Charger la DSL et évaluer au fil de la génération")
+    p.add_argument("--stats", nargs="?", const="", metavar="FICHIER",
+                   help="Métriques du moteur par opérateur : table, JSON sur stdout ('-') ou dans FICHIER")
+    p.add_argument("--sandbox", action="store_true",
+                   help="Évaluer les lois dans un processus isolé, avec budgets de temps et de mémoire")
+    p.add_argument("--law-timeout", type=float, default=1.0, help="avec --sandbox : secondes par évaluation")
+    p.add_argument("--law-memory", type=int, default=256, help="avec --sandbox : Mo par processus d'évaluation")
+    p.add_argument("--store", metavar="DB", help="Enregistrer le run et ses évaluations (SQLite, voir results_store.py)")
+    args = p.parse_args(argv)
 
     # Provider
-    if args.provider == "ollama":
-        provider = OllamaProvider(model=args.model)
-    elif args.provider == "openrouter":
-        provider = OpenRouterProvider(model=args.model)
-    else:
-        provider = MockProvider()
+    try:
+        provider = make_provider(args.provider, args.model,
+                                 None if args.no_cache else args.cache_dir, args.cache_ttl)
+    except KeyError as ex:
+        p.error(ex.args[0])
+
+    if args.stream:
+        return run_streaming(provider, args)
 
     # 1 seul appel provider
     raw_payload = provider.solve(args.problem)
@@ -141,36 +229,246 @@ def main():
         print("Aucune DSL reçue. Arrêt.")
         sys.exit(1)
 
-    engine = RuleEngine(orientation=args.orientation)
-    engine.load_rules_from_text(dsl)
+    engine = sandbox = None
+    if args.sandbox:
+        # pas de moteur local : les lois ne sont compilées que dans le worker, sous budget
+        from sandbox import SandboxPool
+        sandbox = SandboxPool(dsl, workers=1, timeout=args.law_timeout, memory_mb=args.law_memory,
+                              orientation=args.orientation)
+        evaluate = sandbox.evaluate_expression
+    else:
+        engine = RuleEngine(orientation=args.orientation, metrics=args.stats is not None)
+        engine.load_rules_from_text(dsl)
+        evaluate = engine.evaluate_expression
 
-    # Evaluate provider evals
-    if not args.no_evals:
-        for e in evals:
+    def run(exprs, tag):
+        items = []
+        for e in exprs:
+            t = time.perf_counter_ns()
             try:
-                res = engine.evaluate_expression(e)
-                print(f"[EVAL IA] {e} => {res}")
+                res = evaluate(e)
+                items.append({"expr": e, "result": res, "error": None, "ns": time.perf_counter_ns() - t})
+                print(f"[{tag}] {e} => {res}")
             except EvaluationError as ex:
-                print(f"[EVAL IA] {e} => ERREUR: {ex}")
+                items.append({"expr": e, "result": None, "error": str(ex), "ns": time.perf_counter_ns() - t})
+                print(f"[{tag}] {e} => ERREUR: {ex}")
+        return items
 
-    # Evaluate user tests
-    if args.test:
-        for t in args.test:
-            try:
-                res = engine.evaluate_expression(t)
-                print(f"[TEST YOU] {t} => {res}")
-            except EvaluationError as ex:
-                print(f"[TEST YOU] {t} => ERREUR: {ex}")
+    # Evaluate provider evals, then user tests
+    eval_items = run(evals, "EVAL IA") if not args.no_evals else []
+    test_items = run(args.test or [], "TEST YOU")
+    if sandbox is not None:
+        sandbox_stats = sandbox.stats()
+        sandbox.close()
+    if args.store:
+        from results_store import ResultsStore
+        with ResultsStore(args.store) as store:
+            store.record_run(args.problem, args.provider, args.model, dsl, args.orientation,
+                             eval_items, test_items, final=final)
 
     # Show final answer
     if final:
         print("\n=== SOLUTION PROPOSÉE ===")
         print(final)
 
+    if args.stats is not None:
+        if engine is not None:
+            report_stats(engine.stats(), args.stats)
+        elif args.stats:
+            report_stats(sandbox_stats, args.stats)  # JSON : workers, redémarrages, lois pénalisées
+        else:
+            print(f"\n=== STATS SANDBOX ===\n{json.dumps(sandbox_stats, ensure_ascii=False)}")
+
     # Plot option
-    if args.plot:
-        visualize_hilbertB()
+    if args.plot is not None:
+        visualize_hilbertB(args.out, args.plot or None)
+
+
+def run_streaming(provider, args):
+    """--stream : règles chargées et evals exécutées dès que leurs lignes sont complètes."""
+    from dsl_stream import StreamingSession
+    engine = RuleEngine(orientation=args.orientation, metrics=args.stats is not None)
+    session = StreamingSession(engine)
+
+    def report(events):
+        for kind, *data in events:
+            if kind == "rule":
+                print(f"[DSL] {data[0]}")
+            elif kind == "error":
+                print(f"[DSL] {data[0]} => ERREUR: {data[1]}")
+            elif not args.no_evals:
+                expr, res, err = data
+                print(f"[EVAL IA] {expr} => {res}" if err is None else f"[EVAL IA] {expr} => ERREUR: {err}")
+
+    for chunk in provider.solve_stream(args.problem):
+        report(session.feed(chunk))
+    payload = session.finish(sanitize_payload)
+    report(session.events)
+
+    if not session.rules:
+        print("Aucune DSL reçue. Arrêt.")
+        sys.exit(1)
+    if session.first_result_at is not None:
+        print(f"[stream] premier résultat après {session.first_result_at:.3f}s")
+
+    for t in args.test or []:
+        try:
+            print(f"[TEST YOU] {t} => {engine.evaluate_expression(t)}")
+        except EvaluationError as ex:
+            print(f"[TEST YOU] {t} => ERREUR: {ex}")
+
+    if payload.get("final"):
+        print("\n=== SOLUTION PROPOSÉE ===")
+        print(payload["final"])
+    if args.stats is not None:
+        report_stats(engine.stats(), args.stats)
+    if args.plot is not None:
+        visualize_hilbertB(args.out, args.plot or None)
+
+
+# ---------- Mode batch JSONL ----------
+_worker = threading.local()
+_worker_config = ("mock", "llama3.1", None, 7 * 24 * 3600)
+_engine_pool = None
+
+
+def _set_worker_config(*config):
+    # initializer des processus ; les threads partagent la config (et le pool de moteurs) du processus principal
+    global _worker_config, _engine_pool
+    from engine_pool import EnginePool
+    _worker_config = config
+    _engine_pool = EnginePool()
+
+
+def _solve_batch_item(item_id, problem, orientation, tests, no_evals, timed=False):
+    if not hasattr(_worker, "provider"):
+        # un provider par thread / processus, réutilisé pour tous ses problèmes
+        _worker.provider = make_provider(*_worker_config)
+    try:
+        res = solve_problem(_worker.provider, problem, orientation, tests, no_evals, pool=_engine_pool, timed=timed)
+    except Exception as ex:  # un problème en échec n'arrête pas le lot
+        res = {"error": f"{type(ex).__name__}: {ex}"}
+    return dict({"id": item_id}, **res)
+
+
+def read_problems(path: str):
+    """(id, problem) par ligne : {"id"|"request_id", "problem"|"body"|"prompt"}."""
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            item_id = str(obj.get("id", obj.get("request_id", n)))
+            problem = obj.get("problem") or obj.get("body") or obj.get("prompt") or ""
+            yield item_id, problem, obj.get("tests")
+
+
+def completed_ids(path: str) -> set:
+    """Ids déjà traités sans erreur ; tronque une dernière ligne incomplète (run interrompu)."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+    for line in data.decode("utf-8").splitlines():
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            continue
+        if "error" not in obj:
+            done.add(str(obj.get("id")))
+    return done
+
+
+def _wait_first(pending):
+    from concurrent.futures import FIRST_COMPLETED, wait
+    return wait(pending, return_when=FIRST_COMPLETED)
+
+
+def batch_main(argv):
+    p = argparse.ArgumentParser(prog="app.py batch", description="Résoudre un lot de problèmes JSONL")
+    p.add_argument("--in", dest="inp", required=True, help="problèmes JSONL")
+    p.add_argument("--out", required=True, help="résultats JSONL (ajout, reprise automatique)")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--processes", action="store_true", help="pool de processus au lieu de threads")
+    p.add_argument("--provider", default="mock",
+                   help=f"{' | '.join(builtin_providers())} ou un provider déclaré en entry point")
+    p.add_argument("--model", default="llama3.1")
+    p.add_argument("--orientation", choices=["+","-"], default="+")
+    p.add_argument("--no-evals", action="store_true")
+    p.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    p.add_argument("--cache-ttl", type=float, default=7 * 24 * 3600)
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--store", metavar="DB", help="enregistrer aussi chaque run dans une base SQLite")
+    args = p.parse_args(argv)
+    try:
+        get_provider_class(args.provider)
+    except KeyError as ex:
+        p.error(ex.args[0])
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    config = (args.provider, args.model, None if args.no_cache else args.cache_dir, args.cache_ttl)
+    done = completed_ids(args.out)
+    todo = ((i, prob, tests) for i, prob, tests in read_problems(args.inp) if i not in done)
+
+    _set_worker_config(*config)
+    if args.processes:
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_set_worker_config, initargs=config)
+    else:
+        pool = ThreadPoolExecutor(max_workers=args.workers)
+
+    store = None
+    if args.store:
+        from results_store import ResultsStore
+        store = ResultsStore(args.store)
+    problems = {}  # id -> énoncé, pour le stockage des résultats
+    written = failed = 0
+
+    def finish(res):
+        nonlocal written, failed
+        failed += _write_result(out, res)
+        written += 1
+        if store is not None:
+            store.record_result(res, problems.pop(res["id"], ""), args.provider, args.model, args.orientation)
+
+    try:
+        with pool, open(args.out, "a", encoding="utf-8") as out:
+            pending = set()
+            for item in todo:
+                # fenêtre bornée : le fichier d'entrée n'est jamais chargé en entier
+                if len(pending) >= args.workers * 4:
+                    finished, pending = _wait_first(pending)
+                    for fut in finished:
+                        finish(fut.result())
+                item_id, problem, tests = item
+                if store is not None:
+                    problems[item_id] = problem
+                pending.add(pool.submit(_solve_batch_item, item_id, problem, args.orientation, tests,
+                                        args.no_evals, store is not None))
+            while pending:
+                finished, pending = _wait_first(pending)
+                for fut in finished:
+                    finish(fut.result())
+    finally:
+        if store is not None:
+            store.close()
+
+    print(f"{written} résultat(s) écrits dans {args.out} ({len(done)} déjà présents, {failed} en erreur)",
+          file=sys.stderr)
+    if not args.processes and written:
+        st = _engine_pool.stats()
+        print(f"moteurs : {st['engines']} compilé(s), {st['hit_rate']:.0%} de DSL réutilisées", file=sys.stderr)
+    return 0 if not failed else 2
+
+
+def _write_result(out, res: dict) -> int:
+    out.write(json.dumps(res, ensure_ascii=False) + "\n")
+    out.flush()
+    return 1 if "error" in res else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""hilbertB.arrangement : arbre d'imbrication par balayage (nids en grille, nid unique profond)."""
+from harness import benchmark
+
+
+def _build(circles):
+    def factory():
+        from hilbertB.arrangement import Arrangement, Oval
+        ovals = [Oval.circle(*c) for c in circles]
+        return lambda: Arrangement(ovals).build()
+    return factory
+
+
+GRID = [((k % 100) * 3.0, (k // 100) * 3.0, 1.2 - 0.2 * d) for k in range(4000) for d in range(5)]
+benchmark("arrangement[20k ovals, 4k nests]")(_build(GRID))
+benchmark("arrangement[20k ovals, one nest]")(_build([(0, 0, 1 + 1e-3 * i) for i in range(20000)]))
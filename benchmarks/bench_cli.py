@@ -0,0 +1,45 @@
+"""Bout en bout : `python app.py --provider mock` et `python solver_cli.py` dans un processus neuf."""
+import os, subprocess, sys
+
+from harness import benchmark, ROOT
+
+
+def _run(*args):
+    def factory():
+        cmd = [sys.executable, *args]
+        return lambda: subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return factory
+
+
+benchmark("cli.app[mock partie A]")(_run(os.path.join(ROOT, "app.py"), "--provider", "mock",
+                                          "--problem", "Harnack partie A", "--no-cache"))
+benchmark("cli.app[mock partie B]")(_run(os.path.join(ROOT, "app.py"), "--provider", "mock",
+                                          "--problem", "partie B", "--no-cache"))
+benchmark("cli.solver_cli[6 ⊕ 6]")(_run(os.path.join(ROOT, "solver_cli.py"), "6 ⊕ 6"))
+
+
+def _daemon():
+    import threading
+    from solver_daemon import make_server
+    server = make_server("127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _remote(exprs):
+    def factory():
+        from solver_cli import evaluate_remote
+        url = _daemon()
+        return lambda: evaluate_remote(url, exprs)
+    return factory
+
+
+benchmark("daemon.eval[1 expr]")(_remote(["6 ⊕ 6"]))
+benchmark("daemon.eval[100 exprs]")(_remote([f"{n} ⊕ {n}" for n in range(100)]))
+
+
+@benchmark("cli.solver_cli[daemon 6 ⊕ 6]")
+def _cli_daemon():
+    url = _daemon()
+    cmd = [sys.executable, os.path.join(ROOT, "solver_cli.py"), "6 ⊕ 6", "--server", url]
+    return lambda: subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
@@ -0,0 +1,21 @@
+"""hilbertB.curves : échantillonnage par tuiles + marching squares + assemblage (un processus)."""
+from harness import benchmark
+from law_compiler import load_numpy
+
+SEXTIC = "(x**2 + 4*y**2 - 1)*(4*x**2 + y**2 - 1)*(x**2 + y**2 - 2) + 0.02"
+
+
+def _extract(res):
+    def factory():
+        from hilbertB.curves import extract_ovals
+        from rule_engine import RuleEngine
+        from sweep import default_dsl
+        engine = RuleEngine()  # borne de Harnack : moteur chargé hors mesure
+        engine.load_rules_from_text(default_dsl())
+        return lambda: extract_ovals(SEXTIC, res=res, tile=512, workers=1, engine=engine)
+    return factory
+
+
+if load_numpy() is not None:
+    benchmark("curves[sextic 1024²]")(_extract(1024))
+    benchmark("curves[sextic 4096²]")(_extract(4096))
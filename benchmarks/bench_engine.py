@@ -0,0 +1,75 @@
+"""RuleEngine.evaluate_expression (et son snapshot freeze()) pour chaque opérateur et chaque forme d'alias."""
+from harness import benchmark
+from rule_engine import RuleEngine
+
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+    "DEFINE ◇ WITH a-b\n"
+    "DEFINE τ WITH 1 if (a-b) >= 2 else 0\n"
+    "DEFINE ♠ WITH math.floor((a+1)/3)\n"
+    "DEFINE ○ WITH 1\n"
+    "DEFINE ⊂ WITH a+b\n"
+    "DEFINE Δ WITH 'nested' if a<b else 'separated'\n"
+    "DEFINE χ WITH a+b\n"
+)
+
+# opérateur -> formes : unicode, alias ASCII, alias en casse mixte (chemin lower()), alias legacy
+FORMS = {
+    "⊕": {"unicode": "⊕", "ascii": "opO", "lower": "OPO", "legacy": "+O"},
+    "⊗": {"unicode": "⊗", "ascii": "otO", "lower": "OTO", "legacy": "*O"},
+    "◇": {"unicode": "◇", "ascii": "maO", "lower": "MAO"},
+    "τ": {"unicode": "τ", "ascii": "thO", "lower": "THO"},
+    "♠": {"unicode": "♠", "ascii": "buO", "lower": "BUO"},
+    "○": {"unicode": "○", "ascii": "ovO", "lower": "OVO", "legacy": "oO"},
+    "⊂": {"unicode": "⊂", "ascii": "niO", "lower": "NIO", "legacy": "nO"},
+    "Δ": {"unicode": "Δ", "ascii": "diO", "lower": "DIO", "legacy": "dO"},
+    "χ": {"unicode": "χ", "ascii": "coO", "lower": "COO", "legacy": "cO"},
+}
+
+
+def _engine():
+    engine = RuleEngine()
+    engine.load_rules_from_text(DSL)
+    return engine
+
+
+def _make(expr):
+    def factory():
+        engine = _engine()
+        return lambda: engine.evaluate_expression(expr)
+    return factory
+
+
+def _make_frozen(expr):
+    def factory():
+        rules = _engine().freeze()
+        return lambda: rules.evaluate_expression(expr)
+    return factory
+
+
+for _op, _forms in FORMS.items():
+    for _form, _token in _forms.items():
+        benchmark(f"engine.eval[{_op}/{_form}]")(_make(f"22 {_token} 20"))
+        benchmark(f"engine.frozen[{_op}/{_form}]")(_make_frozen(f"22 {_token} 20"))
+
+
+@benchmark("engine.eval_cached[⊕]")
+def _cached():
+    engine = RuleEngine(cache_size=1024)
+    engine.load_rules_from_text(DSL)
+    return lambda: engine.evaluate_expression("22 ⊕ 20")
+
+
+@benchmark("engine.eval_metrics[⊕]")
+def _metrics():
+    engine = RuleEngine(metrics=True)
+    engine.load_rules_from_text(DSL)
+    return lambda: engine.evaluate_expression("22 ⊕ 20")
+
+
+@benchmark("engine.compound[((n ⊕ n) ◇ k) τ 0]")
+def _compound():
+    f = _engine().compile_expression("((n ⊕ n) ◇ k) τ 0")
+    env = {"n": 8, "k": 20}
+    return lambda: f.evaluate(env)
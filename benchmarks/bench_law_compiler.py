@@ -0,0 +1,62 @@
+"""
+Micro-benchmark : loi de Harnack ((a-1)*(a-2))/2 + 1, ancien chemin eval() par appel
+contre la fermeture native produite par law_compiler.
+
+    python benchmarks/bench_law_compiler.py [--number 200000]
+"""
+import argparse, os, sys, timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from rule_engine import RuleEngine
+from law_compiler import compile_law
+from harness import benchmark
+
+HARNACK = "((a-1)*(a-2))/2 + 1"
+
+
+def eval_law(expr: str, law_globals):
+    """Le chemin historique de RuleEngine._compile_law : un eval() par appel."""
+    code = compile(expr, "<law>", "eval")
+    def fn(a, b):
+        return eval(code, law_globals, {"a": a, "b": b})
+    return fn
+
+
+@benchmark("law.harnack[eval per call]")
+def _bench_eval():
+    fn = eval_law(HARNACK, RuleEngine()._law_globals)
+    return lambda: fn(8.0, 0.0)
+
+
+@benchmark("law.harnack[native closure]")
+def _bench_native():
+    fn = compile_law(HARNACK, RuleEngine()._law_globals)
+    return lambda: fn(8.0, 0.0)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--number", type=int, default=200_000)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    law_globals = RuleEngine()._law_globals
+    candidates = {
+        "eval() per call": eval_law(HARNACK, law_globals),
+        "native closure": compile_law(HARNACK, law_globals),
+    }
+    assert len({fn(8.0, 0.0) for fn in candidates.values()}) == 1
+
+    timings = {}
+    for name, fn in candidates.items():
+        best = min(timeit.repeat(lambda: fn(8.0, 0.0), number=args.number, repeat=args.repeat))
+        timings[name] = best / args.number * 1e9
+        print(f"{name:<18} {timings[name]:8.1f} ns/call")
+    print(f"speedup            {timings['eval() per call'] / timings['native closure']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
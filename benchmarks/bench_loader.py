@@ -0,0 +1,63 @@
+"""RuleEngine.load_rules_from_text sur des jeux de 10 à 10 000 lignes (à froid, rechargement, EnginePool)."""
+from harness import benchmark
+from engine_pool import EnginePool, canonical_dsl
+from rule_engine import RuleEngine
+
+LAWS = [
+    "((a-1)*(a-2))/2 + {i}",
+    "1 if b<=a+{i} else 0",
+    "a-b+{i}",
+    "math.floor((a+{i})/3)",
+    "'nested' if a<b+{i} else 'separated'",
+]
+
+
+def make_dsl(n_lines: int) -> str:
+    lines = []
+    for i in range(n_lines):
+        if i % 10 == 9:
+            lines.append(f"# règle {i}")
+        elif i % 10 == 8:
+            lines.append(f"SELECT op{i} WITH {{ a+{i} ; a*{i} }} USING ORIENTATION -")
+        else:
+            lines.append(f"DEFINE op{i} WITH " + LAWS[i % len(LAWS)].format(i=i))
+    return "\n".join(lines)
+
+
+def _cold(n):
+    def factory():
+        dsl = make_dsl(n)
+        return lambda: RuleEngine().load_rules_from_text(dsl)
+    return factory
+
+
+def _reload(n):
+    def factory():
+        dsl = make_dsl(n)
+        engine = RuleEngine()
+        engine.load_rules_from_text(dsl)
+        return lambda: engine.load_rules_from_text(dsl)
+    return factory
+
+
+def _pooled(n):
+    def factory():
+        dsl = make_dsl(n)
+        pool = EnginePool()
+        pool.get(dsl)
+        return lambda: pool.get(dsl)
+    return factory
+
+
+def _canonical(n):
+    def factory():
+        dsl = make_dsl(n)
+        return lambda: canonical_dsl(dsl)  # coût d'un bloc reformaté vu pour la première fois
+    return factory
+
+
+for _n in (10, 100, 1000, 10_000):
+    benchmark(f"loader.cold[{_n} lines]")(_cold(_n))
+    benchmark(f"loader.reload[{_n} lines]")(_reload(_n))
+    benchmark(f"loader.pool_hit[{_n} lines]")(_pooled(_n))
+    benchmark(f"loader.canonical[{_n} lines]")(_canonical(_n))
@@ -0,0 +1,27 @@
+"""hilbertB.patchwork : construction d'une T-courbe et échantillonnage (un processus)."""
+from harness import benchmark
+from law_compiler import load_numpy
+
+
+def _curve(degree):
+    def factory():
+        from hilbertB.patchwork import patchwork
+        return lambda: patchwork(degree, signs="harnack", bound=0)
+    return factory
+
+
+def _sample(degree, samples):
+    def factory():
+        from hilbertB.patchwork import sample
+        from rule_engine import RuleEngine
+        from sweep import default_dsl
+        engine = RuleEngine()
+        engine.load_rules_from_text(default_dsl())
+        return lambda: sample(degree, samples, workers=1, engine=engine)
+    return factory
+
+
+if load_numpy() is not None:
+    benchmark("patchwork[harnack degree 8]")(_curve(8))
+    benchmark("patchwork[harnack degree 30]")(_curve(30))
+    benchmark("patchwork[sample 500 × degree 8]")(_sample(8, 500))
@@ -0,0 +1,29 @@
+"""hilbertB.render : PNG Agg d'un grand arrangement (collections, culling LOD)."""
+import atexit, os, shutil, tempfile
+
+from harness import benchmark
+
+TMP = tempfile.mkdtemp(prefix="bench_render_")
+atexit.register(shutil.rmtree, TMP, True)
+
+
+def _render(n_nests, **opts):
+    def factory():
+        from hilbertB.arrangement import Arrangement
+        from hilbertB.render import render_arrangement
+        arr = Arrangement.from_circles(((k % 100) * 3.0, (k // 100) * 3.0, 1.2 - 0.2 * d)
+                                       for k in range(n_nests) for d in range(5))
+        arr.build()  # arbre hors mesure : on mesure le dessin
+        out = os.path.join(TMP, "arr.png")
+        return lambda: render_arrangement(arr, out, **opts)
+    return factory
+
+
+try:
+    import matplotlib  # noqa: F401
+except ImportError:
+    matplotlib = None
+
+if matplotlib is not None:
+    benchmark("render[10k circles png]")(_render(2000))
+    benchmark("render[10k circles png, zoom LOD]")(_render(2000, box=(0.0, 30.0, 0.0, 30.0)))
@@ -0,0 +1,46 @@
+"""ResultsStore : insertion d'un run de 1000 évaluations, requêtes par jeu de règles et lois lentes."""
+import atexit, os, shutil, tempfile, time
+
+from harness import benchmark
+
+TMP = tempfile.mkdtemp(prefix="bench_store_")
+atexit.register(shutil.rmtree, TMP, True)
+
+DSLS = [f"DEFINE ⊕ WITH ((a-1)*(a-2))/2 + {k}\nDEFINE ◇ WITH a-b+{k}" for k in range(20)]
+OPS = ("⊕", "◇", "opO", "maO")
+
+
+def _evals(run: int, n: int = 1000):
+    return [{"expr": f"{i} {OPS[i % 4]} {run}", "result": float(i), "error": None, "ns": 1000 + (i * 7919) % 90000}
+            for i in range(n)]
+
+
+def _store(name: str, runs: int = 0):
+    from results_store import ResultsStore
+    store = ResultsStore(os.path.join(TMP, name))
+    now = time.time()
+    for r in range(runs):  # 200 runs x 1000 = 200 000 évaluations sur 20 jours
+        store.record_run("p", "mock", "m", DSLS[r % len(DSLS)], evals=_evals(r), ts=now - (runs - r) * 8640)
+    store.flush()
+    atexit.register(store.close)
+    return store
+
+
+@benchmark("store.record_run[1000 evals]")
+def _insert():
+    store = _store("insert.db")
+    evals = _evals(0)
+    return lambda: store.record_run("p", "mock", "m", DSLS[0], evals=evals)
+
+
+@benchmark("store.results[ruleset, ⊕ | 2*10^5 rows]")
+def _by_ruleset():
+    store = _store("query.db", 200)
+    digest = store.ruleset_hash(DSLS[3])
+    return lambda: sum(1 for _ in store.results(digest, "⊕"))
+
+
+@benchmark("store.slowest_laws[7 days | 2*10^5 rows]")
+def _slowest():
+    store = _store("slow.db", 200)
+    return lambda: store.slowest_laws(time.time() - 7 * 86400)
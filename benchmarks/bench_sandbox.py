@@ -0,0 +1,29 @@
+"""SandboxPool.evaluate_many face au chemin en processus, sur 10 000 expressions 'a OP b'."""
+import atexit
+
+from harness import benchmark
+from rule_engine import RuleEngine
+
+DSL = "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\nDEFINE ◇ WITH a-b\n"
+EXPRS = [f"{n} {'⊕' if n % 2 else '◇'} {n % 13}" for n in range(10_000)]
+
+
+@benchmark("sandbox.in_process[10^4 exprs]")
+def _in_process():
+    engine = RuleEngine()
+    engine.load_rules_from_text(DSL)
+    ev = engine.evaluate_expression
+    return lambda: [ev(e) for e in EXPRS]
+
+
+def _pooled(workers):
+    def factory():
+        from sandbox import SandboxPool
+        sb = SandboxPool(DSL, workers=workers)
+        atexit.register(sb.close)
+        return lambda: sb.evaluate_many(EXPRS)
+    return factory
+
+
+for _w in (1, 4):
+    benchmark(f"sandbox.pool[{_w} worker(s), 10^4 exprs]")(_pooled(_w))
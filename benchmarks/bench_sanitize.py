@@ -0,0 +1,101 @@
+"""sanitize_payload sur des réponses LLM petites et bavardes (plusieurs Mo)."""
+import json, re
+
+from harness import benchmark
+from app import sanitize_payload
+from json_extract import JsonObjectScanner, extract_json_text
+from providers.mock_provider import MockProvider
+
+PAYLOAD = MockProvider().solve("Harnack partie A")
+PROSE = ("Voici mon raisonnement détaillé sur le problème de Hilbert : on considère {n} ovales, "
+         "la borne de Harnack donne (n-1)(n-2)/2 + 1 composantes ; les parenthèses {{a, b}} "
+         "et les guillemets \"comme ceci\" ne sont pas du JSON.\n")
+
+
+def noisy_text(size_bytes: int) -> str:
+    """Prose + faux objets + la vraie réponse en bloc ```json au milieu."""
+    chunks, total, n = [], 0, 0
+    answer = "```json\n" + json.dumps(PAYLOAD, ensure_ascii=False, indent=2) + "\n```\n"
+    while total < size_bytes:
+        line = PROSE.format(n=n)
+        chunks.append(line)
+        total += len(line.encode("utf-8"))
+        n += 1
+        if n == len(chunks) and total >= size_bytes // 2 and answer:
+            chunks.append(answer)
+            answer = ""
+    return "".join(chunks)
+
+
+CASES = {
+    "dict": lambda: dict(PAYLOAD),
+    "json": lambda: json.dumps(PAYLOAD, ensure_ascii=False),
+    "fenced": lambda: "Réponse :\n```json\n" + json.dumps(PAYLOAD, ensure_ascii=False) + "\n```",
+    "noisy_64KB": lambda: noisy_text(64 * 1024),
+    "noisy_1MB": lambda: noisy_text(1024 * 1024),
+    "noisy_4MB": lambda: noisy_text(4 * 1024 * 1024),
+}
+
+
+def _make(build):
+    def factory():
+        raw = build()
+        if isinstance(raw, dict):
+            return lambda: sanitize_payload(dict(raw))
+        return lambda: sanitize_payload(raw)
+    return factory
+
+
+for _name, _build in CASES.items():
+    benchmark(f"sanitize[{_name}]")(_make(_build))
+
+
+def _legacy_extract(text):
+    """Ancienne extraction (regex fence paresseuse puis gloutonne), pour comparaison."""
+    m = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, flags=re.S | re.I)
+    if m:
+        return m.group(1)
+    m = re.search(r"(\{.*\})", text, flags=re.S)
+    return m.group(1) if m else text
+
+
+def _unfenced(size_bytes):
+    return noisy_text(size_bytes).replace("```json", "").replace("```", "")
+
+
+def _extract(fn, build):
+    def factory():
+        text = build()
+        return lambda: fn(text)
+    return factory
+
+
+def _big_object(size_bytes):
+    dsl = "\n".join(f"DEFINE ⊕ WITH a+{k}" for k in range(size_bytes // 20))
+    return json.dumps({"dsl": dsl, "evals": ["1 ⊕ 2"], "final": "ok"}, ensure_ascii=False)
+
+
+def _chunked(build, chunk_size=64):
+    def factory():
+        text = build()
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        def run():
+            scanner = JsonObjectScanner()
+            for c in chunks:
+                scanner.feed(c)
+            return scanner.close()
+        return run
+    return factory
+
+
+for _size, _label in ((1024 * 1024, "1MB"), (4 * 1024 * 1024, "4MB")):
+    _fenced = lambda n=_size: noisy_text(n)
+    _bare = lambda n=_size: _unfenced(n)
+    benchmark(f"extract.scanner[fenced_{_label}]")(_extract(extract_json_text, _fenced))
+    benchmark(f"extract.legacy_regex[fenced_{_label}]")(_extract(_legacy_extract, _fenced))
+    benchmark(f"extract.scanner[unfenced_{_label}]")(_extract(extract_json_text, _bare))
+    benchmark(f"extract.legacy_regex[unfenced_{_label}]")(_extract(_legacy_extract, _bare))
+    benchmark(f"extract.scanner_chunks64[fenced_{_label}]")(_chunked(_fenced))
+
+# un seul gros objet reçu par petits morceaux : le coût doit rester linéaire
+benchmark("extract.scanner_chunks20[object_800KB]")(_chunked(lambda: _big_object(800 * 1024), 20))
@@ -0,0 +1,22 @@
+"""hilbertB.schemes : énumération des schémas admissibles (un processus, mémo vidé à chaque tour)."""
+from harness import benchmark
+
+
+def _enumerate(degree):
+    def factory():
+        from hilbertB import schemes as sch
+        from rule_engine import RuleEngine
+        from sweep import default_dsl
+        engine = RuleEngine()
+        engine.load_rules_from_text(default_dsl())
+
+        def run():
+            for memo in (sch._trees, sch._candidates, sch._forests):
+                memo.cache_clear()
+            return sch.schemes(degree, engine)
+        return run
+    return factory
+
+
+benchmark("schemes[degree 6]")(_enumerate(6))
+benchmark("schemes[degree 8]")(_enumerate(8))
@@ -0,0 +1,84 @@
+"""
+Temps de démarrage mesuré avec `python -X importtime` ; échoue (code 1) en cas de régression.
+
+    python benchmarks/bench_startup.py            # compare à benchmarks/startup_baseline.json
+    python benchmarks/bench_startup.py --update   # réécrit la référence sur cette machine
+
+For each target the cumulative import time of the top-level module is taken as the median of
+--runs fresh interpreters. A target regresses when it exceeds its baseline by more than
+--tolerance, or when it imports one of its forbidden heavy modules at all.
+"""
+import argparse, json, os, re, statistics, subprocess, sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+# cible -> modules lourds qu'elle ne doit jamais charger
+TARGETS = {
+    "app": ("matplotlib", "requests", "numpy"),
+    "solver_cli": ("matplotlib", "requests", "numpy"),
+    "rule_engine": ("numpy",),
+}
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str):
+    """{module: cumulative µs} for one fresh `python -X importtime -c 'import MODULE'`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            profile[m.group(4)] = int(m.group(2))
+    return profile
+
+
+def measure(module: str, runs: int):
+    samples, loaded = [], set()
+    for _ in range(runs):
+        profile = import_profile(module)
+        samples.append(profile[module])
+        loaded |= set(profile)
+    return statistics.median(samples), loaded
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Budget de temps d'import")
+    p.add_argument("--runs", type=int, default=7)
+    p.add_argument("--tolerance", type=float, default=0.5, help="dépassement relatif toléré (0.5 = +50%%)")
+    p.add_argument("--update", action="store_true", help="enregistrer les mesures comme nouvelle référence")
+    p.add_argument("--baseline", default=BASELINE)
+    args = p.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures, results = [], {}
+    for target, forbidden in TARGETS.items():
+        median_us, loaded = measure(target, args.runs)
+        results[target] = {"import_us": median_us}
+        heavy = sorted(m for m in forbidden if m in loaded)
+        ref = baseline.get(target, {}).get("import_us")
+        status = "ok"
+        if heavy:
+            status = f"FAIL imports {', '.join(heavy)}"
+        elif ref and median_us > ref * (1 + args.tolerance) and not args.update:
+            status = f"FAIL +{(median_us / ref - 1) * 100:.0f}% vs {ref / 1000:.1f} ms"
+        if status != "ok":
+            failures.append(target)
+        print(f"{target:<12} {median_us / 1000:8.1f} ms   {status}")
+
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"référence écrite : {args.baseline}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
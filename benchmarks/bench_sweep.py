@@ -0,0 +1,22 @@
+"""sweep : tables H(n) et grilles de marges, par blocs vectorisés (un processus, sans pool)."""
+import atexit, os, shutil, tempfile
+
+from harness import benchmark
+from law_compiler import load_numpy
+
+TMP = tempfile.mkdtemp(prefix="bench_sweep_")
+atexit.register(shutil.rmtree, TMP, True)
+
+
+def _sweep(op, a, b, grid, fmt, name):
+    def factory():
+        from sweep import run_sweep
+        out = os.path.join(TMP, name)
+        return lambda: run_sweep(op, a, b, out, fmt, grid=grid, workers=1)
+    return factory
+
+
+if load_numpy() is not None:
+    benchmark("sweep[⊕ n<=10^6 npy]")(_sweep("⊕", range(1, 1_000_001), (0.0,), False, "npy", "h.npy"))
+    benchmark("sweep[◇ 1000x1000 grid npy]")(_sweep("◇", range(1000), range(1000), True, "npy", "m.npy"))
+    benchmark("sweep[τ 300x300 grid csv]")(_sweep("τ", range(300), range(300), True, "csv", "t.csv"))
@@ -0,0 +1,97 @@
+"""
+Mini-harnais de benchmarks sans dépendance.
+
+A benchmark is a zero-argument factory registered with @benchmark; it returns the callable to
+time (setup happens in the factory, outside the measurement). Each sample runs the callable
+enough times to last at least `min_time`; results are per-call seconds with a 95 % confidence
+interval on the mean (Student t).
+"""
+import math, os, platform, statistics, sys, time
+from typing import Callable, Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+REGISTRY: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+# t de Student bilatéral à 95 % par degrés de liberté (au-delà de 30 : loi normale)
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110,
+        18: 2.101, 19: 2.093, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def benchmark(name: str):
+    def deco(factory):
+        REGISTRY[name] = factory
+        return factory
+    return deco
+
+
+def t95(df: int) -> float:
+    if df <= 0:
+        return float("inf")
+    if df in _T95:
+        return _T95[df]
+    smaller = [k for k in _T95 if k < df]
+    return _T95[max(smaller)] if df < 30 else 1.96
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    n = len(samples)
+    mean = statistics.fmean(samples)
+    stdev = statistics.stdev(samples) if n > 1 else 0.0
+    half = t95(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {"mean": mean, "stdev": stdev, "n": n, "ci_low": mean - half, "ci_high": mean + half,
+            "min": min(samples)}
+
+
+def measure(fn: Callable[[], object], repeat: int = 10, min_time: float = 0.02) -> Dict[str, float]:
+    fn()  # échauffement (caches, imports paresseux)
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    res = summarize(samples)
+    res["number"] = number
+    return res
+
+
+def metadata() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.05):
+    """
+    Yields (name, ratio, verdict) for benchmarks present in both runs. A change is reported only
+    when the two 95 % intervals do not overlap and the means differ by more than THRESHOLD.
+    """
+    for name, cur in sorted(current.items()):
+        ref = baseline.get(name)
+        if ref is None:
+            continue
+        ratio = cur["mean"] / ref["mean"] if ref["mean"] else float("inf")
+        if cur["ci_low"] > ref["ci_high"] and ratio > 1 + threshold:
+            verdict = "REGRESSION"
+        elif cur["ci_high"] < ref["ci_low"] and ratio < 1 - threshold:
+            verdict = "improvement"
+        else:
+            verdict = "same"
+        yield name, ratio, verdict
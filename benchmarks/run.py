@@ -0,0 +1,91 @@
+"""
+Lance la suite de benchmarks (benchmarks/bench_*.py) et écrit les résultats en JSON.
+
+    python benchmarks/run.py                          # tout, résultats dans bench_results.json
+    python benchmarks/run.py -k engine --quick        # filtre sur le nom, moins d'échantillons
+    python benchmarks/run.py --save-baseline          # met à jour benchmarks/baseline.json
+    python benchmarks/run.py --compare benchmarks/baseline.json   # code 1 si régression
+
+Regressions are reported only when the 95 % confidence intervals of the current run and the
+baseline do not overlap and the means differ by more than --threshold.
+"""
+import argparse, fnmatch, glob, importlib, json, os, sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import harness
+
+BASELINE = os.path.join(HERE, "baseline.json")
+
+
+def load_suites():
+    for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Suite de benchmarks (moteur, loader, sanitizer, CLI)")
+    p.add_argument("-k", "--filter", default="*", help="motif glob sur les noms (ex: 'engine.*')")
+    p.add_argument("--repeat", type=int, default=10)
+    p.add_argument("--min-time", type=float, default=0.02, help="durée minimale d'un échantillon (s)")
+    p.add_argument("--quick", action="store_true", help="5 échantillons de 5 ms")
+    p.add_argument("--out", default="bench_results.json")
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument("--compare", metavar="BASELINE")
+    p.add_argument("--threshold", type=float, default=0.05)
+    p.add_argument("--list", action="store_true")
+    args = p.parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time = 5, 0.005
+    pattern = args.filter if any(c in args.filter for c in "*?[") else f"*{args.filter}*"
+
+    load_suites()
+    names = [n for n in harness.REGISTRY if fnmatch.fnmatch(n, pattern)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = {}
+    for name in names:
+        fn = harness.REGISTRY[name]()
+        res = harness.measure(fn, repeat=args.repeat, min_time=args.min_time)
+        results[name] = res
+        half = (res["ci_high"] - res["ci_low"]) / 2
+        print(f"{name:<45} {_fmt(res['mean'])} ± {_fmt(half).strip():>10}  (n={res['n']}×{res['number']})")
+
+    report = {"meta": harness.metadata(), "results": results}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        baseline = {"meta": report["meta"], "results": {}}
+        if os.path.exists(BASELINE):
+            with open(BASELINE, encoding="utf-8") as f:
+                baseline["results"] = json.load(f).get("results", {})
+        baseline["results"].update(results)
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"référence mise à jour : {BASELINE}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            ref = json.load(f)["results"]
+        regressions = 0
+        print()
+        for name, ratio, verdict in harness.compare(results, ref, args.threshold):
+            regressions += verdict == "REGRESSION"
+            print(f"{name:<45} {ratio:6.2f}x  {verdict}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
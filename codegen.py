@@ -0,0 +1,108 @@
+"""
+Export d'un jeu de règles en module Python importable.
+
+    python rule_engine.py compile dsl.txt -o rules_gen.py
+
+The generated module has one plain function per operator (laws are the checked, constant-folded
+form produced by law_compiler), a flat DISPATCH dict from every alias spelling to its function,
+and an evaluate_expression() with the same contract as RuleEngine's 'a OP b' path. SELECT
+operators export the law picked by their orientation. Loading it costs only an import.
+"""
+import ast, hashlib, os
+from typing import Dict, List
+
+from law_compiler import parse_law
+
+_HEADER = '''"""
+Generated by `python rule_engine.py compile` - do not edit.
+Source DSL sha256: {digest}
+"""
+import math
+
+try:
+    from rule_engine import EvaluationError
+except ImportError:  # module utilisable seul
+    class EvaluationError(Exception):
+        pass
+
+ORIENTATION = {orientation!r}
+SOURCE_SHA256 = {digest!r}
+'''
+
+_FOOTER = '''
+
+def evaluate(op, a, b):
+    fn = DISPATCH.get(op) or DISPATCH.get(op.strip().lower())
+    if fn is None:
+        raise EvaluationError(f"Operation '{op}' is not defined or disabled")
+    return fn(a, b)
+
+
+def evaluate_expression(expr):
+    tokens = expr.strip().split()
+    if len(tokens) != 3:
+        raise EvaluationError("Expression must be 'a OP b' with spaces, e.g., '3 ⊕ 7' or '3 +O 7'")
+    try:
+        a = float(tokens[0]); b = float(tokens[2])
+    except ValueError:
+        raise EvaluationError("Operands must be numeric")
+    return evaluate(tokens[1], a, b)
+'''
+
+
+def _func_name(op: str) -> str:
+    if op.isidentifier() and op.isascii():
+        return f"op_{op}"
+    return "op_" + "_".join(f"{ord(c):04x}" for c in op)
+
+
+def _aliases_for(engine, op: str) -> List[str]:
+    names = [op]
+    for table in (engine.aliases, engine._legacy_aliases):
+        names += [k for k, v in table.items() if v == op and k not in names]
+    return names
+
+
+def generate_module_source(engine, source_text: str = "") -> str:
+    """Returns the Python source of a module equivalent to ENGINE's current rule set."""
+    digest = hashlib.sha256(source_text.encode("utf-8")).hexdigest() if source_text else ""
+    parts = [_HEADER.format(orientation=engine.orientation, digest=digest)]
+    dispatch: Dict[str, str] = {}
+    ops: Dict[str, str] = {}
+    disabled: List[str] = []
+
+    for op, spec in engine.ops.items():
+        if not spec.get("enabled", False):
+            disabled.append(op)
+            continue
+        law = engine._resolve_law(op, op)
+        expr = law.expr
+        tree = parse_law(expr, engine._law_globals)
+        hosted = sorted({n.id for n in ast.walk(tree) if isinstance(n, ast.Name)} & set(engine._functions))
+        if hosted:  # fonctions Python enregistrées (register_function) : absentes du module généré
+            raise ValueError(f"Law of '{op}' calls registered function(s) {', '.join(hosted)}: cannot be exported")
+        body = ast.unparse(tree.body)
+        name = _func_name(op)
+        comment = f"# {op} := {expr}"
+        if "laws" in spec:
+            alts = " ; ".join(f.expr for f in spec["laws"])
+            comment += f"   (SELECT {{ {alts} }} USING ORIENTATION {spec.get('selector_orientation', engine.orientation)})"
+        parts.append(f"\n{comment}\ndef {name}(a, b):\n    return {body}\n{name}.expr = {expr!r}\n")
+        ops[op] = name
+        for alias in _aliases_for(engine, op):
+            dispatch[alias] = name
+
+    parts.append("\nOPS = {\n" + "".join(f"    {k!r}: {v},\n" for k, v in ops.items()) + "}\n")
+    parts.append("\nDISPATCH = {\n" + "".join(f"    {k!r}: {v},\n" for k, v in dispatch.items()) + "}\n")
+    parts.append(f"\nDISABLED = {set(disabled)!r}\n" if disabled else "\nDISABLED = set()\n")
+    parts.append(_FOOTER)
+    return "".join(parts)
+
+
+def export_module(engine, path: str, source_text: str = "") -> str:
+    src = generate_module_source(engine, source_text)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(src)
+    os.replace(tmp, path)
+    return path
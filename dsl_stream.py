@@ -0,0 +1,258 @@
+"""
+Chargement de la DSL au fil du flux d'un provider.
+
+StreamingSession receives raw completion chunks (Ollama NDJSON / OpenRouter SSE text, see
+providers/stream_utils.py) and, as soon as a DSL line is complete, loads it into the RuleEngine.
+Each eval runs as soon as every operator it uses is defined. Two layouts are understood:
+
+- the JSON answer the system prompt asks for: lines are decoded from the "dsl" string and
+  expressions from the "evals" array while they are still being generated;
+- plain DSL text (one directive per line), possibly inside a ``` fence.
+
+finish() hands the answer to a sanitizer (app.sanitize_payload) for anything that could not be
+streamed, such as a "dsl" given as a list, and evaluates whatever is still pending. The JSON
+object itself is located while the chunks arrive (json_extract.JsonObjectScanner), so the
+sanitizer does not rescan the whole completion.
+"""
+import json, re, time
+from typing import Callable, List, Optional, Tuple
+
+from json_extract import JsonObjectScanner
+from rule_engine import RuleEngine, EvaluationError
+
+_DIRECTIVE_RE = re.compile(r"\s*(DEFINE|REPLACE|DELETE|ENABLE|DISABLE|SELECT)\s", re.IGNORECASE)
+_DSL_KEY_RE = re.compile(r'"dsl"\s*:\s*"')
+_EVALS_KEY_RE = re.compile(r'"evals"\s*:\s*\[')
+_KEY_LOOKBACK = 32  # une clé coupée entre deux morceaux est recherchée à nouveau sur cette marge
+# plus long préfixe d'une chaîne JSON sans échappement tronqué
+_JSON_STR_PREFIX_RE = re.compile(r'(?:[^"\\]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+_HIGH_SURROGATE_RE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}\Z')
+_JSON_ITEM_RE = re.compile(r'\s*("(?:[^"\\]|\\.)*")\s*([,\]])')
+_JSON_ARRAY_END_RE = re.compile(r'\s*\]')
+
+
+class StreamingSession:
+    """
+    session = StreamingSession(engine)
+    for chunk in provider.solve_stream(problem):
+        for kind, *data in session.feed(chunk):   # ("rule", line) / ("eval", expr, result, error)
+            ...                                   # / ("error", line, message)
+    payload = session.finish(sanitize_payload)
+
+    Each chunk is scanned once: the session keeps only the text its cursors still need (the
+    undecoded end of the "dsl" string, an incomplete line or "evals" item, a few characters
+    where a key may be split) plus the list of chunks, joined by finish().
+    """
+
+    def __init__(self, engine: RuleEngine):
+        self.engine = engine
+        self.rules: List[str] = []
+        self.errors: List[Tuple[str, str]] = []
+        self.results: List[Tuple[str, object, Optional[str]]] = []
+        self.pending: List[str] = []
+        self.started = time.perf_counter()
+        self.first_result_at: Optional[float] = None
+        self._chunks: List[str] = []
+        self._buf = ""                        # texte encore utile, à partir de la position _base
+        self._base = 0
+        self._mode: Optional[str] = None      # "json" | "raw"
+        self._dsl_from = 0                    # recherche de la clé "dsl"
+        self._dsl_pos: Optional[int] = None   # premier caractère non décodé de la chaîne "dsl"
+        self._dsl_line = ""                   # ligne DSL décodée, encore incomplète
+        self._dsl_done = False
+        self._evals_from = 0
+        self._evals_pos: Optional[int] = None
+        self._evals_done = False
+        self._raw_pos = 0                     # première ligne non examinée (brut / mode indécis)
+        self.events: list = []
+        self._json = JsonObjectScanner()
+
+    @property
+    def text(self) -> str:
+        """Full text received so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    # ---------- alimentation ----------
+    def feed(self, chunk: str) -> list:
+        self.events = []
+        if not chunk:
+            return []
+        self._chunks.append(chunk)
+        self._json.feed(chunk)
+        old_end = self._base + len(self._buf)
+        self._buf += chunk
+        if self._mode is None:
+            self._detect(old_end)
+        if self._mode == "json":
+            self._scan_json()
+        elif self._mode == "raw":
+            self._scan_raw(old_end)
+        self._trim()
+        return self.events
+
+    def _find_key(self, regex, start: int):
+        """(absolute end of REGEX's first match from START, or None; where to resume searching)."""
+        m = regex.search(self._buf, start - self._base)
+        if m:
+            return self._base + m.end(), start
+        return None, max(start, self._base + len(self._buf) - _KEY_LOOKBACK)
+
+    def _detect(self, old_end: int):
+        if self._evals_pos is None:
+            self._evals_pos, self._evals_from = self._find_key(_EVALS_KEY_RE, self._evals_from)
+        self._dsl_pos, self._dsl_from = self._find_key(_DSL_KEY_RE, self._dsl_from)
+        if self._dsl_pos is not None:
+            self._mode = "json"
+            return
+        # lignes complètes arrivées avec ce morceau : chacune n'est examinée qu'une fois
+        end = self._buf.rfind("\n", max(self._raw_pos, old_end) - self._base)
+        if end < 0:
+            return  # pas encore assez de texte pour décider
+        pos = self._raw_pos
+        for line in self._buf[pos - self._base:end].split("\n"):
+            if _DIRECTIVE_RE.match(line):
+                self._mode, self._raw_pos = "raw", pos
+                return
+            pos += len(line) + 1
+        self._raw_pos = self._base + end + 1
+
+    def _trim(self):
+        """Drops the text before the earliest position still needed."""
+        if self._mode == "raw":
+            keep = self._raw_pos
+        else:
+            cursors = [self._evals_from if self._evals_pos is None else
+                       self._evals_pos if not self._evals_done else None]
+            if self._mode is None:
+                cursors += [self._raw_pos, self._dsl_from]
+            elif not self._dsl_done:
+                cursors.append(self._dsl_pos)
+            keep = min((c for c in cursors if c is not None), default=self._base + len(self._buf))
+        if keep > self._base:
+            self._buf = self._buf[keep - self._base:]
+            self._base = keep
+
+    def _scan_raw(self, old_end: int):
+        end = self._buf.rfind("\n", max(self._raw_pos, old_end) - self._base)
+        if end < 0:
+            return
+        for line in self._buf[self._raw_pos - self._base:end].split("\n"):
+            self._load_line(line)
+        self._raw_pos = self._base + end + 1
+
+    def _scan_json(self):
+        if not self._dsl_done:
+            self._scan_dsl()
+        if self._evals_pos is None:
+            self._evals_pos, self._evals_from = self._find_key(_EVALS_KEY_RE, self._evals_from)
+        if self._evals_pos is not None and not self._evals_done:
+            self._scan_evals()
+        self._run_ready()
+
+    def _scan_dsl(self):
+        """Decodes the "dsl" string from where the previous chunk stopped (an escape may be split)."""
+        rel = self._dsl_pos - self._base
+        prefix = _JSON_STR_PREFIX_RE.match(self._buf, rel).group(0)
+        closed = self._buf.startswith('"', rel + len(prefix))
+        if not closed and _HIGH_SURROGATE_RE.search(prefix):
+            prefix = prefix[:-6]  # attend la seconde moitié de la paire
+        self._dsl_pos += len(prefix) + closed
+        lines = (self._dsl_line + json.loads(f'"{prefix}"', strict=False)).split("\n")
+        self._dsl_line = "" if closed else lines.pop()
+        for line in lines:
+            self._load_line(line)
+        self._dsl_done = closed
+
+    def _scan_evals(self):
+        while not self._evals_done:
+            rel = self._evals_pos - self._base
+            m = _JSON_ITEM_RE.match(self._buf, rel)
+            if not m:
+                self._evals_done = _JSON_ARRAY_END_RE.match(self._buf, rel) is not None
+                break
+            self._evals_pos = self._base + m.end()
+            self._evals_done = m.group(2) == "]"
+            try:
+                expr = json.loads(m.group(1), strict=False).strip()
+            except ValueError as ex:
+                self._error(m.group(1), f"Invalid JSON string: {ex}")
+                continue
+            if expr.startswith("'") and expr.endswith("'"):
+                expr = expr[1:-1]
+            self.pending.append(expr)
+
+    def _error(self, line: str, msg: str):
+        self.errors.append((line, msg))
+        self.events.append(("error", line, msg))
+
+    def _load_line(self, line: str):
+        line = line.strip()
+        if not _DIRECTIVE_RE.match(line):
+            return
+        try:
+            self.engine.load_rules_from_text(line)
+        except EvaluationError as ex:  # directive mal formée : signalée, le flux continue
+            self._error(line, str(ex))
+            return
+        self.rules.append(line)
+        self.events.append(("rule", line))
+        self._run_ready()
+
+    # ---------- évaluations ----------
+    def _ready(self, expr: str) -> bool:
+        ops = [t for t in re.split(r"[\s()]+", expr) if t and self.engine._is_op_token(t)]
+        return bool(ops) and all(self.engine._norm_op(t) in self.engine.ops for t in ops)
+
+    def _evaluate(self, expr: str):
+        try:
+            res, err = self.engine.evaluate_expression(expr), None
+        except EvaluationError as ex:
+            res, err = None, str(ex)
+        if self.first_result_at is None:
+            self.first_result_at = time.perf_counter() - self.started
+        self.results.append((expr, res, err))
+        self.events.append(("eval", expr, res, err))
+
+    def _run_ready(self):
+        if not self.pending:
+            return
+        still = []
+        for expr in self.pending:
+            if self._ready(expr):
+                self._evaluate(expr)
+            else:
+                still.append(expr)
+        self.pending = still
+
+    # ---------- fin de flux ----------
+    def finish(self, sanitize: Optional[Callable] = None) -> dict:
+        """
+        Completes the session once the stream is over and returns the sanitized payload.
+        Rules that could not be streamed are loaded now; evals not run yet are evaluated
+        (their errors are reported like any other).
+        """
+        self.events = []
+        if self._mode != "json":
+            for line in self.text[self._raw_pos:].split("\n"):
+                self._load_line(line)
+            self._raw_pos = len(self.text)
+        payload = None
+        if sanitize is not None:
+            answer = self._json.close()
+            try:
+                payload = sanitize(answer if answer is not None else self.text)
+            except (ValueError, AttributeError):
+                pass  # texte non JSON : DSL brute déjà chargée
+        if payload is None:
+            payload = {"dsl": "\n".join(self.rules), "evals": [], "final": ""}
+        elif not self.rules and not self.errors and payload.get("dsl"):
+            for line in payload["dsl"].splitlines():
+                self._load_line(line)
+        seen = {expr for expr, _, _ in self.results} | set(self.pending)
+        self.pending += [e for e in payload.get("evals", []) if e not in seen]
+        for expr in self.pending:
+            self._evaluate(expr)
+        self.pending = []
+        return payload
@@ -0,0 +1,121 @@
+"""
+Instrumentation optionnelle du RuleEngine : RuleEngine(metrics=True) ou engine.metrics = EngineMetrics().
+
+Per canonical operator: calls, errors, total/max latency and a log2 latency histogram
+(bucket i holds calls that took [2**(i-1), 2**i) ns), plus the SELECT branch taken. Per engine:
+how operator tokens were resolved (direct alias, lowercased, legacy, raw). Recording is a few
+integer updates, so it can stay on in production; counters are not locked, concurrent threads
+may rarely lose an increment.
+"""
+from typing import Dict, List, Optional
+
+_BUCKETS = 40  # 2**39 ns ~ 9 min : tout ce qui dépasse tombe dans le dernier seau
+_MAX_NS = 1 << (_BUCKETS - 1)
+ALIAS_PATHS = ("direct", "lower", "legacy", "raw")
+
+
+class OpStats:
+    __slots__ = ("calls", "errors", "total_ns", "max_ns", "buckets", "branches")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets: List[int] = [0] * _BUCKETS
+        self.branches: Dict[str, int] = {}
+
+    def percentile_ns(self, q: float) -> int:
+        """Upper bound of the bucket holding the Q-quantile (0 if nothing was recorded)."""
+        target, seen = q * self.calls, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return 1 << i
+        return 0
+
+    def as_dict(self) -> dict:
+        mean = self.total_ns / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.errors / self.calls if self.calls else 0.0,
+            "mean_us": mean / 1e3,
+            "p50_us": self.percentile_ns(0.5) / 1e3,
+            "p99_us": self.percentile_ns(0.99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "histogram_ns": {str(1 << i): n for i, n in enumerate(self.buckets) if n},
+            "select_branches": dict(self.branches),
+        }
+
+
+class EngineMetrics:
+    def __init__(self):
+        self.ops: Dict[str, OpStats] = {}
+        self.alias_paths: Dict[str, int] = dict.fromkeys(ALIAS_PATHS, 0)
+
+    def _op(self, op: str) -> OpStats:
+        st = self.ops.get(op)
+        if st is None:
+            st = self.ops[op] = OpStats()
+        return st
+
+    def record(self, op: str, elapsed_ns: int, error: bool = False, count: int = 1):
+        st = self.ops.get(op) or self._op(op)
+        st.calls += count
+        st.total_ns += elapsed_ns
+        if error:
+            st.errors += 1
+        if count > 1:
+            elapsed_ns //= count
+        if elapsed_ns > st.max_ns:
+            st.max_ns = elapsed_ns
+        st.buckets[elapsed_ns.bit_length() if elapsed_ns < _MAX_NS else _BUCKETS - 1] += count
+
+    def branch(self, op: str, orientation: str):
+        branches = self._op(op).branches
+        branches[orientation] = branches.get(orientation, 0) + 1
+
+    def reset(self):
+        self.ops.clear()
+        self.alias_paths = dict.fromkeys(ALIAS_PATHS, 0)
+
+    def snapshot(self) -> dict:
+        return {"ops": {op: st.as_dict() for op, st in self.ops.items()},
+                "alias_paths": dict(self.alias_paths)}
+
+
+def format_stats(stats: dict) -> str:
+    """Human-readable table for RuleEngine.stats()."""
+    lines = [f"{'op':<6} {'calls':>8} {'errors':>7} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'max µs':>9}  SELECT"]
+    for op, st in sorted(stats.get("ops", {}).items(), key=lambda kv: -kv[1]["calls"]):
+        branches = " ".join(f"{k}:{v}" for k, v in st["select_branches"].items())
+        lines.append(f"{op:<6} {st['calls']:>8} {st['errors']:>7} {st['mean_us']:>9.2f} "
+                     f"{st['p50_us']:>9.2f} {st['p99_us']:>9.2f} {st['max_us']:>9.2f}  {branches}")
+    if not stats.get("enabled", True):
+        lines.append("(métriques désactivées : RuleEngine(metrics=True))")
+    paths = stats.get("alias_paths", {})
+    if any(paths.values()):
+        lines.append("alias : " + ", ".join(f"{k}={v}" for k, v in paths.items()))
+    legacy = stats.get("legacy_aliases", {})
+    if legacy:
+        lines.append("alias legacy utilisés (préférer opO/otO/maO/thO/buO ou ovO/niO/diO/coO) : "
+                     + ", ".join(f"{k}×{v}" for k, v in legacy.items()))
+    cache = stats.get("cache")
+    if cache and cache.get("maxsize"):
+        lines.append(f"cache : {cache['hits']} hits / {cache['misses']} misses ({cache['size']}/{cache['maxsize']})")
+    return "\n".join(lines)
+
+
+def report_stats(stats: dict, dest: Optional[str] = None):
+    """--stats des CLI : table sur stdout (DEST vide), JSON sur stdout ('-') ou dans le fichier DEST."""
+    import json, sys  # pas au chargement de rule_engine
+    if not dest:
+        print("\n=== STATS MOTEUR ===")
+        print(format_stats(stats))
+    elif dest == "-":
+        json.dump(stats, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        with open(dest, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,173 @@
+"""
+Pool de moteurs compilés, partagés par empreinte de DSL (service multi-tenant).
+
+    pool = EnginePool(max_engines=256, max_bytes=64 << 20)
+    engine = pool.get(payload["dsl"], orientation="+")
+    pool.stats()   # {"hits", "misses", "hit_rate", ...}
+
+Two rule blocks that differ only by comments, blank lines, spacing, directive case or operator
+spelling ('+O', 'oplus', '⊕') compile to the same rules. canonical_dsl() rewrites a block into
+one line per directive with the canonical operator (RuleEngine._norm_op) and the law re-printed
+by ast.unparse, and the pool keys engines by the sha256 of that text plus the orientation.
+An exact repeat of a block is found by the sha256 of its raw text, before any canonicalization:
+a repeated DSL is neither parsed nor compiled again.
+
+Engines are evicted least recently used first, when there are more than max_engines or their
+estimated size (estimate_bytes) goes over max_bytes. Pooled engines are shared between tenants:
+callers must not load rules into them; freeze() gives a snapshot that threads can share.
+"""
+import ast, hashlib, threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from rule_engine import RuleEngine
+
+_MAX_RAW_KEYS = 4  # empreintes de textes bruts gardées par moteur (variantes d'un même bloc)
+
+
+def _norm_law(expr: str) -> str:
+    try:
+        return ast.unparse(ast.parse(expr, mode="eval"))
+    except SyntaxError:
+        return " ".join(expr.split())  # refusée au chargement ; clé quand même stable
+
+
+def canonical_dsl(text: str, engine: Optional[RuleEngine] = None) -> str:
+    """
+    One canonical line per directive of TEXT: 'DEFINE ⊕ WITH ((a - 1) * (a - 2)) / 2 + 1'.
+    Comments, blank lines and non-directive lines are dropped; directive order is kept (a later
+    DEFINE overrides an earlier one). Raises EvaluationError on malformed directives.
+    """
+    engine = engine or _PARSER
+    out = []
+    for ln in text.splitlines():
+        line = ln.strip()
+        if not line or line.startswith("#"):
+            continue
+        directive = engine._parse_directive(line)
+        if directive is None:
+            continue
+        kind, op = directive[0], directive[1]
+        if kind in ("DEFINE", "REPLACE"):
+            out.append(f"{kind} {op} WITH {_norm_law(directive[3])}")
+        elif kind == "SELECT":
+            laws = " ; ".join(_norm_law(expr) for expr in directive[3])
+            out.append(f"SELECT {op} WITH {{ {laws} }} USING ORIENTATION {directive[4]}")
+        else:
+            out.append(f"{kind} {op}")
+    return "\n".join(out)
+
+
+def dsl_digest(text: str) -> str:
+    return hashlib.sha256(canonical_dsl(text).encode("utf-8")).hexdigest()
+
+
+def estimate_bytes(engine: RuleEngine) -> int:
+    """
+    Rough footprint of a loaded engine (measured with tracemalloc: ~3 KB per compiled operator,
+    ~200 bytes per dispatch entry of a frozen snapshot), used for the pool's memory bound.
+    """
+    size = 4096 + 3072 * len(engine.ops) + sum(2 * len(line) for line in engine._directive_cache)
+    if engine._frozen is not None:
+        size += 200 * len(engine._frozen.dispatch)
+    return size
+
+
+class EnginePool:
+    """
+    Loaded RuleEngines keyed by (canonical DSL sha256, orientation), bounded LRU.
+    Thread-safe: two threads missing on the same block may both compile it, the first one
+    stored wins.
+    """
+
+    def __init__(self, max_engines: int = 128, max_bytes: int = 64 << 20,
+                 engine_factory: Callable[..., RuleEngine] = RuleEngine):
+        self.max_engines = max_engines
+        self.max_bytes = max_bytes
+        self.engine_factory = engine_factory
+        self._engines: "OrderedDict[Tuple[str, str], Tuple[RuleEngine, int]]" = OrderedDict()
+        self._raw: Dict[Tuple[str, str], Tuple[str, str]] = {}  # (sha brut, orientation) -> clé
+        self._raw_of: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.canonical_hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._engines)
+
+    def get(self, dsl: str, orientation: str = "+") -> RuleEngine:
+        """The engine for DSL, compiled on the first request of its canonical form."""
+        raw = (hashlib.sha256(dsl.encode("utf-8")).hexdigest(), orientation)
+        with self._lock:
+            key = self._raw.get(raw)
+            if key is not None:
+                self.hits += 1
+                self._engines.move_to_end(key)
+                return self._engines[key][0]
+
+        key = (dsl_digest(dsl), orientation)
+        with self._lock:
+            entry = self._engines.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.canonical_hits += 1
+                self._engines.move_to_end(key)
+                self._remember(raw, key)
+                return entry[0]
+
+        engine = self.engine_factory(orientation=orientation)
+        engine.load_rules_from_text(dsl)
+        size = estimate_bytes(engine)
+        with self._lock:
+            self.misses += 1
+            entry = self._engines.get(key)
+            if entry is not None:  # compilé en parallèle par un autre thread
+                self._engines.move_to_end(key)
+                self._remember(raw, key)
+                return entry[0]
+            self._engines[key] = (engine, size)
+            self.bytes += size
+            self._remember(raw, key)
+            self._evict()
+        return engine
+
+    def freeze(self, dsl: str, orientation: str = "+"):
+        """RuleSet snapshot of the pooled engine for DSL (see ruleset.py)."""
+        return self.get(dsl, orientation).freeze()
+
+    def _remember(self, raw, key):
+        if raw in self._raw:
+            return
+        raws = self._raw_of.setdefault(key, [])
+        if len(raws) >= _MAX_RAW_KEYS:
+            del self._raw[raws.pop(0)]
+        raws.append(raw)
+        self._raw[raw] = key
+
+    def _evict(self):
+        # le moteur qu'on vient d'insérer reste, même s'il dépasse à lui seul max_bytes
+        while len(self._engines) > 1 and (len(self._engines) > self.max_engines or self.bytes > self.max_bytes):
+            key, (_, size) = self._engines.popitem(last=False)
+            self.bytes -= size
+            for raw in self._raw_of.pop(key, ()):
+                self._raw.pop(raw, None)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._engines.clear()
+            self._raw.clear()
+            self._raw_of.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Hit counters (canonical_hits: new text, known rules), size and bounds."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "canonical_hits": self.canonical_hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0, "evictions": self.evictions,
+                    "engines": len(self._engines), "bytes": self.bytes,
+                    "max_engines": self.max_engines, "max_bytes": self.max_bytes}
+
+
+_PARSER = RuleEngine()  # _parse_directive ne compile rien : un moteur vide suffit
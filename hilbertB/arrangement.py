@@ -0,0 +1,481 @@
+"""
+Arrangements d'ovales (Partie B) : ovales disjoints, arbre d'imbrication et requêtes.
+
+An oval is a circle (cx, cy, r) or a simple closed polygon. Ovals of an arrangement are assumed
+pairwise disjoint (no crossing, no touching), as for the ovals of a real algebraic curve, so
+containment forms a forest: parent[i] is the innermost oval enclosing i, or -1.
+
+The forest is built by one left-to-right sweep in O(n log n) comparisons. Each oval is cut
+into x-monotone pieces (upper / lower half-circle, non-vertical polygon edges), each carrying an
+"interior below" flag. The sweep status keeps the live pieces ordered by y, found with bisect
+(the order of disjoint pieces never changes while they are both alive). When the sweep reaches
+the leftmost point of oval C, the first piece above that point belongs to some oval D: if D's
+interior lies below the piece, C is inside D, otherwise C is D's sibling.
+
+Queries: depth(i) (1 for an outermost oval), contains(i, j) in O(1) (Euler tour), relation(i, j)
+('nested' / 'separated', as Δ), nest_size(i) (ovals of the nest rooted at i, as the ○ = 1 /
+⊂ = a+b laws count them), complexity() and scheme() (Viro notation). bind_arrangement() exposes
+them to DSL laws.
+"""
+import ast, bisect, json, math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CIRCLE, POLYGON = "circle", "polygon"
+
+
+class Oval:
+    __slots__ = ("kind", "data")
+
+    def __init__(self, kind: str, data: tuple):
+        self.kind = kind
+        self.data = data
+
+    @classmethod
+    def circle(cls, cx: float, cy: float, r: float) -> "Oval":
+        if not r > 0:
+            raise ValueError(f"Circle radius must be positive, got {r}")
+        return cls(CIRCLE, (float(cx), float(cy), float(r)))
+
+    @classmethod
+    def polygon(cls, points: Iterable[Sequence[float]]) -> "Oval":
+        pts = [(float(x), float(y)) for x, y in points]
+        if len(pts) > 1 and pts[0] == pts[-1]:
+            pts.pop()
+        if len(pts) < 3:
+            raise ValueError("A polygon oval needs at least 3 distinct points")
+        if _signed_area(pts) < 0:  # orientation canonique : sens trigonométrique
+            pts.reverse()
+        return cls(POLYGON, tuple(pts))
+
+    def bbox(self) -> Tuple[float, float, float, float]:
+        if self.kind == CIRCLE:
+            cx, cy, r = self.data
+            return cx - r, cy - r, cx + r, cy + r
+        xs = [p[0] for p in self.data]
+        ys = [p[1] for p in self.data]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def leftmost(self) -> Tuple[float, float]:
+        if self.kind == CIRCLE:
+            cx, cy, r = self.data
+            return cx - r, cy
+        return min(self.data)
+
+    def area(self) -> float:
+        if self.kind == CIRCLE:
+            return math.pi * self.data[2] ** 2
+        return _signed_area(self.data)
+
+    def contains_point(self, x: float, y: float) -> bool:
+        if self.kind == CIRCLE:
+            cx, cy, r = self.data
+            return (x - cx) ** 2 + (y - cy) ** 2 < r * r
+        inside = False
+        pts = self.data
+        x1, y1 = pts[-1]
+        for x2, y2 in pts:
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+            x1, y1 = x2, y2
+        return inside
+
+    def to_json(self) -> dict:
+        if self.kind == CIRCLE:
+            return {CIRCLE: list(self.data)}
+        return {POLYGON: [list(p) for p in self.data]}
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "Oval":
+        if CIRCLE in obj:
+            return cls.circle(*obj[CIRCLE])
+        return cls.polygon(obj[POLYGON])
+
+    def __repr__(self):
+        if self.kind == CIRCLE:
+            return "Oval.circle(%r, %r, %r)" % self.data
+        return f"Oval.polygon({len(self.data)} points)"
+
+
+def _signed_area(pts) -> float:
+    s = 0.0
+    x1, y1 = pts[-1]
+    for x2, y2 in pts:
+        s += x1 * y2 - x2 * y1
+        x1, y1 = x2, y2
+    return s / 2
+
+
+# ---------- Balayage ----------
+# Morceau x-monotone : (xl, xr, owner, interior_below, kind, p0, p1, p2)
+#   demi-cercle : kind 0, (cx, cy, r², ±1)      segment : kind 1, (x1, y1, pente) avec x1 < x2
+def _pieces(i: int, oval: Oval) -> List[tuple]:
+    if oval.kind == CIRCLE:
+        cx, cy, r = oval.data
+        return [(cx - r, cx + r, i, True, 0, cx, cy, r * r, 1.0),
+                (cx - r, cx + r, i, False, 0, cx, cy, r * r, -1.0)]
+    out = []
+    pts = oval.data
+    x1, y1 = pts[-1]
+    for x2, y2 in pts:
+        if x1 != x2:
+            # polygone direct : l'intérieur est à gauche du sens de parcours,
+            # donc sous une arête parcourue de droite à gauche
+            slope = (y2 - y1) / (x2 - x1)
+            if x1 < x2:
+                out.append((x1, x2, i, False, 1, x1, y1, slope, 0.0))
+            else:
+                out.append((x2, x1, i, True, 1, x2, y2, slope, 0.0))
+        x1, y1 = x2, y2
+    return out
+
+
+def _y_at(p: tuple, x: float) -> float:
+    if p[4]:
+        return p[6] + p[7] * (x - p[5])
+    d = p[7] - (x - p[5]) ** 2
+    return p[6] + p[8] * math.sqrt(d) if d > 0 else p[6]
+
+
+def _slope_at(p: tuple, x: float) -> float:
+    if p[4]:
+        return p[7]
+    dx = x - p[5]
+    d = p[7] - dx * dx
+    if d <= 0:
+        return p[8] * (math.inf if dx <= 0 else -math.inf)
+    return -p[8] * dx / math.sqrt(d)
+
+
+class _Status:
+    """
+    Live pieces in y order, as a list of blocks of at most 2 * LOAD pieces: inserting into one
+    flat list of 10^5 pieces would move half of it each time. Keys depend on the sweep abscissa,
+    so blocks are located through the key of their last piece.
+    """
+    LOAD = 256
+
+    def __init__(self, key):
+        self.key = key
+        self.blocks: List[List[tuple]] = []
+        self._last_key = lambda block: key(block[-1])
+
+    def locate(self, value: float, right: bool = False) -> Tuple[int, int]:
+        """(block, index) of the first piece whose key is >= VALUE (> VALUE if RIGHT)."""
+        find = bisect.bisect_right if right else bisect.bisect_left
+        b = find(self.blocks, value, key=self._last_key)
+        if b == len(self.blocks):
+            return b, 0
+        return b, find(self.blocks[b], value, key=self.key)
+
+    def get(self, pos: Tuple[int, int]) -> Optional[tuple]:
+        b, k = pos
+        return self.blocks[b][k] if b < len(self.blocks) else None
+
+    def next(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        b, k = pos
+        return (b, k + 1) if k + 1 < len(self.blocks[b]) else (b + 1, 0)
+
+    def insert(self, pos: Tuple[int, int], piece: tuple):
+        b, k = pos
+        if b == len(self.blocks):
+            if not self.blocks:
+                self.blocks.append([piece])
+                return
+            b -= 1
+            k = len(self.blocks[b])
+        block = self.blocks[b]
+        block.insert(k, piece)
+        if len(block) > 2 * self.LOAD:
+            self.blocks[b:b + 1] = [block[:self.LOAD], block[self.LOAD:]]
+
+    def delete(self, pos: Tuple[int, int]):
+        b, k = pos
+        block = self.blocks[b]
+        del block[k]
+        if not block:
+            del self.blocks[b]
+
+
+def build_forest(ovals: Sequence[Oval]) -> List[int]:
+    """parent[i] for each oval (-1 for outermost ones), by a single sweep line."""
+    _INSERT, _QUERY, _REMOVE = 1, 2, 0  # à x égal : retraits, insertions, puis requêtes (x + ε)
+    events = []
+    for i, oval in enumerate(ovals):
+        for p in _pieces(i, oval):
+            events.append((p[0], _INSERT, 0.0, i, p))
+            events.append((p[1], _REMOVE, 0.0, i, p))
+        x0, y0 = oval.leftmost()
+        # requêtes d'une même abscisse de haut en bas : le parent d'un voisin du dessus est connu
+        events.append((x0, _QUERY, -y0, i, None))
+    events.sort(key=lambda e: (e[0], e[1], e[2], e[3]))
+
+    parent = [-1] * len(ovals)
+    x = 0.0
+    sqrt = math.sqrt
+
+    def y_key(p):  # _y_at(p, x) déroulé : c'est la clé de toutes les bissections
+        if p[4]:
+            return p[6] + p[7] * (x - p[5])
+        d = p[7] - (x - p[5]) ** 2
+        return p[6] + p[8] * sqrt(d) if d > 0 else p[6]
+
+    status = _Status(y_key)
+
+    for x, kind, neg_y, owner, piece in events:
+        if kind == _REMOVE:
+            y = _y_at(piece, x)
+            pos = status.locate(y - 1e-7 * (1.0 + abs(y) + piece[1] - piece[0]))
+            cur = status.get(pos)
+            while cur is not None and cur is not piece:
+                pos = status.next(pos)
+                cur = status.get(pos)
+            if cur is None:  # ordre du balayage incohérent : des ovales se croisent
+                raise ValueError(f"Ovals {owner} and another oval intersect near x={x:g}")
+            status.delete(pos)
+        elif kind == _INSERT:
+            y = _y_at(piece, x)
+            pos = status.locate(y)
+            cur = status.get(pos)
+            if cur is not None and _y_at(cur, x) == y:
+                # départ commun (sommet, cercle) : départager par la pente juste à droite
+                slope = _slope_at(piece, x)
+                while cur is not None and _y_at(cur, x) == y and _slope_at(cur, x) < slope:
+                    pos = status.next(pos)
+                    cur = status.get(pos)
+            status.insert(pos, piece)
+        else:
+            pos = status.locate(-neg_y, right=True)
+            above = status.get(pos)
+            while above is not None and above[2] == owner:
+                pos = status.next(pos)
+                above = status.get(pos)
+            if above is not None:
+                parent[owner] = above[2] if above[3] else parent[above[2]]
+    return parent
+
+
+# ---------- Arrangement ----------
+class Arrangement:
+    """
+    arr = Arrangement([Oval.circle(0, 0, 4), Oval.circle(0, 0, 2), Oval.circle(6, 0, 1)])
+    arr.depth(1) -> 2 ; arr.relation(0, 1) -> 'nested' ; arr.relation(1, 2) -> 'separated'
+    """
+
+    def __init__(self, ovals: Iterable[Oval] = ()):
+        self.ovals: List[Oval] = list(ovals)
+        self._parent: Optional[List[int]] = None
+
+    @classmethod
+    def from_circles(cls, circles: Iterable[Sequence[float]]) -> "Arrangement":
+        return cls(Oval.circle(cx, cy, r) for cx, cy, r in circles)
+
+    def add(self, oval: Oval) -> int:
+        self.ovals.append(oval)
+        self._parent = None
+        return len(self.ovals) - 1
+
+    def add_circle(self, cx: float, cy: float, r: float) -> int:
+        return self.add(Oval.circle(cx, cy, r))
+
+    def add_polygon(self, points) -> int:
+        return self.add(Oval.polygon(points))
+
+    def __len__(self):
+        return len(self.ovals)
+
+    # --- arbre ---
+    def build(self, parent: Optional[List[int]] = None) -> "Arrangement":
+        """Nesting tree of the ovals; PARENT skips the sweep when the caller already has it."""
+        parent = build_forest(self.ovals) if parent is None else list(parent)
+        n = len(parent)
+        children: List[List[int]] = [[] for _ in range(n)]
+        roots = []
+        for i, p in enumerate(parent):
+            (children[p] if p >= 0 else roots).append(i)
+        depth, size, tin, tout = [0] * n, [1] * n, [0] * n, [0] * n
+        clock = 0
+        order = []
+        stack = [(r, 1) for r in reversed(roots)]
+        while stack:  # DFS itératif : profondeur, ordre d'Euler
+            i, d = stack.pop()
+            if i < 0:
+                tout[~i] = clock
+                continue
+            depth[i] = d
+            tin[i] = clock
+            clock += 1
+            order.append(i)
+            stack.append((~i, d))
+            stack.extend((c, d + 1) for c in reversed(children[i]))
+        for i in reversed(order):
+            if parent[i] >= 0:
+                size[parent[i]] += size[i]
+        self._parent, self._children, self._roots = parent, children, roots
+        self._depth, self._size, self._tin, self._tout = depth, size, tin, tout
+        return self
+
+    def _tree(self):
+        if self._parent is None:
+            self.build()
+
+    @property
+    def parent(self) -> List[int]:
+        self._tree()
+        return self._parent
+
+    @property
+    def roots(self) -> List[int]:
+        self._tree()
+        return self._roots
+
+    def children(self, i: int) -> List[int]:
+        self._tree()
+        return self._children[i]
+
+    # --- requêtes ---
+    def depth(self, i: int = -1) -> int:
+        """Nesting depth of oval I (1 = outermost); depth() is the deepest nest of the arrangement."""
+        self._tree()
+        if i < 0:
+            return max(self._depth, default=0)
+        return self._depth[i]
+
+    def contains(self, i: int, j: int) -> bool:
+        """True if oval I strictly encloses oval J."""
+        self._tree()
+        return i != j and self._tin[i] < self._tin[j] and self._tout[j] <= self._tout[i]
+
+    def relation(self, i: int, j: int) -> str:
+        return "nested" if self.contains(i, j) or self.contains(j, i) else "separated"
+
+    def nest_size(self, i: int = -1) -> int:
+        """Ovals of the nest rooted at I, I included; nest_size() is the number of ovals."""
+        self._tree()
+        return len(self.ovals) if i < 0 else self._size[i]
+
+    def complexity(self) -> Dict[str, int]:
+        """Ovals, outermost ovals, empty ovals, depth and nested pairs (sum of depths - n)."""
+        self._tree()
+        n = len(self.ovals)
+        return {
+            "ovals": n,
+            "outer": len(self._roots),
+            "empty": sum(1 for c in self._children if not c),
+            "depth": self.depth(),
+            "nested_pairs": sum(self._depth) - n,
+        }
+
+    def scheme(self) -> str:
+        """
+        Viro notation of the nesting scheme: '2 ⊔ 1<1<1>>' for example_arrangement(), '0' when
+        there is no oval. Siblings are sorted, so isomorphic arrangements give the same text.
+        """
+        self._tree()
+        text: List[str] = [""] * len(self.ovals)
+        for i in sorted(range(len(self.ovals)), key=self._depth.__getitem__, reverse=True):
+            text[i] = "1" if not self._children[i] else f"1<{_siblings(text, self._children[i])}>"
+        return _siblings(text, self._roots) if self._roots else "0"
+
+    # --- sérialisation ---
+    def to_json(self) -> dict:
+        return {"ovals": [o.to_json() for o in self.ovals], "parent": self.parent}
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "Arrangement":
+        # "parent" est informatif : l'arbre est recalculé (le fichier a pu être édité à la main)
+        return cls(Oval.from_json(o) for o in obj["ovals"])
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "Arrangement":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_json(json.load(f))
+
+
+def _siblings(text: List[str], ids: List[int]) -> str:
+    empty = sum(1 for i in ids if text[i] == "1")
+    parts = sorted(text[i] for i in ids if text[i] != "1")
+    return " ⊔ ".join(([str(empty)] if empty else []) + parts)
+
+
+def example_arrangement() -> Arrangement:
+    """
+    The figure of app.visualize_hilbertB, a nest of depth 3 and two separate ovals, with the
+    separate ovals moved out of the nest (in the drawing they cross its outer oval).
+    """
+    return Arrangement.from_circles([(0, 0, 1), (0, 0, 0.8), (0, 0, 0.6), (-1.6, -1.2, 0.3), (1.6, 1.2, 0.4)])
+
+
+# ---------- Accès depuis la DSL ----------
+ARRANGEMENT_DSL = (
+    "DEFINE ○ WITH depth(a)\n"                                # profondeur de l'ovale a
+    "DEFINE ⊂ WITH 1 if contains(b, a) else 0\n"              # a est dans b
+    "DEFINE Δ WITH relation(a, b)\n"                          # 'nested' / 'separated'
+    "DEFINE χ WITH nest_size(a) + nest_size(b)\n"             # ○ = 1, ⊂ = somme, sur des nids réels
+)
+
+
+class ArrangementBinding:
+    """
+    Functions registered in an engine. `arrangement` may be swapped without reloading the DSL:
+    the engine's cached results of the operators whose laws call these functions are dropped
+    and a new snapshot is published, since the laws no longer depend on (a, b) alone.
+    """
+
+    def __init__(self, arrangement: Arrangement, engine=None):
+        self._arrangement = arrangement
+        self.engine = engine
+
+    @property
+    def arrangement(self) -> Arrangement:
+        return self._arrangement
+
+    @arrangement.setter
+    def arrangement(self, arrangement: Arrangement):
+        engine = self.engine
+        if engine is None:
+            self._arrangement = arrangement
+            return
+        with engine._lock:
+            self._arrangement = arrangement
+            names = set(self.functions())
+            stale = [op for op, spec in engine.ops.items() if _law_names(spec) & names]
+            for op in stale:
+                engine._invalidate(op)
+            if stale:
+                engine._publish()
+
+    def functions(self) -> Dict[str, object]:
+        # les opérandes DSL arrivent en float ; -1 désigne l'arrangement entier
+        return {
+            "depth": lambda i=-1: self.arrangement.depth(int(i)),
+            "contains": lambda i, j: self.arrangement.contains(int(i), int(j)),
+            "relation": lambda i, j: self.arrangement.relation(int(i), int(j)),
+            "nest_size": lambda i=-1: self.arrangement.nest_size(int(i)),
+            "parent_of": lambda i: self.arrangement.parent[int(i)],
+        }
+
+
+def _law_names(spec: dict) -> set:
+    names = set()
+    for law in spec.get("laws") or [spec.get("law")]:
+        expr = getattr(law, "expr", None)
+        if expr:
+            names.update(n.id for n in ast.walk(ast.parse(expr.strip(), mode="eval")) if isinstance(n, ast.Name))
+    return names
+
+
+def bind_arrangement(engine, arrangement: Arrangement, dsl: Optional[str] = ARRANGEMENT_DSL) -> ArrangementBinding:
+    """
+    Registers the arrangement queries as law functions of ENGINE and, unless DSL is None, loads
+    ARRANGEMENT_DSL: '0 Δ 1' -> 'nested', '1 ○ 0' -> depth of oval 1, '0 χ 3' -> nest sizes.
+    """
+    binding = ArrangementBinding(arrangement, engine)
+    for name, fn in binding.functions().items():
+        engine.register_function(name, fn)
+    if dsl:
+        engine.load_rules_from_text(dsl)
+    return binding
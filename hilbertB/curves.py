@@ -0,0 +1,348 @@
+"""
+Courbes réelles (Partie B) : ovales de P(x, y) = 0 par marching squares, contrôlés par Harnack.
+
+    python app.py curve "x**4 + y**4 - 3*x**2*y**2 + 0.5*x**2 - 1" --box -2 2 -2 2 --res 4096
+
+P is sampled on a res x res grid of the box, tile by tile: each tile (at most tile x tile cells)
+is evaluated as two Vandermonde products, Vy · Cᵀ · Vxᵀ, then traced with a vectorized marching
+squares (saddle cells resolved by the sign at the cell centre). Tiles run in a process pool and
+only send back their segments, so memory is bounded by the tile size, not by the resolution.
+
+Segment endpoints are identified by the grid edge they lie on, which makes stitching exact
+(across tiles too): closed loops are the ovals, chains ending on the box border are branches
+leaving the window (pseudo-lines, ovals cut by the box). The ovals become an Arrangement, whose
+scheme feeds ⊂ / Δ / χ through bind_arrangement(), and their number is checked against the
+Harnack bound H(n) evaluated by the engine's ⊕ law.
+"""
+import argparse, ast, json, os, sys
+from typing import Dict, List, Tuple
+
+from hilbertB.arrangement import Arrangement, Oval
+from law_compiler import load_numpy
+
+Box = Tuple[float, float, float, float]  # (xmin, xmax, ymin, ymax)
+
+_state = {}  # état du processus worker (matrice des coefficients, axes)
+
+# saddle : (centre > 0, centre <= 0) -> paires d'arêtes (0 bas, 1 droite, 2 haut, 3 gauche)
+_SADDLES = {
+    5: (((0, 1), (2, 3)), ((3, 0), (1, 2))),
+    10: (((3, 0), (1, 2)), ((0, 1), (2, 3))),
+}
+
+
+def _numpy():
+    np = load_numpy()
+    if np is None:
+        raise RuntimeError("curve extraction requires numpy")
+    return np
+
+
+class Polynomial:
+    """P(x, y) = Σ c[i, j] x^i y^j, stored as {(i, j): c}."""
+
+    def __init__(self, coeffs: Dict[Tuple[int, int], float]):
+        self.coeffs = {(int(i), int(j)): float(c) for (i, j), c in coeffs.items() if c}
+        if not self.coeffs:
+            raise ValueError("The zero polynomial has no curve")
+        if any(i < 0 or j < 0 for i, j in self.coeffs):
+            raise ValueError("Exponents must be non-negative")
+
+    @property
+    def degree(self) -> int:
+        return max(i + j for i, j in self.coeffs)
+
+    @classmethod
+    def parse(cls, text: str) -> "Polynomial":
+        """'x**4 + y^4 - 3*x**2*y**2 - 1' (numbers, x, y, + - * /number, ** or ^ integer)."""
+        try:
+            tree = ast.parse(text.replace("^", "**").strip(), mode="eval")
+        except SyntaxError as ex:
+            raise ValueError(f"Invalid polynomial '{text}': {ex.msg}") from None
+        return cls(_poly_of(tree.body, text))
+
+    @classmethod
+    def from_matrix(cls, matrix) -> "Polynomial":
+        """C[i][j] is the coefficient of x^i y^j."""
+        return cls({(i, j): c for i, row in enumerate(matrix) for j, c in enumerate(row)})
+
+    def matrix(self):
+        np = _numpy()
+        n = self.degree
+        mat = np.zeros((n + 1, n + 1))
+        for (i, j), c in self.coeffs.items():
+            mat[i, j] = c
+        return mat
+
+    def __call__(self, x, y):
+        return sum(c * x ** i * y ** j for (i, j), c in self.coeffs.items())
+
+    def __str__(self):
+        text = ""
+        for (i, j), c in sorted(self.coeffs.items(), key=lambda kv: (-sum(kv[0]), -kv[0][0])):
+            mono = "*".join(f"{v}**{e}" if e > 1 else v for v, e in (("x", i), ("y", j)) if e)
+            mag = f"{abs(c):g}"
+            term = mono if mono and mag == "1" else f"{mag}*{mono}" if mono else mag
+            text += (" - " if c < 0 else " + ") + term if text else ("-" if c < 0 else "") + term
+        return text
+
+
+def _poly_of(node, text: str) -> Dict[Tuple[int, int], float]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return {(0, 0): float(node.value)}
+    if isinstance(node, ast.Name) and node.id in ("x", "y"):
+        return {(1, 0) if node.id == "x" else (0, 1): 1.0}
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        p = _poly_of(node.operand, text)
+        return {k: -c for k, c in p.items()} if isinstance(node.op, ast.USub) else p
+    if isinstance(node, ast.BinOp):
+        left = _poly_of(node.left, text)
+        if isinstance(node.op, ast.Pow):
+            e = node.right
+            if not (isinstance(e, ast.Constant) and isinstance(e.value, int) and 0 <= e.value <= 64):
+                raise ValueError(f"Exponents must be integers in [0, 64] in '{text}'")
+            out = {(0, 0): 1.0}
+            for _ in range(e.value):
+                out = _mul(out, left)
+            return out
+        right = _poly_of(node.right, text)
+        if isinstance(node.op, ast.Add):
+            return _add(left, right, 1.0)
+        if isinstance(node.op, ast.Sub):
+            return _add(left, right, -1.0)
+        if isinstance(node.op, ast.Mult):
+            return _mul(left, right)
+        if isinstance(node.op, ast.Div) and set(right) == {(0, 0)} and right[(0, 0)]:
+            return {k: c / right[(0, 0)] for k, c in left.items()}
+    raise ValueError(f"Unsupported term '{ast.unparse(node)}' in polynomial '{text}'")
+
+
+def _add(p: dict, q: dict, sign: float) -> dict:
+    out = dict(p)
+    for k, c in q.items():
+        out[k] = out.get(k, 0.0) + sign * c
+    return out
+
+
+def _mul(p: dict, q: dict) -> dict:
+    out: Dict[Tuple[int, int], float] = {}
+    for (i1, j1), c1 in p.items():
+        for (i2, j2), c2 in q.items():
+            k = (i1 + i2, j1 + j2)
+            out[k] = out.get(k, 0.0) + c1 * c2
+    return out
+
+
+# ---------- Échantillonnage et marching squares (par tuile) ----------
+def sample(coeffs, xs, ys):
+    """P on the grid: result[k, l] = P(xs[l], ys[k])."""
+    np = _numpy()
+    n = coeffs.shape[0] - 1
+    vander = np.polynomial.polynomial.polyvander
+    return vander(ys, n) @ coeffs.T @ vander(xs, n).T
+
+
+def trace_tile(coeffs, xs, ys, row0: int, col0: int, ncols: int):
+    """
+    Marching squares on one tile whose lower-left sample is (row0, col0) of a grid NCOLS samples
+    wide. Returns (segments (k, 2) of global edge ids, edge ids (m,), points (m, 2)). Edge ids:
+    2 * (row * NCOLS + col) for the horizontal edge right of a sample, + 1 for the vertical one.
+    """
+    np = _numpy()
+    f = sample(coeffs, xs, ys)
+    pos = f > 0
+    rows, cols = f.shape
+    r_idx = (np.arange(rows) + row0)[:, None]
+    c_idx = (np.arange(cols) + col0)[None, :]
+    node = r_idx * ncols + c_idx
+
+    # points de passage sur les arêtes coupées
+    h_cut = pos[:, :-1] != pos[:, 1:]
+    v_cut = pos[:-1, :] != pos[1:, :]
+    hr, hc = np.nonzero(h_cut)
+    vr, vc = np.nonzero(v_cut)
+    f0, f1 = f[hr, hc], f[hr, hc + 1]
+    hx = xs[hc] + (xs[hc + 1] - xs[hc]) * (f0 / (f0 - f1))
+    f0, f1 = f[vr, vc], f[vr + 1, vc]
+    vy = ys[vr] + (ys[vr + 1] - ys[vr]) * (f0 / (f0 - f1))
+    ids = np.concatenate([2 * node[hr, hc], 2 * node[vr, vc] + 1])
+    points = np.concatenate([np.column_stack([hx, ys[hr]]), np.column_stack([xs[vc], vy])])
+
+    # cellules : coins 0 bas-gauche, 1 bas-droite, 2 haut-droite, 3 haut-gauche
+    case = (pos[:-1, :-1] * 1 | pos[:-1, 1:] * 2 | pos[1:, 1:] * 4 | pos[1:, :-1] * 8)
+    edge = np.stack([2 * node[:-1, :-1], 2 * node[:-1, 1:] + 1, 2 * node[1:, :-1], 2 * node[:-1, :-1] + 1], axis=-1)
+    cut = np.stack([h_cut[:-1, :], v_cut[:, 1:], h_cut[1:, :], v_cut[:, :-1]], axis=-1)
+    simple = (case != 0) & (case != 15) & (case != 5) & (case != 10)
+    pairs = [edge[simple][cut[simple]].reshape(-1, 2)]
+    for code, (if_pos, if_neg) in _SADDLES.items():
+        cr, cc = np.nonzero(case == code)
+        if not len(cr):
+            continue
+        centre = (f[cr, cc] + f[cr, cc + 1] + f[cr + 1, cc] + f[cr + 1, cc + 1]) > 0
+        cell_edges = edge[cr, cc]
+        for mask, choice in ((centre, if_pos), (~centre, if_neg)):
+            for a, b in choice:
+                pairs.append(np.column_stack([cell_edges[mask, a], cell_edges[mask, b]]))
+    return np.concatenate(pairs).astype(np.int64), ids.astype(np.int64), points
+
+
+def tiles(nrows: int, ncols: int, tile: int):
+    """(r0, r1, c0, c1) sample ranges, inclusive of the shared border row / column."""
+    for r0 in range(0, nrows - 1, tile):
+        for c0 in range(0, ncols - 1, tile):
+            yield r0, min(r0 + tile, nrows - 1), c0, min(c0 + tile, ncols - 1)
+
+
+def _init_worker(coeffs, xs, ys):
+    _state.update(coeffs=coeffs, xs=xs, ys=ys)
+
+
+def _trace(task):
+    r0, r1, c0, c1 = task
+    st = _state
+    return trace_tile(st["coeffs"], st["xs"][c0:c1 + 1], st["ys"][r0:r1 + 1], r0, c0, len(st["xs"]))
+
+
+# ---------- Assemblage ----------
+def stitch(segments, ids, points) -> Tuple[List, List]:
+    """Closed loops and open chains (lists of (x, y)) from the segments of all tiles."""
+    np = _numpy()
+    if not len(segments):
+        return [], []
+    keys, first = np.unique(ids, return_index=True)  # arêtes de bord de tuile : vues deux fois
+    coords = points[first].tolist()
+    ends = np.searchsorted(keys, segments.ravel())
+    # chaque sommet (arête de la grille) touche au plus deux segments
+    order = np.argsort(ends, kind="stable")
+    nb = [[] for _ in range(len(keys))]
+    seg = order // 2
+    other = ends.reshape(-1, 2)[seg, 1 - order % 2]
+    for v, u in zip(ends[order].tolist(), other.tolist()):
+        nb[v].append(u)
+
+    seen = [False] * len(keys)
+
+    def walk(start):
+        path, prev, cur = [start], -1, start
+        seen[start] = True
+        while True:
+            nxt = [u for u in nb[cur] if u != prev]
+            if not nxt or nxt[0] == start or seen[nxt[0]]:
+                return path
+            prev, cur = cur, nxt[0]
+            seen[cur] = True
+            path.append(cur)
+
+    chains = [[coords[v] for v in walk(v)] for v in range(len(keys)) if len(nb[v]) == 1 and not seen[v]]
+    loops = [[coords[v] for v in walk(v)] for v in range(len(keys)) if not seen[v]]
+    return loops, chains
+
+
+def harnack_bound(degree: int, engine=None) -> float:
+    """H(n) through the ⊕ law (by default the one of MockProvider's 'Partie A')."""
+    if engine is None:
+        from rule_engine import RuleEngine
+        from sweep import default_dsl
+        engine = RuleEngine()
+        engine.load_rules_from_text(default_dsl())
+    return engine.evaluate_expression(f"{degree} ⊕ 0")
+
+
+class CurveOvals:
+    """Result of extract_ovals(): the arrangement of the ovals and the Harnack check."""
+
+    def __init__(self, poly: Polynomial, arrangement: Arrangement, branches: List, bound: float, res: int):
+        self.poly = poly
+        self.arrangement = arrangement
+        self.branches = branches
+        self.bound = bound
+        self.res = res
+
+    @property
+    def count(self) -> int:
+        return len(self.arrangement)
+
+    @property
+    def within_harnack(self) -> bool:
+        # au-delà de H(n) : résolution trop faible (faux ovales près d'un point singulier) ou P mal saisi
+        return self.count <= self.bound
+
+    def as_dict(self) -> dict:
+        return {
+            "polynomial": str(self.poly),
+            "degree": self.poly.degree,
+            "resolution": self.res,
+            "ovals": self.count,
+            "open_branches": len(self.branches),
+            "scheme": self.arrangement.scheme(),
+            "harnack_bound": self.bound,
+            "within_harnack": self.within_harnack,
+            **{k: v for k, v in self.arrangement.complexity().items() if k != "ovals"},
+        }
+
+
+def extract_ovals(poly, box: Box = (-2.0, 2.0, -2.0, 2.0), res: int = 1024, tile: int = 512,
+                  workers: int = 1, engine=None) -> CurveOvals:
+    """
+    Ovals of POLY = 0 inside BOX on a RES x RES cell grid. POLY is a Polynomial or its text.
+    workers=0 uses os.cpu_count(); ENGINE (with a ⊕ law) computes the Harnack bound.
+    """
+    np = _numpy()
+    poly = Polynomial.parse(poly) if isinstance(poly, str) else poly
+    xmin, xmax, ymin, ymax = box
+    if not (xmin < xmax and ymin < ymax) or res < 2 or tile < 1:
+        raise ValueError(f"Bad sampling: box {box}, res {res}, tile {tile}")
+    xs = np.linspace(xmin, xmax, res + 1)
+    ys = np.linspace(ymin, ymax, res + 1)
+    coeffs = poly.matrix()
+    tasks = list(tiles(len(ys), len(xs), tile))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        _init_worker(coeffs, xs, ys)
+        try:
+            parts = [_trace(t) for t in tasks]
+        finally:
+            _state.clear()
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(coeffs, xs, ys)) as pool:
+            parts = list(pool.map(_trace, tasks))
+    segments = np.concatenate([p[0] for p in parts])
+    ids = np.concatenate([p[1] for p in parts])
+    points = np.concatenate([p[2] for p in parts])
+    loops, chains = stitch(segments, ids, points)
+    arrangement = Arrangement(Oval.polygon(loop) for loop in loops).build()
+    return CurveOvals(poly, arrangement, chains, harnack_bound(poly.degree, engine), res)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="app.py curve", description="Ovales réels d'un polynôme P(x, y)")
+    p.add_argument("polynomial", help="P(x, y), par ex. 'x**2 + y**2 - 1'")
+    p.add_argument("--box", nargs=4, type=float, default=[-2.0, 2.0, -2.0, 2.0],
+                   metavar=("XMIN", "XMAX", "YMIN", "YMAX"))
+    p.add_argument("--res", type=int, default=1024, help="cellules par côté")
+    p.add_argument("--tile", type=int, default=512, help="cellules par côté de tuile")
+    p.add_argument("--workers", type=int, default=0, help="processus (0 = nombre de CPU, 1 = sans pool)")
+    p.add_argument("--save", metavar="FICHIER", help="arrangement JSON (Arrangement.load)")
+    p.add_argument("--json", action="store_true", help="rapport JSON sur stdout")
+    args = p.parse_args(argv)
+    try:
+        result = extract_ovals(args.polynomial, tuple(args.box), args.res, args.tile, args.workers)
+    except (ValueError, RuntimeError) as ex:
+        p.error(str(ex))
+    if args.save:
+        result.arrangement.save(args.save)
+    info = result.as_dict()
+    if args.json:
+        print(json.dumps(info, ensure_ascii=False, indent=2))
+    else:
+        print(f"P = {info['polynomial']}  (degré {info['degree']})")
+        print(f"{info['ovals']} ovale(s), {info['open_branches']} branche(s) ouverte(s), schéma {info['scheme']}")
+        verdict = "OK" if info["within_harnack"] else "DÉPASSÉE (résolution ?)"
+        print(f"borne de Harnack H({info['degree']}) = {info['harnack_bound']:g} : {verdict}")
+    return 0 if result.within_harnack else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,495 @@
+"""
+Patchwork combinatoire de Viro : courbes réelles de degré n (Partie B) à partir d'une
+triangulation du triangle T_n et d'une distribution de signes.
+
+    python app.py patchwork --degree 8 --samples 5000 --workers 8
+    python app.py patchwork --degree 6 --signs harnack --save m_sextic.json
+
+T_n = {(i, j) : i, j >= 0, i + j <= n} is triangulated by cutting each unit square along one of
+its diagonals (the half squares along the hypotenuse are forced). Any choice of diagonals is
+convex (heights g(i, j) = Σ_{a<i, b<j} D(a, b) realize it), so Viro's theorem applies and the
+result is isotopic to a real algebraic curve. A sign σ(i, j) is given to every lattice point.
+
+The triangulation is reflected into the four quadrants, the sign of (±i, ±j) being
+σ(i, j) (±1)^i (±1)^j, and in every triangle with both signs a segment joins the midpoints of
+its two sign-changing edges (all quadrants at once, with NumPy). The diamond |x| + |y| <= n with
+antipodal boundary points identified is RP²: closed loops inside are affine ovals, chains
+reaching the boundary close up through the identification into ovals crossing the line at
+infinity or, for odd n, the pseudo-line J.
+
+When an oval crosses the line at infinity, nesting cannot be read in the diamond: the Harnack
+sextic ⟨9 ⊔ 1⟨1⟩⟩ shows 10 affine ovals there and a nest through infinity. The curve is then
+lifted to the sphere that double covers RP² (the octahedron |x| + |y| + |z| = n, upper half
+= the diamond) and projected stereographically from a point of the non-orientable region of
+the complement (even n) or from a point off the hemisphere bounded by the lift of J (odd n).
+One lift of each oval is kept, and in that chart every oval is affine and bounds its disk of RP².
+All ovals form an Arrangement (scheme, depth, Δ through bind_arrangement); the number of
+components is compared with H(n) = ⊕(n). sample() draws triangulations and signs in a process
+pool and reports how often the Harnack bound is reached.
+"""
+import argparse, json, os, sys
+from collections import Counter
+from typing import List, Optional
+
+from hilbertB.arrangement import Arrangement, Oval
+from hilbertB.curves import _numpy, harnack_bound, stitch
+
+SIGNS = ("random", "harnack")
+
+_state = {}  # état du processus worker (degré, borne H, mode des signes)
+
+
+def square_count(degree: int) -> int:
+    """Unit squares of T_n (lower-left corner (i, j) with i + j <= n - 2)."""
+    return (degree - 1) * degree // 2
+
+
+def triangles(degree: int, diagonals=None):
+    """
+    (T, 3, 2) lattice vertices of the triangulation. DIAGONALS[k] (one bool per unit square, in
+    the order of square_count) picks the (i, j)-(i+1, j+1) diagonal; None picks it everywhere.
+    """
+    np = _numpy()
+    i, j = np.nonzero(np.add.outer(np.arange(degree), np.arange(degree)) <= degree - 2)
+    d = np.ones(len(i), bool) if diagonals is None else np.asarray(diagonals, bool)
+    if d.shape != i.shape:
+        raise ValueError(f"Degree {degree} needs {len(i)} diagonals, got {d.size}")
+    p00, p10 = np.stack([i, j], -1), np.stack([i + 1, j], -1)
+    p01, p11 = np.stack([i, j + 1], -1), np.stack([i + 1, j + 1], -1)
+    dd = d[:, None]
+    first = np.stack([p00, p10, np.where(dd, p11, p01)], 1)
+    second = np.stack([np.where(dd, p00, p10), p11, p01], 1)
+    h = np.arange(degree)
+    hyp = np.stack([np.stack([h, degree - 1 - h], -1), np.stack([h + 1, degree - 1 - h], -1),
+                    np.stack([h, degree - h], -1)], 1)
+    return np.concatenate([first, second, hyp])
+
+
+def harnack_signs(degree: int):
+    """Harnack's distribution: + where i and j are both even, - elsewhere (an M-curve)."""
+    np = _numpy()
+    i, j = np.indices((degree + 1, degree + 1))
+    return np.where((i % 2 == 0) & (j % 2 == 0), 1, -1)
+
+
+def random_signs(degree: int, rng):
+    return _numpy().where(rng.random((degree + 1, degree + 1)) < 0.5, -1, 1)
+
+
+def segments(degree: int, tris, signs):
+    """Segments of the curve in the four quadrants: (segments of ids, ids, points) for stitch()."""
+    np = _numpy()
+    side = 4 * degree + 1
+    seg_ids, ids, points = [], [], []
+    s = signs[tris[..., 0], tris[..., 1]]
+    odd = tris % 2 == 1
+    for ex in (1, -1):
+        for ey in (1, -1):
+            sq = s * np.where(odd[..., 0] & (ex < 0), -1, 1) * np.where(odd[..., 1] & (ey < 0), -1, 1)
+            mixed = ~((sq[:, 0] == sq[:, 1]) & (sq[:, 1] == sq[:, 2]))
+            t = tris[mixed] * np.array([ex, ey])
+            sq = sq[mixed]
+            # sommet isolé : celui dont le signe diffère des deux autres
+            k = np.where(sq[:, 0] == sq[:, 1], 2, np.where(sq[:, 0] == sq[:, 2], 1, 0))
+            rows = np.arange(len(t))
+            apex = t[rows, k]
+            ends = []
+            for shift in (1, 2):
+                twice = apex + t[rows, (k + shift) % 3]  # milieu x 2 : coordonnées entières
+                key = (twice[:, 0] + 2 * degree) * side + twice[:, 1] + 2 * degree
+                ids.append(key)
+                points.append(twice / 2.0)
+                ends.append(key)
+            seg_ids.append(np.stack(ends, 1))
+    return np.concatenate(seg_ids).astype(np.int64), np.concatenate(ids).astype(np.int64), np.concatenate(points)
+
+
+def _glue(chains: List[list]) -> List[List[int]]:
+    """Chains (indices) of each component of RP², closing chains through antipodal boundary points."""
+    where = {}
+    for c, chain in enumerate(chains):
+        for end in (chain[0], chain[-1]):
+            where.setdefault((round(end[0] * 2), round(end[1] * 2)), []).append(c)
+    link = [[] for _ in chains]
+    for (x, y), cs in where.items():
+        for c in cs:
+            link[c].extend(where.get((-x, -y), ()))
+    seen, groups = [False] * len(chains), []
+    for c in range(len(chains)):
+        if seen[c]:
+            continue
+        stack, group = [c], []
+        seen[c] = True
+        while stack:
+            cur = stack.pop()
+            group.append(cur)
+            for nxt in link[cur]:
+                if not seen[nxt]:
+                    seen[nxt] = True
+                    stack.append(nxt)
+        groups.append(group)
+    return groups
+
+
+# ---------- Carte projective : tous les ovales affines ----------
+def _sphere(degree: int, points, sheet: int):
+    """Diamond points lifted to the octahedron |x| + |y| + |z| = n, upper (+1) or antipodal (-1) sheet."""
+    np = _numpy()
+    p = np.asarray(points, float)
+    return sheet * np.column_stack([p, degree - np.abs(p).sum(1)])
+
+
+def _lift(degree: int, chains: List[list], group: List[int]):
+    """
+    Closed lift to the sphere of the component made of the chains of GROUP: each time a chain
+    reaches the boundary, the curve goes on in the other sheet with the chain ending at the
+    antipodal boundary point. An oval (even number of chains) gives one of its two lifts, the
+    pseudo-line J its whole connected lift. Returns the points and {chain: sheet walked first}.
+    """
+    np = _numpy()
+    ends = {}
+    for c in group:
+        for k in (0, -1):
+            x, y = chains[c][k]
+            ends[(round(x * 2), round(y * 2))] = (c, k)
+    parts, sheets = [], {}
+    start = state = (group[0], True, 1)
+    while True:
+        c, forward, sheet = state
+        sheets.setdefault(c, sheet)
+        seq = chains[c] if forward else chains[c][::-1]
+        parts.append(_sphere(degree, seq[:-1], sheet))  # le dernier point ouvre le morceau suivant
+        x, y = seq[-1]
+        c, k = ends[(round(-x * 2), round(-y * 2))]
+        state = (c, k == 0, -sheet)
+        if state == start:
+            return np.concatenate(parts), sheets
+
+
+def _regions(degree: int, tris, signs):
+    """
+    Regions of the sphere minus the lifted curve. Lattice points are joined by the same-sign
+    edges of the triangulation on both sheets (the antipodal sheet has the same edges, its signs
+    are multiplied by (-1)^n), and boundary points are glued to their antipodes. Returns the
+    region label of every lattice point (upper sheet at (x + n) * (2n + 1) + y + n, antipodal
+    sheet after it) and the sign-changing edges of the upper sheet as (p, q, doubled midpoint).
+    """
+    np = _numpy()
+    side = 2 * degree + 1
+    size = side * side
+    parent = list(range(2 * size))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = find(i), find(j)
+        if i != j:
+            parent[i] = j
+
+    s = signs[tris[..., 0], tris[..., 1]]
+    odd = tris % 2 == 1
+    pairs, same = [], []
+    for ex in (1, -1):
+        for ey in (1, -1):
+            sq = s * np.where(odd[..., 0] & (ex < 0), -1, 1) * np.where(odd[..., 1] & (ey < 0), -1, 1)
+            ids = (tris[..., 0] * ex + degree) * side + tris[..., 1] * ey + degree
+            for u, v in ((0, 1), (1, 2), (0, 2)):
+                pairs.append(np.stack([ids[:, u], ids[:, v]], 1))
+                same.append(sq[:, u] == sq[:, v])
+    pairs, same = np.concatenate(pairs), np.concatenate(same)
+    # une arête intérieure appartient à deux triangles : chacune une seule fois
+    pairs, first = np.unique(np.sort(pairs, 1), axis=0, return_index=True)
+    same = same[first]
+    for i, j in pairs[same].tolist():  # feuillet supérieur ; l'antipodal en est une copie
+        union(i, j)
+    upper = [find(i) for i in range(size)]
+    for x in range(-degree, degree + 1):
+        for y in {degree - abs(x), abs(x) - degree}:
+            union(size + upper[(x + degree) * side + y + degree], upper[(degree - x) * side + degree - y])
+    label = [find(r) for r in upper] + [find(size + r) for r in upper]
+    p, q = pairs[~same].T
+    mid = np.stack(divmod(p, side), 1) + np.stack(divmod(q, side), 1) - 2 * degree
+    return label, list(zip(p.tolist(), q.tolist(), map(tuple, mid.tolist())))
+
+
+def _stereographic(lifts: list, pole, near: float) -> list:
+    """
+    Projection of closed polylines of the sphere (octahedron, radially) to the plane, from POLE
+    (a unit vector). Segments within NEAR (octahedron units) of the pole are the ones the
+    projection bends most: they get intermediate points, so neighbouring ovals stay disjoint.
+    """
+    np = _numpy()
+    points = np.concatenate(lifts)
+    nxt = np.concatenate([np.roll(l, -1, axis=0) for l in lifts])
+    mid = (points + nxt) / 2
+    per = np.where(np.linalg.norm(mid - pole * np.linalg.norm(mid, axis=1)[:, None], axis=1) < near, 4, 1)
+    seg = np.repeat(np.arange(len(points)), per)
+    frac = (np.arange(len(seg)) - np.repeat(np.cumsum(per) - per, per)) / per[seg]
+    u = points[seg] + (nxt - points)[seg] * frac[:, None]
+    u /= np.sqrt((u * u).sum(1))[:, None]
+    ref = np.array([1.0, 0.0, 0.0]) if abs(pole[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    e1 = ref - ref.dot(pole) * pole
+    e1 /= np.linalg.norm(e1)
+    e2 = np.cross(pole, e1)
+    d = 1.0 - u @ pole
+    flat = np.column_stack([(u @ e1) / d, (u @ e2) / d])
+    cuts = np.cumsum(np.add.reduceat(per, np.cumsum([0] + [len(l) for l in lifts[:-1]])))[:-1]
+    return np.split(flat, cuts)
+
+
+def _projective_arrangement(degree: int, tris, signs, loops: List[list], chains: List[list],
+                            groups: List[List[int]]) -> Arrangement:
+    """
+    All ovals (affine or through infinity), as polygons of a chart where none meets infinity.
+    Lift k < m is one lift of oval k, k + m the other one and 2m the lift of J. Seen from the
+    pole, the lifts nest as the regions they separate: a search from the pole's region gives
+    the tree, and one lift of every oval is kept (the first of each outermost pair, or the
+    ones beyond J).
+    """
+    np = _numpy()
+    side = 2 * degree + 1
+    size = side * side
+    label, changes = _regions(degree, tris, signs)
+    lifts, upper = [], {}  # upper : point (x2) du feuillet supérieur -> relevé qui y passe
+    for loop in loops:
+        for x, y in loop:
+            upper[(round(x * 2), round(y * 2))] = len(lifts)
+        lifts.append(_sphere(degree, loop, 1))
+    crossing, line = [], None
+    for group in groups:
+        points, sheets = _lift(degree, chains, group)
+        if len(group) % 2:
+            line = points
+        else:
+            crossing.append((len(lifts), group, sheets))
+            lifts.append(points)
+    m = len(lifts)
+    for k, group, sheets in crossing:
+        for c in group:
+            for x, y in chains[c]:
+                upper[(round(x * 2), round(y * 2))] = k if sheets[c] == 1 else k + m
+    if line is not None:
+        for g in groups:
+            if len(g) % 2:
+                for c in g:
+                    for x, y in chains[c]:
+                        upper[(round(x * 2), round(y * 2))] = 2 * m
+    sides = [set() for _ in range(2 * m + 1)]
+    for i, j, mid in changes:
+        k = upper[mid]
+        sides[k].update((label[i], label[j]))
+        k = k + m if k < m else k - m if k < 2 * m else k  # le même point vu du feuillet antipodal
+        sides[k].update((label[size + i], label[size + j]))
+    if line is None:
+        # région non orientable : ses deux relevés n'en font qu'un
+        i = next(i for i in range(size) if label[i] == label[size + i])
+    else:
+        i = degree * side + degree  # origine : hors de la courbe, son hémisphère n'est pas gardé
+    x, y = divmod(i, side)
+    pole = np.array([x - degree, y - degree, degree - abs(x - degree) - abs(y - degree)], float)
+    pole /= np.linalg.norm(pole)
+    around = {}
+    for k, regions in enumerate(sides):
+        for r in regions:
+            around.setdefault(r, []).append(k)
+    parent = [None] * (2 * m + 1)
+    stack = [(label[i], -1)]
+    while stack:
+        r, via = stack.pop()
+        for k in around.get(r, ()):
+            if parent[k] is None:
+                parent[k] = via
+                stack.extend((inner, k) for inner in sides[k] if inner != r)
+    if line is None:
+        parent.pop()
+
+    def top(k):
+        while parent[k] >= 0 and parent[k] != 2 * m:
+            k = parent[k]
+        return k
+
+    keep = [k for k in range(2 * m) if (top(k) < m if line is None else parent[top(k)] == 2 * m)]
+    if len(keep) != m or None in parent:
+        raise RuntimeError(f"Projective chart of the degree {degree} curve lost ovals ({len(keep)}/{m})")
+    polys = _stereographic([lifts[k] if k < m else -lifts[k - m] for k in keep], pole, near=3.0)
+    index = {k: n for n, k in enumerate(keep)}
+    return Arrangement(Oval.polygon(p) for p in polys).build([index.get(parent[k], -1) for k in keep])
+
+
+class PatchworkCurve:
+    """A T-curve: all its ovals as an Arrangement (nesting in RP²), plus the pseudo-line J for odd n."""
+
+    def __init__(self, degree: int, diagonals, signs, engine=None, bound: Optional[float] = None):
+        self.degree = degree
+        self.diagonals = diagonals
+        self.signs = signs
+        tris = triangles(degree, diagonals)
+        loops, chains = stitch(*segments(degree, tris, signs))
+        groups = _glue(chains)
+        self.affine_ovals = len(loops)
+        self.pseudo_lines = sum(1 for g in groups if len(g) % 2)
+        self.at_infinity = len(groups) - self.pseudo_lines  # ovales coupés par la droite à l'infini
+        if self.at_infinity:
+            self.arrangement = _projective_arrangement(degree, tris, signs, loops, chains, groups)
+        else:  # le losange est déjà une carte affine de tous les ovales
+            self.arrangement = Arrangement(Oval.polygon(loop) for loop in loops).build()
+        self.bound = harnack_bound(degree, engine) if bound is None else bound
+
+    @property
+    def components(self) -> int:
+        return len(self.arrangement) + self.pseudo_lines
+
+    @property
+    def is_m_curve(self) -> bool:
+        return self.components >= self.bound
+
+    def as_dict(self) -> dict:
+        # schéma réel dans RP² (J en tête en degré impair)
+        scheme = self.arrangement.scheme()
+        if self.pseudo_lines:
+            scheme = "J" if scheme == "0" else f"J ⊔ {scheme}"
+        return {
+            "degree": self.degree,
+            "components": self.components,
+            "affine_ovals": self.affine_ovals,
+            "ovals_at_infinity": self.at_infinity,
+            "pseudo_lines": self.pseudo_lines,
+            "scheme": scheme,
+            "harnack_bound": self.bound,
+            "m_curve": self.is_m_curve,
+        }
+
+
+def patchwork(degree: int, diagonals=None, signs="harnack", seed: Optional[int] = None, engine=None,
+              bound: Optional[float] = None) -> PatchworkCurve:
+    """One curve: SIGNS is 'harnack', 'random' or a (n+1, n+1) array of ±1; SEED drives 'random'."""
+    np = _numpy()
+    if degree < 1:
+        raise ValueError(f"Degree must be >= 1, got {degree}")
+    if isinstance(signs, str):
+        if signs not in SIGNS:
+            raise ValueError(f"Unknown sign distribution '{signs}' ({' | '.join(SIGNS)})")
+        signs = harnack_signs(degree) if signs == "harnack" else random_signs(degree, np.random.default_rng(seed))
+    else:
+        signs = np.asarray(signs)
+        if signs.shape != (degree + 1, degree + 1) or not np.isin(signs, (-1, 1)).all():
+            raise ValueError(f"Signs must be a {degree + 1}x{degree + 1} array of ±1")
+    return PatchworkCurve(degree, diagonals, signs, engine, bound)
+
+
+# ---------- Échantillonnage parallèle ----------
+def _init_worker(degree: int, bound: float, signs: str):
+    _state.update(degree=degree, bound=bound, signs=signs)
+
+
+def _sample_chunk(seed: int, count: int):
+    np = _numpy()
+    st = _state
+    degree = st["degree"]
+    rng = np.random.default_rng(seed)
+    components, schemes = Counter(), Counter()
+    best = None
+    for _ in range(count):
+        diagonals = rng.random(square_count(degree)) < 0.5
+        signs = harnack_signs(degree) if st["signs"] == "harnack" else random_signs(degree, rng)
+        curve = PatchworkCurve(degree, diagonals, signs, bound=st["bound"])
+        info = curve.as_dict()
+        components[info["components"]] += 1
+        schemes[info["scheme"]] += 1
+        if best is None or info["components"] > best[0]["components"]:
+            best = (info, curve.arrangement.to_json())
+    return components, schemes, best
+
+
+def sample(degree: int, samples: int, signs: str = "random", workers: int = 0, seed: int = 0,
+           chunk: int = 64, engine=None) -> dict:
+    """
+    Draws SAMPLES random triangulations (and random signs unless SIGNS is 'harnack') in a process
+    pool. Returns the component histogram, the most frequent schemes, how many curves reach H(n)
+    and the arrangement of one curve with the most components.
+    """
+    np = _numpy()
+    if signs not in SIGNS:
+        raise ValueError(f"Unknown sign distribution '{signs}' ({' | '.join(SIGNS)})")
+    bound = harnack_bound(degree, engine)
+    seeds = np.random.SeedSequence(seed).generate_state(max(1, -(-samples // chunk)))
+    tasks = [(int(s), min(chunk, samples - k * chunk)) for k, s in enumerate(seeds)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        _init_worker(degree, bound, signs)
+        try:
+            parts = [_sample_chunk(*t) for t in tasks]
+        finally:
+            _state.clear()
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(degree, bound, signs)) as pool:
+            parts = list(pool.map(_sample_chunk, *zip(*tasks)))
+    components, schemes = Counter(), Counter()
+    best = None
+    for comp, sch, b in parts:
+        components.update(comp)
+        schemes.update(sch)
+        if best is None or b[0]["components"] > best[0]["components"]:
+            best = b
+    reached = sum(n for c, n in components.items() if c >= bound)
+    return {
+        "degree": degree,
+        "samples": samples,
+        "signs": signs,
+        "harnack_bound": bound,
+        "m_curves": reached,
+        "m_curve_rate": reached / samples if samples else 0.0,
+        "components": dict(sorted(components.items())),
+        "top_schemes": schemes.most_common(10),
+        "best": best[0],
+        "best_arrangement": best[1],
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="app.py patchwork", description="Courbes réelles par patchwork de Viro")
+    p.add_argument("--degree", type=int, required=True)
+    p.add_argument("--samples", type=int, default=1, help="triangulations tirées (1 = une seule courbe)")
+    p.add_argument("--signs", choices=SIGNS, default="random")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--workers", type=int, default=0, help="processus (0 = nombre de CPU, 1 = sans pool)")
+    p.add_argument("--save", metavar="FICHIER", help="arrangement JSON de la courbe (la meilleure si --samples)")
+    p.add_argument("--json", action="store_true", help="rapport JSON sur stdout")
+    args = p.parse_args(argv)
+    try:
+        if args.samples <= 1:
+            np = _numpy()
+            rng = np.random.default_rng(args.seed)
+            curve = patchwork(args.degree, rng.random(square_count(args.degree)) < 0.5, args.signs, args.seed)
+            info, arr_json = curve.as_dict(), curve.arrangement.to_json()
+        else:
+            info = sample(args.degree, args.samples, args.signs, args.workers, args.seed)
+            arr_json = info.pop("best_arrangement")
+    except (ValueError, RuntimeError) as ex:
+        p.error(str(ex))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(arr_json, f)
+    if args.json:
+        print(json.dumps(info, ensure_ascii=False, indent=2))
+    elif "samples" in info:
+        print(f"degré {info['degree']}, {info['samples']} courbe(s), signes {info['signs']} : "
+              f"{info['m_curves']} M-courbe(s) ({100 * info['m_curve_rate']:.1f} %), H = {info['harnack_bound']:g}")
+        print("composantes : " + ", ".join(f"{c}×{n}" for c, n in info["components"].items()))
+        print("schémas les plus fréquents :")
+        for scheme, n in info["top_schemes"]:
+            print(f"  {n:>6}  {scheme}")
+    else:
+        print(f"degré {info['degree']} : {info['components']} composante(s) (H = {info['harnack_bound']:g}), "
+              f"schéma {info['scheme']}, {info['ovals_at_infinity']} ovale(s) coupé(s) par la droite à l'infini")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
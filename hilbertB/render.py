@@ -0,0 +1,159 @@
+"""
+Rendu sans écran des arrangements d'ovales (PNG / SVG), du dessin d'exemple à 10^5+ ovales.
+
+    python app.py --problem "Hilbert B" --plot --out figure.png
+    python app.py render arrangements/ --out images/ --format svg --workers 8
+
+All circles go into one EllipseCollection and all polygons into one PolyCollection, coloured by
+nesting depth, so drawing cost does not grow with the number of artists. Files are written
+through a bare Figure on the Agg canvas (no pyplot state, no display needed); the format follows
+the extension of the output path.
+
+Level of detail: ovals smaller than min_px pixels are culled, ovals outside the view box are
+skipped, and polygon outlines are decimated to about one vertex per 2 pixels of their bounding
+box perimeter. A directory of arrangement JSON files (Arrangement.save) is rendered by a process
+pool, one file per task.
+"""
+import argparse, glob, math, os, sys
+from typing import Dict, List, Optional, Tuple
+
+from hilbertB.arrangement import CIRCLE, Arrangement
+
+Box = Tuple[float, float, float, float]  # (xmin, xmax, ymin, ymax)
+
+DEPTH_COLORS = ("blue", "red", "green", "purple", "orange", "teal", "brown", "magenta")
+
+
+def view_box(arr: Arrangement, margin: float = 0.05) -> Box:
+    if not len(arr):
+        return -1.0, 1.0, -1.0, 1.0
+    boxes = [o.bbox() for o in arr.ovals]
+    xmin, ymin = min(b[0] for b in boxes), min(b[1] for b in boxes)
+    xmax, ymax = max(b[2] for b in boxes), max(b[3] for b in boxes)
+    pad = margin * max(xmax - xmin, ymax - ymin)
+    return xmin - pad, xmax + pad, ymin - pad, ymax + pad
+
+
+def draw_arrangement(ax, arr: Arrangement, box: Optional[Box] = None, min_px: float = 1.0,
+                     lw: float = 1.5, by_depth: bool = True) -> Dict[str, int]:
+    """
+    Adds the ovals of ARR to AX as (at most) two collections. Returns {"drawn", "culled",
+    "vertices"}. The pixel size used for culling comes from the axes' size on its figure.
+    by_depth=False draws everything in one colour and skips building the nesting tree.
+    """
+    import numpy as np
+    from matplotlib.collections import EllipseCollection, PolyCollection
+
+    box = box or view_box(arr)
+    xmin, xmax, ymin, ymax = box
+    fig = ax.figure
+    pos = ax.get_position()
+    width_px = fig.get_figwidth() * fig.dpi * pos.width
+    height_px = fig.get_figheight() * fig.dpi * pos.height
+    px = min(width_px / (xmax - xmin), height_px / (ymax - ymin))  # pixels par unité
+
+    depth = [arr.depth(i) for i in range(len(arr))] if by_depth and len(arr) else [1] * len(arr)
+    circles: List[Tuple[float, float, float]] = []
+    circle_colors: List[str] = []
+    polys = []
+    poly_colors: List[str] = []
+    culled = vertices = 0
+    for i, oval in enumerate(arr.ovals):
+        bx0, by0, bx1, by1 = oval.bbox()
+        if bx1 < xmin or bx0 > xmax or by1 < ymin or by0 > ymax or max(bx1 - bx0, by1 - by0) * px < min_px:
+            culled += 1
+            continue
+        color = DEPTH_COLORS[(depth[i] - 1) % len(DEPTH_COLORS)]
+        if oval.kind == CIRCLE:
+            circles.append(oval.data)
+            circle_colors.append(color)
+            vertices += 1
+        else:
+            pts = oval.data
+            target = max(8, int(((bx1 - bx0) + (by1 - by0)) * px))  # ~ un sommet pour 2 px de périmètre
+            if len(pts) > target:
+                pts = pts[::math.ceil(len(pts) / target)]
+            polys.append(pts)
+            poly_colors.append(color)
+            vertices += len(pts)
+
+    if circles:
+        c = np.asarray(circles)
+        ax.add_collection(EllipseCollection(2 * c[:, 2], 2 * c[:, 2], np.zeros(len(c)), units="xy",
+                                            offsets=c[:, :2], offset_transform=ax.transData,
+                                            facecolors="none", edgecolors=circle_colors, linewidths=lw))
+    if polys:
+        ax.add_collection(PolyCollection(polys, closed=True, facecolors="none", edgecolors=poly_colors,
+                                         linewidths=lw))
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+    ax.set_aspect("equal")
+    return {"drawn": len(circles) + len(polys), "culled": culled, "vertices": vertices}
+
+
+def render_arrangement(arr: Arrangement, out: str, box: Optional[Box] = None, size: float = 6.0,
+                       dpi: int = 100, min_px: float = 1.0, title: Optional[str] = None,
+                       by_depth: bool = True) -> Dict[str, int]:
+    """Writes ARR to OUT (.png, .svg, .pdf... by extension) with the Agg canvas."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(size, size), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if title:
+        ax.set_title(title)
+    info = draw_arrangement(ax, arr, box, min_px, lw=1.5 if len(arr) < 1000 else 0.5, by_depth=by_depth)
+    fig.savefig(out)
+    return info
+
+
+def _render_job(job):
+    src, out, opts = job
+    info = render_arrangement(Arrangement.load(src), out, **opts)
+    return dict(info, src=src, out=out)
+
+
+def render_directory(src_dir: str, out_dir: str, fmt: str = "png", workers: int = 0,
+                     **opts) -> List[dict]:
+    """Renders every *.json arrangement of SRC_DIR into OUT_DIR/<name>.<fmt>, in parallel."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for src in sorted(glob.glob(os.path.join(src_dir, "*.json"))):
+        name = os.path.splitext(os.path.basename(src))[0]
+        jobs.append((src, os.path.join(out_dir, f"{name}.{fmt}"), opts))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [_render_job(j) for j in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(_render_job, jobs))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="app.py render", description="Rendu PNG/SVG d'arrangements d'ovales")
+    p.add_argument("src", help="arrangement JSON (Arrangement.save) ou dossier de fichiers JSON")
+    p.add_argument("--out", required=True, help="fichier image, ou dossier si SRC est un dossier")
+    p.add_argument("--format", default="png", help="extension des images d'un dossier (png, svg...)")
+    p.add_argument("--workers", type=int, default=0, help="processus (0 = nombre de CPU, 1 = sans pool)")
+    p.add_argument("--dpi", type=int, default=100)
+    p.add_argument("--size", type=float, default=6.0, help="côté de la figure en pouces")
+    p.add_argument("--min-px", type=float, default=1.0, help="ovales plus petits (en pixels) non dessinés")
+    p.add_argument("--flat", action="store_true", help="une seule couleur : pas d'arbre d'imbrication à calculer")
+    args = p.parse_args(argv)
+    opts = {"dpi": args.dpi, "size": args.size, "min_px": args.min_px, "by_depth": not args.flat}
+    try:
+        if os.path.isdir(args.src):
+            results = render_directory(args.src, args.out, args.format, args.workers, **opts)
+        else:
+            results = [_render_job((args.src, args.out, opts))]
+    except (OSError, ValueError, KeyError) as ex:
+        p.error(str(ex))
+    for r in results:
+        print(f"{r['src']} -> {r['out']} : {r['drawn']} ovale(s), {r['culled']} écarté(s), "
+              f"{r['vertices']} sommet(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
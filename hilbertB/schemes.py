@@ -0,0 +1,306 @@
+"""
+Énumération des schémas d'ovales admissibles en degré n (Partie B).
+
+    python app.py schemes --degree 8 --out schemes8.jsonl --workers 8
+
+A scheme is a rooted forest (an oval encloses its children), written in AHU canonical form:
+a tree is "(" + its subtrees + ")", siblings sorted by (size, code) in decreasing order, so two
+isomorphic schemes have the same code and duplicates are dropped by comparing codes.
+
+A scheme with k ovals is listed when the engine's rules accept it:
+  * ⊗(H, c) = 1, with H = ⊕(n) and c the number of components (k, plus the pseudo-line J when
+    n is odd);
+  * during the search, a branch stops as soon as ◇(H, c) < 0 (no margin left), and a new nest
+    (an oval with something inside, two ovals at least) is only tried while τ(H, c) = 1.
+Bézout with a line (through points inside two ovals, it crosses all their enclosing ovals twice)
+prunes the rest: the two deepest branches below any oval, and the two deepest trees of the
+scheme, together hold at most n // 2 ovals. Sub-forests are memoized per (size, room left).
+
+The search is split on the first (largest) tree of each scheme; these subtrees run in a process
+pool. Records stream to a JSONL file and each finished subtree is appended to OUT.ckpt, so an
+interrupted run resumes where it stopped (schemes already written are not repeated).
+"""
+import argparse, json, os, sys
+from collections import deque
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+_state = {}  # état du processus worker (tables des règles, place Bézout)
+
+
+# ---------- Forêts canoniques ----------
+@lru_cache(maxsize=None)
+def _trees(size: int, room: int) -> Tuple[Tuple[str, int], ...]:
+    """(code, height) of the trees of SIZE ovals whose nest depth fits in ROOM."""
+    if room < 1:
+        return ()
+    if size == 1:
+        return (("()", 1),)
+    return tuple(("(" + code + ")", 1 + h) for code, h in _forests(size - 1, room - 1))
+
+
+@lru_cache(maxsize=None)
+def _candidates(max_size: int, room: int) -> Tuple[Tuple[int, str, int], ...]:
+    """(size, code, height) of all trees up to MAX_SIZE ovals, in canonical (decreasing) order."""
+    out = [(s, code, h) for s in range(1, max_size + 1) for code, h in _trees(s, room)]
+    out.sort(reverse=True)
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _forests(size: int, room: int) -> Tuple[Tuple[str, int], ...]:
+    return tuple(_grow(size, room))
+
+
+def _grow(size: int, room: int, first: Optional[int] = None, tau=None, margin=None, placed: int = 0):
+    """
+    Yields (code, height) of the forests of SIZE ovals with room ROOM. FIRST fixes the index
+    (in _candidates) of the first tree; TAU / MARGIN are the rule tables of the top level,
+    indexed by the number of components already placed (PLACED counts the pseudo-line).
+    """
+    cands = _candidates(size, room)
+    acc: List[str] = []
+
+    def rec(start: int, stop: int, left: int, h1: int, h2: int, done: int):
+        if left == 0:
+            yield "".join(acc), h1
+            return
+        for idx in range(start, stop):
+            s, code, h = cands[idx]
+            if s > left:
+                continue
+            if margin is not None and margin[done + s] < 0:
+                continue
+            if tau is not None and s > 1 and not tau[done]:
+                continue  # plus de place pour un nouveau nid
+            a, b = (h, h1) if h >= h1 else (h1, max(h2, h))
+            if a + b > room:
+                continue  # Bézout : une droite par les deux branches les plus profondes
+            acc.append(code)
+            yield from rec(idx, len(cands), left - s, a, b, done + s)
+            acc.pop()
+
+    if first is None:
+        yield from rec(0, len(cands), size, 0, 0, placed)
+    else:
+        yield from rec(first, first + 1, size, 0, 0, placed)
+
+
+def canonical_code(arrangement) -> str:
+    """AHU code of an Arrangement's nesting forest (same form as the enumerated schemes)."""
+    n = len(arrangement.parent)
+    code, size = [""] * n, [1] * n
+    for i in sorted(range(n), key=arrangement.depth, reverse=True):
+        kids = sorted(((size[c], code[c]) for c in arrangement.children(i)), reverse=True)
+        size[i] += sum(s for s, _ in kids)
+        code[i] = "(" + "".join(c for _, c in kids) + ")"
+    return "".join(c for _, c in sorted(((size[r], code[r]) for r in arrangement.roots), reverse=True))
+
+
+def parse_code(code: str) -> list:
+    """'(())()' -> [[[]], []] : each oval is the list of its children."""
+    root: list = []
+    stack = [root]
+    for ch in code:
+        if ch == "(":
+            node: list = []
+            stack[-1].append(node)
+            stack.append(node)
+        elif ch == ")" and len(stack) > 1:
+            stack.pop()
+        else:
+            raise ValueError(f"Bad scheme code '{code}'")
+    if len(stack) != 1:
+        raise ValueError(f"Bad scheme code '{code}'")
+    return root
+
+
+def viro(code: str, odd: bool = False) -> str:
+    """Viro notation, as Arrangement.scheme(): '(()())()' -> '1 ⊔ 1<2>'; 'J ⊔ ...' when ODD."""
+    def siblings(nodes) -> str:
+        empty = sum(1 for n in nodes if not n)
+        parts = sorted(f"1<{siblings(n)}>" for n in nodes if n)
+        return " ⊔ ".join(([str(empty)] if empty else []) + parts)
+
+    text = siblings(parse_code(code)) if code else ""
+    if odd:
+        return "J ⊔ " + text if text else "J"
+    return text or "0"
+
+
+# ---------- Règles du moteur ----------
+def rule_tables(degree: int, engine=None) -> dict:
+    """
+    H = ⊕(n) and, for each component count c in [0, H + 2], ⊗(H, c), ◇(H, c) and τ(H, c).
+    By default the laws are those of MockProvider's 'Partie A'.
+    """
+    if engine is None:
+        from rule_engine import RuleEngine
+        from sweep import default_dsl
+        engine = RuleEngine()
+        engine.load_rules_from_text(default_dsl())
+    ev = engine.evaluate_expression
+    bound = ev(f"{degree} ⊕ 0")
+    top = max(0, int(bound)) + 2
+    return {
+        "harnack": bound,
+        "admissible": [bool(ev(f"{bound} ⊗ {c}")) for c in range(top + 1)],
+        "margin": [ev(f"{bound} ◇ {c}") for c in range(top + 1)],
+        "threshold": [bool(ev(f"{bound} τ {c}")) for c in range(top + 1)],
+    }
+
+
+class SchemeSearch:
+    """Subtree tasks of the enumeration for one degree, and their evaluation."""
+
+    def __init__(self, degree: int, tables: dict):
+        if degree < 1:
+            raise ValueError(f"Degree must be >= 1, got {degree}")
+        self.degree = degree
+        self.odd = degree % 2 == 1
+        self.room = degree // 2
+        self.tables = tables
+        top = len(tables["admissible"]) - 1
+        self.sizes = [k for k in range(top + 1 - self.odd) if tables["admissible"][k + self.odd]]
+
+    def tasks(self) -> List[Tuple[int, int]]:
+        """(k, index of the first tree): one subtree of the search each."""
+        out = [(0, -1)] if 0 in self.sizes else []
+        for k in self.sizes:
+            if k:
+                out.extend((k, i) for i, (s, _, _) in enumerate(_candidates(k, self.room)) if s <= k)
+        return out
+
+    @staticmethod
+    def task_key(task: Tuple[int, int]) -> str:
+        return f"{task[0]}:{task[1]}"
+
+    def run(self, task: Tuple[int, int]) -> List[dict]:
+        k, first = task
+        t = self.tables
+        if k == 0:
+            found = iter([("", 0)])
+        else:
+            found = _grow(k, self.room, first, t["threshold"], t["margin"], placed=int(self.odd))
+        c = k + self.odd
+        return [{
+            "degree": self.degree,
+            "ovals": k,
+            "scheme": viro(code, self.odd),
+            "code": code,
+            "depth": depth,
+            "nests": k - code.count("()"),
+            "margin": t["margin"][c],
+            "threshold": int(t["threshold"][c]),
+        } for code, depth in found]
+
+
+def _init_worker(degree: int, tables: dict):
+    _state["search"] = SchemeSearch(degree, tables)
+
+
+def _run_task(task):
+    return task, _state["search"].run(task)
+
+
+def schemes(degree: int, engine=None) -> List[dict]:
+    """All admissible schemes of DEGREE, in memory (one process)."""
+    search = SchemeSearch(degree, rule_tables(degree, engine))
+    return [rec for task in search.tasks() for rec in search.run(task)]
+
+
+# ---------- Flux JSONL et reprise ----------
+def _complete_lines(path: str) -> List[str]:
+    """Lines of PATH, a trailing incomplete one (interrupted run) being cut from the file."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            data = data[:data.rfind(b"\n") + 1]
+            f.truncate(len(data))
+    return data.decode("utf-8").splitlines()
+
+
+def enumerate_schemes(degree: int, out: str, workers: int = 0, engine=None, resume: bool = True) -> dict:
+    """
+    Streams the admissible schemes of DEGREE to OUT (JSONL), checkpointing finished subtrees
+    in OUT.ckpt. workers=0 uses os.cpu_count(); workers=1 runs in this process.
+    Returns {"degree", "harnack", "schemes", "written", "tasks", "skipped"}.
+    """
+    tables = rule_tables(degree, engine)
+    search = SchemeSearch(degree, tables)
+    ckpt = out + ".ckpt"
+    if not resume:
+        for path in (out, ckpt):
+            if os.path.exists(path):
+                os.remove(path)
+    header = f"# degree {degree}"
+    done_lines = _complete_lines(ckpt)
+    if done_lines and done_lines[0] != header:
+        raise ValueError(f"{ckpt} belongs to another run ({done_lines[0]!r}), use a new --out")
+    done = set(done_lines[1:])
+    seen = set()
+    for line in _complete_lines(out):
+        try:
+            seen.add(json.loads(line)["code"])
+        except (ValueError, KeyError):
+            continue
+    total = len(seen)
+    todo = [t for t in search.tasks() if search.task_key(t) not in done]
+    written = 0
+
+    with open(out, "a", encoding="utf-8") as f, open(ckpt, "a", encoding="utf-8") as ck:
+        if not done_lines:
+            ck.write(header + "\n")
+
+        def consume(task, records):
+            nonlocal written, total
+            for rec in records:
+                if rec["code"] in seen:
+                    continue  # écrit avant l'interruption, ou doublon isomorphe
+                seen.add(rec["code"])
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                written += 1
+                total += 1
+            f.flush()
+            ck.write(search.task_key(task) + "\n")  # après les schémas : au pire refaits, jamais perdus
+            ck.flush()
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(todo) <= 1:
+            for task in todo:
+                consume(task, search.run(task))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(degree, tables)) as pool:
+                pending = deque()
+                for task in todo:
+                    if len(pending) >= workers * 4:
+                        consume(*pending.popleft().result())
+                    pending.append(pool.submit(_run_task, task))
+                while pending:
+                    consume(*pending.popleft().result())
+    return {"degree": degree, "harnack": tables["harnack"], "schemes": total, "written": written,
+            "tasks": len(todo), "skipped": len(done)}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="app.py schemes", description="Schémas d'ovales admissibles en degré n")
+    p.add_argument("--degree", type=int, required=True)
+    p.add_argument("--out", required=True, help="schémas JSONL (reprise via OUT.ckpt)")
+    p.add_argument("--workers", type=int, default=0, help="processus (0 = nombre de CPU, 1 = sans pool)")
+    p.add_argument("--restart", action="store_true", help="ignorer un run précédent au lieu de le reprendre")
+    args = p.parse_args(argv)
+    try:
+        info = enumerate_schemes(args.degree, args.out, args.workers, resume=not args.restart)
+    except ValueError as ex:
+        p.error(str(ex))
+    print(f"degré {info['degree']} (H = {info['harnack']:g}) : {info['schemes']} schéma(s) dans {args.out} "
+          f"({info['written']} nouveaux, {info['skipped']} sous-arbres repris)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
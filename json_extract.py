@@ -0,0 +1,130 @@
+"""
+Extraction d'un objet JSON au milieu d'une réponse LLM bavarde.
+
+JsonObjectScanner walks the text once, tracking brace depth and JSON strings (with escapes), and
+reports every complete top-level {...} object that parses. A '{' only opens a candidate when it
+is followed by '"' or '}' (or ends the chunk), since a JSON object cannot start otherwise: prose
+such as "{a, b}" or a stray "{n" is skipped without scanning. Among the candidates, objects having more of the
+payload keys (dsl / evals / final) win; ties go to the first one seen.
+
+The scanner is incremental: feed() accepts chunks of any size (a '{', an escape or a string
+may be split across chunks) and scans each chunk once, keeping the pieces of the object
+currently open; they are joined only when it closes, so following a streamed completion stays
+linear in its length.
+"""
+import json, re
+from typing import Iterable, List, Optional
+
+PAYLOAD_KEYS = ("dsl", "evals", "final")
+
+_OBJ_START_RE = re.compile(r'\{(?=\s*(?:["}]|\Z))')
+_OBJ_TOKEN_RE = re.compile(r'[{}"]')
+_STR_TOKEN_RE = re.compile(r'["\\]')
+_MAX_RESCANS = 16
+
+
+class JsonObjectScanner:
+    """
+    scanner = JsonObjectScanner()
+    for chunk in chunks:
+        scanner.feed(chunk)          # -> objets complétés par ce morceau
+    scanner.best, scanner.best_text  # objet préféré (dict) et son texte, ou None
+    """
+
+    def __init__(self, keys: Iterable[str] = PAYLOAD_KEYS):
+        self.keys = frozenset(keys)
+        self.best: Optional[dict] = None
+        self.best_text: Optional[str] = None
+        self.best_score = -1
+        self._parts: List[str] = []  # morceaux de l'objet ouvert, joints une fois à sa fermeture
+        self._skip = 0               # 1 si le premier caractère du prochain morceau est échappé
+        self._depth = 0
+        self._in_str = False
+
+    @property
+    def open_object(self) -> Optional[str]:
+        """Text of the object still open at the end of the input, if any."""
+        return "".join(self._parts) if self._depth else None
+
+    def feed(self, chunk: str) -> List[dict]:
+        if not chunk:
+            return []
+        pos, depth, in_str = self._skip, self._depth, self._in_str
+        start = 0
+        found = []
+        while True:
+            if depth == 0:
+                m = _OBJ_START_RE.search(chunk, pos)
+                if m is None:
+                    start = pos = len(chunk)
+                    break
+                start, pos, depth = m.start(), m.end(), 1
+                continue
+            m = (_STR_TOKEN_RE if in_str else _OBJ_TOKEN_RE).search(chunk, pos)
+            if m is None:
+                pos = max(pos, len(chunk))
+                break
+            c, pos = m.group(), m.end()
+            if in_str:
+                if c == "\\":
+                    pos += 1  # caractère échappé, éventuellement dans le morceau suivant
+                else:
+                    in_str = False
+            elif c == '"':
+                in_str = True
+            elif c == "{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self._parts.append(chunk[start:pos])
+                    span = "".join(self._parts)
+                    self._parts = []
+                    obj = self._candidate(span)
+                    if obj is not None:
+                        found.append(obj)
+        if depth and start < len(chunk):
+            self._parts.append(chunk[start:])
+        self._skip = pos - len(chunk)
+        self._depth, self._in_str = depth, in_str
+        return found
+
+    def _candidate(self, span: str) -> Optional[dict]:
+        try:
+            obj = json.loads(span)
+        except ValueError:
+            return None
+        if not isinstance(obj, dict):
+            return None
+        score = len(self.keys.intersection(obj))
+        if score > self.best_score:
+            self.best, self.best_text, self.best_score = obj, span, score
+        return obj
+
+    def close(self) -> Optional[dict]:
+        """
+        Ends the input. If an object was left open (an unbalanced '{"' in the prose before the
+        real answer), scanning resumes just after it. Returns the preferred object.
+        """
+        for _ in range(_MAX_RESCANS):
+            rest = self.open_object
+            if rest is None:
+                break
+            self._parts, self._skip, self._depth, self._in_str = [], 0, 0, False
+            self.feed(rest[1:])
+        return self.best
+
+
+def extract_json_text(text: str, keys: Iterable[str] = PAYLOAD_KEYS) -> Optional[str]:
+    """Text of the preferred top-level JSON object found in TEXT, or None."""
+    scanner = JsonObjectScanner(keys)
+    scanner.feed(text)
+    scanner.close()
+    return scanner.best_text
+
+
+def extract_json_object(text: str, keys: Iterable[str] = PAYLOAD_KEYS) -> Optional[dict]:
+    """Same as extract_json_text, already decoded."""
+    scanner = JsonObjectScanner(keys)
+    scanner.feed(text)
+    return scanner.close()
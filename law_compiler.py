@@ -0,0 +1,301 @@
+"""
+Compilation des lois DSL ('((a-1)*(a-2))/2 + 1', "1 if b<=a else 0", ...).
+
+Each law is parsed once, checked against the names the engine exposes (its `_law_globals`),
+constant sub-expressions are folded, `math.*` functions are bound directly as globals and the
+result is compiled into a real `lambda a, b: ...`. Calling a law is then a plain function call,
+with no locals dict and no eval frame per call.
+
+`vectorize_law` reuses the same checked tree to build a numpy version for RuleEngine.evaluate_batch.
+"""
+import ast, math, operator
+from typing import Callable, Dict, Optional
+
+_numpy = None
+
+
+def load_numpy():
+    """numpy, importé à la demande (coûteux au démarrage) ; None s'il n'est pas installé."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:  # optionnel : seule la vectorisation en dépend
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+class LawError(ValueError):
+    """The law is not valid Python or uses names the engine does not expose."""
+
+
+_FORBIDDEN_NODES = (
+    ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+    ast.NamedExpr, ast.Await, ast.Yield, ast.YieldFrom, ast.Starred,
+)
+
+# Calls that may be evaluated at compile time when all their arguments are numeric constants.
+_FOLDABLE_BUILTINS = {"abs", "max", "min", "round", "float", "int"}
+_FOLDABLE_MATH = {
+    "floor", "ceil", "trunc", "sqrt", "exp", "log", "log2", "log10", "fabs", "hypot",
+    "sin", "cos", "tan", "atan", "atan2",
+}
+_MAX_FOLD_BITS = 4096  # au-delà, un entier plié gonflerait le code de la loi (et son temps de chargement)
+
+
+def check_law(expr: str, law_globals: Dict) -> ast.Expression:
+    """Parses and validates EXPR (syntax and names only: nothing is folded or compiled)."""
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError as ex:
+        raise LawError(f"Invalid law '{expr}': {ex.msg}") from None
+    _check_names(tree, law_globals, expr)
+    return tree
+
+
+def parse_law(expr: str, law_globals: Dict) -> ast.Expression:
+    """Parses and validates EXPR; returns the constant-folded AST."""
+    tree = check_law(expr, law_globals)
+    return ast.fix_missing_locations(_ConstantFolder(law_globals).visit(tree))
+
+
+def _check_names(tree, law_globals: Dict, expr: str):
+    allowed = {"a", "b"} | set(law_globals.get("__builtins__", {})) | {k for k in law_globals if k != "__builtins__"}
+    for node in ast.walk(tree):
+        if isinstance(node, _FORBIDDEN_NODES):
+            raise LawError(f"Unsupported construct {type(node).__name__} in law '{expr}'")
+        if isinstance(node, ast.Name) and node.id not in allowed:
+            raise LawError(f"Unknown name '{node.id}' in law '{expr}'")
+        if isinstance(node, ast.Attribute):
+            if node.attr.startswith("_"):
+                raise LawError(f"Private attribute '{node.attr}' in law '{expr}'")
+            base = node.value
+            if not (isinstance(base, ast.Name) and base.id in law_globals and base.id != "__builtins__"
+                    and hasattr(law_globals[base.id], node.attr)):
+                raise LawError(f"Unknown attribute '{ast.unparse(node)}' in law '{expr}'")
+
+
+def _is_num(node) -> bool:
+    return (isinstance(node, ast.Constant) and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool))
+
+
+def _too_big(value) -> bool:
+    return isinstance(value, int) and value.bit_length() > _MAX_FOLD_BITS
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Folds numeric constant sub-expressions: '(6-1)*(6-2)/2' -> 10.0, 'math.pi/2' -> 1.5707…"""
+
+    _BINOPS = {
+        ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+        ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+        ast.Pow: operator.pow,
+    }
+    _UNARYOPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+    def __init__(self, law_globals: Dict):
+        self.law_globals = law_globals
+
+    def _const(self, value, node):
+        return ast.copy_location(ast.Constant(value), node)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        fn = self._BINOPS.get(type(node.op))
+        if fn is None or not (_is_num(node.left) and _is_num(node.right)):
+            return node
+        left, right = node.left.value, node.right.value
+        if (isinstance(node.op, ast.Pow) and isinstance(left, int) and isinstance(right, int)
+                and max(left.bit_length(), 1) * abs(right) > _MAX_FOLD_BITS):
+            return node  # 2**100000, ((9**64)**64)**64 : taille bornée avant de calculer
+        try:
+            value = fn(left, right)
+        except (ArithmeticError, ValueError):
+            return node  # ZeroDivisionError etc. restent des erreurs d'évaluation
+        return node if _too_big(value) else self._const(value, node)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        fn = self._UNARYOPS.get(type(node.op))
+        if fn is not None and _is_num(node.operand):
+            return self._const(fn(node.operand.value), node)
+        return node
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.test, ast.Constant):
+            return node.body if node.test.value else node.orelse
+        return node
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        if isinstance(node.value, ast.Name) and node.value.id == "math":
+            value = getattr(math, node.attr, None)
+            if isinstance(value, float):
+                return self._const(value, node)
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if node.keywords or not node.args or not all(_is_num(x) for x in node.args):
+            return node
+        fn = node.func
+        if isinstance(fn, ast.Name) and fn.id in _FOLDABLE_BUILTINS:
+            target = self.law_globals.get("__builtins__", {}).get(fn.id)
+        elif (isinstance(fn, ast.Attribute) and isinstance(fn.value, ast.Name)
+              and fn.value.id == "math" and fn.attr in _FOLDABLE_MATH):
+            target = getattr(math, fn.attr)
+        else:
+            return node
+        if target is None:
+            return node
+        try:
+            return self._const(target(*[x.value for x in node.args]), node)
+        except (ArithmeticError, ValueError, TypeError):
+            return node
+
+
+class _GlobalBinder(ast.NodeTransformer):
+    """Replaces 'module.func' by a direct global '_module_func' bound in ENV."""
+
+    def __init__(self, law_globals: Dict, env: Dict):
+        self.law_globals = law_globals
+        self.env = env
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id in self.law_globals:
+            name = f"_{node.value.id}_{node.attr}"
+            self.env[name] = getattr(self.law_globals[node.value.id], node.attr)
+            return ast.copy_location(ast.Name(name, ast.Load()), node)
+        return self.generic_visit(node)
+
+
+def compile_law(expr: str, law_globals: Dict) -> Callable:
+    """
+    Compiles EXPR into a native `fn(a, b)`. The returned function carries the source in `fn.expr`.
+    Raises LawError if the law is malformed or references names outside LAW_GLOBALS.
+    """
+    tree = parse_law(expr, law_globals)
+    builtins = law_globals.get("__builtins__", {})
+    # les builtins autorisés deviennent des globales directes (LOAD_GLOBAL sans détour)
+    env = {"__builtins__": builtins, **builtins,
+           **{k: v for k, v in law_globals.items() if k != "__builtins__"}}
+    body = _GlobalBinder(law_globals, env).visit(tree.body)
+    args = ast.arguments(posonlyargs=[], args=[ast.arg("a"), ast.arg("b")], vararg=None,
+                         kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[])
+    lam = ast.fix_missing_locations(ast.Expression(ast.Lambda(args, body)))
+    fn = eval(compile(lam, "<law>", "eval"), env)
+    fn.expr = expr
+    return fn
+
+
+# ---------- Vectorisation des lois ----------
+_VEC_BUILTINS = {
+    "abs": "abs", "max": "maximum", "min": "minimum", "pow": "power",
+    "round": "round", "float": "float64", "int": "trunc",
+}
+_VEC_MATH = {
+    "floor": "floor", "ceil": "ceil", "trunc": "trunc", "sqrt": "sqrt", "exp": "exp",
+    "log": "log", "log2": "log2", "log10": "log10", "fabs": "fabs", "hypot": "hypot",
+    "sin": "sin", "cos": "cos", "tan": "tan", "atan": "arctan", "atan2": "arctan2",
+    "pi": "pi", "e": "e", "inf": "inf",
+}
+
+class _Unvectorizable(Exception):
+    pass
+
+class _LawVectorizer(ast.NodeTransformer):
+    """Rewrites a scalar law AST into numpy calls; raises _Unvectorizable on anything else."""
+
+    @staticmethod
+    def _np(name: str, node):
+        return ast.copy_location(ast.Attribute(ast.Name("np", ast.Load()), name, ast.Load()), node)
+
+    def _call(self, name: str, args, node):
+        return ast.copy_location(ast.Call(self._np(name, node), args, []), node)
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return self._call("where", [node.test, node.body, node.orelse], node)
+
+    def visit_BoolOp(self, node):
+        # 'x or y' / 'x and y' rendent un des opérandes, pas un booléen :
+        # where(x, x, y) / where(x, y, x), de droite à gauche
+        self.generic_visit(node)
+        is_and = isinstance(node.op, ast.And)
+        res = node.values[-1]
+        for v in reversed(node.values[:-1]):
+            res = self._call("where", [v, res, v] if is_and else [v, v, res], node)
+        return res
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return self._call("logical_not", [node.operand], node)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b <= c  ->  (a < b) & (b <= c)
+        left, parts = node.left, []
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.copy_location(ast.Compare(left, [op], [right]), node))
+            left = right
+        res = parts[0]
+        for p in parts[1:]:
+            res = self._call("logical_and", [res, p], node)
+        return res
+
+    def visit_Call(self, node):
+        if node.keywords:
+            raise _Unvectorizable("keyword arguments")
+        node.args = [self.visit(x) for x in node.args]
+        fn = node.func
+        if isinstance(fn, ast.Name) and fn.id in _VEC_BUILTINS:
+            node.func = self._np(_VEC_BUILTINS[fn.id], fn)
+            if fn.id in ("max", "min") and len(node.args) > 2:
+                # max(x, y, z) -> maximum(maximum(x, y), z)
+                res = node.args[0]
+                for v in node.args[1:]:
+                    res = self._call(_VEC_BUILTINS[fn.id], [res, v], node)
+                return res
+            return node
+        if isinstance(fn, ast.Attribute):
+            node.func = self.visit(fn)
+            return node
+        raise _Unvectorizable(ast.dump(fn))
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == "math" and node.attr in _VEC_MATH:
+            return self._np(_VEC_MATH[node.attr], node)
+        raise _Unvectorizable(node.attr)
+
+    def visit_Name(self, node):
+        if node.id in ("a", "b"):
+            return node
+        raise _Unvectorizable(node.id)
+
+    def generic_visit(self, node):
+        if isinstance(node, ast.Subscript):
+            raise _Unvectorizable(type(node).__name__)
+        return super().generic_visit(node)
+
+
+def vectorize_law(expr: str, law_globals: Dict) -> Optional[Callable]:
+    """Compiles EXPR into f(a_array, b_array) evaluated once over whole arrays, or None."""
+    np = load_numpy()
+    if np is None:
+        return None
+    try:
+        tree = _LawVectorizer().visit(parse_law(expr, law_globals))
+        code = compile(ast.fix_missing_locations(tree), "<law:vec>", "eval")
+    except (_Unvectorizable, LawError):
+        return None
+    env = {"np": np, "__builtins__": {}}
+    def vfn(a, b):
+        return eval(code, env, {"a": a, "b": b})
+    return vfn
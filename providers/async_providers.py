@@ -0,0 +1,150 @@
+import asyncio, random, threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .ollama_provider import OllamaProvider
+from .openrouter_provider import OpenRouterProvider, NO_KEY_FALLBACK
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncProviderMixin:
+    """
+    Couche asyncio commune aux providers HTTP.
+
+    Requests go through one pooled, keep-alive requests.Session run on a dedicated thread pool,
+    at most `max_in_flight` at a time. 429/5xx answers and connection errors are retried up to
+    `retries` times with full-jitter exponential backoff (Retry-After is honoured when given).
+    The synchronous solve() stays available, so instances remain RuleProvider-compatible.
+    """
+
+    def _init_async(self, max_in_flight: int = 8, retries: int = 4, backoff: float = 0.5,
+                    max_backoff: float = 20.0, timeout: float = 120):
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> Tuple[requests.Session, ThreadPoolExecutor]:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                                    thread_name_prefix=type(self).__name__)
+            return self._session, self._executor
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_in_flight)
+            self._sem_loop = loop
+        return self._sem
+
+    def _delay(self, attempt: int, resp=None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def _post_json(self, url: str, body: dict, headers: Optional[dict] = None) -> dict:
+        session, executor = self._pool()
+        loop = asyncio.get_running_loop()
+        post = partial(session.post, url, json=body, headers=headers, timeout=self.timeout)
+        async with self._limiter():
+            for attempt in range(self.retries + 1):
+                last = attempt == self.retries
+                try:
+                    resp = await loop.run_in_executor(executor, post)
+                except (requests.ConnectionError, requests.Timeout):
+                    if last:
+                        raise
+                    await asyncio.sleep(self._delay(attempt))
+                    continue
+                if resp.status_code in RETRY_STATUSES and not last:
+                    delay = self._delay(attempt, resp)
+                    resp.close()
+                    await asyncio.sleep(delay)
+                    continue
+                resp.raise_for_status()
+                return resp.json()
+
+    async def asolve(self, problem_prompt: str):
+        """
+        Par défaut : le solve() bloquant de la classe provider qui suit le mixin (MRO), exécuté sur
+        le pool de threads sous la même borne max_in_flight. Les providers HTTP le remplacent.
+        """
+        _, executor = self._pool()
+        blocking = super().solve
+        async with self._limiter():
+            return await asyncio.get_running_loop().run_in_executor(executor, blocking, problem_prompt)
+
+    def solve(self, problem_prompt: str):
+        return asyncio.run(self.asolve(problem_prompt))
+
+    async def solve_many(self, prompts: Iterable[str]) -> AsyncIterator[Tuple[int, object]]:
+        """
+        Solves all PROMPTS concurrently and yields (index, result) as each one completes.
+        A failed prompt yields its exception as the result instead of aborting the others.
+        """
+        async def one(i, prompt):
+            try:
+                return i, await self.asolve(prompt)
+            except Exception as ex:
+                return i, ex
+
+        tasks = [asyncio.ensure_future(one(i, p)) for i, p in enumerate(prompts)]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._executor.shutdown(wait=False)
+                self._session = self._executor = None
+
+
+class AsyncOllamaProvider(AsyncProviderMixin, OllamaProvider):
+    def __init__(self, model: str = "llama3.1", endpoint: str = "http://localhost:11434/api/generate", **async_opts):
+        OllamaProvider.__init__(self, model=model, endpoint=endpoint)
+        self._init_async(**async_opts)
+
+    async def asolve(self, problem_prompt: str):
+        data = await self._post_json(self.endpoint, self._payload(problem_prompt))
+        return self._parse_response(data)
+
+
+class AsyncOpenRouterProvider(AsyncProviderMixin, OpenRouterProvider):
+    def __init__(self, model: str = "meta-llama/llama-3.1-8b-instruct:free",
+                 endpoint: str = "https://openrouter.ai/api/v1/chat/completions",
+                 temperature: float = 0.2, **async_opts):
+        OpenRouterProvider.__init__(self, model=model, endpoint=endpoint, temperature=temperature)
+        self._init_async(**async_opts)
+
+    async def asolve(self, problem_prompt: str):
+        headers = self._headers()
+        if headers is None:
+            return dict(NO_KEY_FALLBACK)
+        data = await self._post_json(self.endpoint, self._payload(problem_prompt), headers=headers)
+        return self._parse_response(data)
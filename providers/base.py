@@ -1,4 +1,6 @@
+import json
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 class RuleProvider(ABC):
     @abstractmethod
@@ -13,3 +15,18 @@ class RuleProvider(ABC):
         ou une simple chaîne DSL.
         """
         raise NotImplementedError
+
+    def solve_stream(self, problem_prompt: str) -> Iterator[str]:
+        """
+        Renvoie le texte de la complétion au fil de sa génération (morceaux bruts, à concaténer).
+        Par défaut : un seul morceau contenant la réponse complète de solve().
+        """
+        result = self.solve(problem_prompt)
+        yield result if isinstance(result, str) else json.dumps(result, ensure_ascii=False)
+
+    def cacheable(self, response) -> bool:
+        """
+        False pour une réponse dégradée (repli sans clé API, ...) que CachingProvider ne doit pas
+        mémoriser. RESPONSE est le résultat de solve() ou le texte complet de solve_stream().
+        """
+        return True
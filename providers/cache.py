@@ -0,0 +1,166 @@
+import hashlib, json, os, tempfile, time
+from .base import RuleProvider
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou inter-processus pour l'éviction (écritures restent atomiques)
+    fcntl = None
+
+PROMPT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "prompts", "system_prompt.txt")
+
+
+class CachingProvider(RuleProvider):
+    """
+    Enveloppe un RuleProvider et mémorise ses réponses brutes sur disque.
+
+    Key: (provider class, model, sha256 of the system prompt, problem prompt, temperature).
+    Entries created more than `ttl` seconds ago are ignored and rewritten; when the cache grows past
+    `max_bytes`, least recently used entries (by mtime, refreshed on every hit) are evicted.
+    Writes go through a temp file + os.replace, so concurrent processes never read a partial
+    entry; eviction runs under an advisory lock where fcntl is available. Replies the provider
+    flags as degraded (`provider.cacheable(response)` is False) are never stored nor served.
+    """
+
+    def __init__(self, provider: RuleProvider, cache_dir: str,
+                 ttl: float = 7 * 24 * 3600, max_bytes: int = 64 * 1024 * 1024):
+        self.provider = provider
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __getattr__(self, name):
+        # model, system_prompt... restent accessibles comme sur le provider enveloppé
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    def _system_prompt_hash(self) -> str:
+        text = getattr(self.provider, "system_prompt", None)
+        if text is None:
+            try:
+                with open(PROMPT_PATH, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                text = ""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def cache_key(self, problem_prompt: str) -> str:
+        parts = [
+            type(self.provider).__name__,
+            getattr(self.provider, "model", None),
+            self._system_prompt_hash(),
+            problem_prompt,
+            getattr(self.provider, "temperature", None),
+        ]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def cacheable(self, response) -> bool:
+        return self.provider.cacheable(response)
+
+    def _read(self, path: str):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["created"] > self.ttl or not self.provider.cacheable(entry["response"]):
+                return None
+            os.utime(path)  # LRU : un hit rafraîchit l'entrée
+            return entry
+        except (OSError, ValueError, KeyError, TypeError):
+            return None  # absente, supprimée entre-temps ou illisible -> miss
+
+    def _write(self, path: str, response):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"created": time.time(), "response": response}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def solve(self, problem_prompt: str):
+        path = self._path(self.cache_key(problem_prompt))
+        entry = self._read(path)
+        if entry is not None:
+            self.hits += 1
+            return entry["response"]
+        self.misses += 1
+        response = self.provider.solve(problem_prompt)
+        if self.provider.cacheable(response):
+            self._write(path, response)
+            self.evict()
+        return response
+
+    def solve_stream(self, problem_prompt: str):
+        """Hit : la réponse mémorisée d'un bloc. Miss : relaie le flux du provider et mémorise le texte complet."""
+        path = self._path(self.cache_key(problem_prompt))
+        entry = self._read(path)
+        if entry is not None:
+            self.hits += 1
+            response = entry["response"]
+            yield response if isinstance(response, str) else json.dumps(response, ensure_ascii=False)
+            return
+        self.misses += 1
+        chunks = []
+        for chunk in self.provider.solve_stream(problem_prompt):
+            chunks.append(chunk)
+            yield chunk
+        text = "".join(chunks)
+        if self.provider.cacheable(text):
+            self._write(path, text)
+            self.evict()
+
+    def _entries(self):
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith(".json"):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    yield e.path, st.st_size, st.st_mtime
+
+    def evict(self):
+        """Removes least recently used entries until the cache is under max_bytes."""
+        lock_path = os.path.join(self.cache_dir, ".lock")
+        with open(lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries, total = [], 0
+                for path, size, mtime in self._entries():
+                    entries.append((mtime, size, path))
+                    total += size
+                if total <= self.max_bytes:
+                    return
+                for mtime, size, path in sorted(entries):
+                    self._unlink(path)
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for path, _, _ in list(self._entries()):
+            self._unlink(path)
@@ -2,6 +2,9 @@ from .base import RuleProvider
 import math
 
 class MockProvider(RuleProvider):
+    def __init__(self, model: str = "mock"):
+        self.model = model
+
     def solve(self, problem_prompt: str):
         pp = problem_prompt.lower()
 
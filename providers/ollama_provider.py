@@ -1,5 +1,6 @@
 import requests, json, os
 from .base import RuleProvider
+from .stream_utils import iter_ndjson_text
 
 class OllamaProvider(RuleProvider):
     def __init__(self, model: str = "llama3.1", endpoint: str = "http://localhost:11434/api/generate"):
@@ -11,14 +12,25 @@ class OllamaProvider(RuleProvider):
             self.system_prompt = f.read()
 
     def solve(self, problem_prompt: str):
-        prompt = self._build_prompt(problem_prompt)
-        resp = requests.post(self.endpoint, json={
+        resp = requests.post(self.endpoint, json=self._payload(problem_prompt), timeout=120)
+        resp.raise_for_status()
+        return self._parse_response(resp.json())
+
+    def solve_stream(self, problem_prompt: str):
+        payload = dict(self._payload(problem_prompt), stream=True)
+        with requests.post(self.endpoint, json=payload, stream=True, timeout=120) as resp:
+            resp.raise_for_status()
+            resp.encoding = "utf-8"
+            yield from iter_ndjson_text(resp.iter_lines(decode_unicode=True))
+
+    def _payload(self, problem_prompt: str) -> dict:
+        return {
             "model": self.model,
-            "prompt": prompt,
+            "prompt": self._build_prompt(problem_prompt),
             "stream": False,
-        }, timeout=120)
-        resp.raise_for_status()
-        data = resp.json()
+        }
+
+    def _parse_response(self, data: dict):
         text = data.get("response", "").strip()
         # Try to parse JSON
         try:
@@ -1,36 +1,65 @@
 import os, requests, json
 from .base import RuleProvider
+from .stream_utils import iter_sse_text
+
+# Pas de clé : fallback minimal
+NO_KEY_FALLBACK = {"dsl": "DEFINE ⊕ WITH max(a,b)", "evals": ["3 ⊕ 7"], "final": "Aucune clé API fournie, fallback."}
+NO_KEY_FALLBACK_TEXT = json.dumps(NO_KEY_FALLBACK, ensure_ascii=False)
 
 class OpenRouterProvider(RuleProvider):
     def __init__(self, model: str = "meta-llama/llama-3.1-8b-instruct:free",
-                 endpoint: str = "https://openrouter.ai/api/v1/chat/completions"):
+                 endpoint: str = "https://openrouter.ai/api/v1/chat/completions",
+                 temperature: float = 0.2):
         self.model = model
         self.endpoint = endpoint
+        self.temperature = temperature
         here = os.path.dirname(os.path.dirname(__file__))
         with open(os.path.join(here, "prompts", "system_prompt.txt"), "r", encoding="utf-8") as f:
             self.system_prompt = f.read()
 
     def solve(self, problem_prompt: str):
+        headers = self._headers()
+        if headers is None:
+            return dict(NO_KEY_FALLBACK)
+        r = requests.post(self.endpoint, headers=headers, json=self._payload(problem_prompt), timeout=120)
+        r.raise_for_status()
+        return self._parse_response(r.json())
+
+    def solve_stream(self, problem_prompt: str):
+        headers = self._headers()
+        if headers is None:
+            yield NO_KEY_FALLBACK_TEXT
+            return
+        body = dict(self._payload(problem_prompt), stream=True)
+        with requests.post(self.endpoint, headers=headers, json=body, stream=True, timeout=120) as r:
+            r.raise_for_status()
+            r.encoding = "utf-8"
+            yield from iter_sse_text(r.iter_lines(decode_unicode=True))
+
+    def cacheable(self, response) -> bool:
+        # le repli sans clé ne doit pas survivre à l'ajout de la clé
+        return response != NO_KEY_FALLBACK and response != NO_KEY_FALLBACK_TEXT
+
+    def _headers(self):
         api_key = os.environ.get("OPENROUTER_API_KEY", "").strip()
         if not api_key:
-            # Pas de clé : fallback minimal
-            return {"dsl": "DEFINE ⊕ WITH max(a,b)", "evals": ["3 ⊕ 7"], "final": "Aucune clé API fournie, fallback."}
-
-        headers = {
+            return None
+        return {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        body = {
+
+    def _payload(self, problem_prompt: str) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": problem_prompt}
             ],
-            "temperature": 0.2,
+            "temperature": self.temperature,
         }
-        r = requests.post(self.endpoint, headers=headers, json=body, timeout=120)
-        r.raise_for_status()
-        data = r.json()
+
+    def _parse_response(self, data: dict):
         text = data["choices"][0]["message"]["content"].strip()
         try:
             return json.loads(text)
@@ -0,0 +1,51 @@
+"""
+Registre paresseux des providers : le module d'un provider n'est importé que s'il est choisi.
+
+Built-in names map to "module:Class" strings. Third-party packages can add providers under the
+"hilbert16.providers" entry-point group (name = "package.module:Class"); entry points are only
+scanned when a name is not built in, so ordinary runs pay nothing for discovery.
+"""
+from typing import Callable, Dict, List, Union
+
+ENTRY_POINT_GROUP = "hilbert16.providers"
+
+_REGISTRY: Dict[str, Union[str, Callable]] = {
+    "mock": "providers.mock_provider:MockProvider",
+    "ollama": "providers.ollama_provider:OllamaProvider",
+    "openrouter": "providers.openrouter_provider:OpenRouterProvider",
+}
+
+
+def register_provider(name: str, target: Union[str, Callable]):
+    """TARGET: "module:Class" (imported on first use) or a class / factory accepting model=."""
+    _REGISTRY[name] = target
+
+
+def builtin_providers() -> List[str]:
+    return list(_REGISTRY)
+
+
+def available_providers() -> List[str]:
+    """Registered names plus entry points (imports importlib.metadata)."""
+    from importlib.metadata import entry_points
+    return list(_REGISTRY) + [ep.name for ep in entry_points(group=ENTRY_POINT_GROUP) if ep.name not in _REGISTRY]
+
+
+def get_provider_class(name: str):
+    target = _REGISTRY.get(name)
+    if target is None:
+        from importlib.metadata import entry_points
+        eps = [ep for ep in entry_points(group=ENTRY_POINT_GROUP) if ep.name == name]
+        if not eps:
+            raise KeyError(f"Provider inconnu: '{name}' (disponibles : {', '.join(available_providers())})")
+        target = eps[0].value
+    if isinstance(target, str):
+        import importlib
+        module, _, attr = target.partition(":")
+        target = getattr(importlib.import_module(module), attr)
+        _REGISTRY[name] = target
+    return target
+
+
+def create_provider(name: str, **kwargs):
+    return get_provider_class(name)(**kwargs)
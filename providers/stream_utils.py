@@ -0,0 +1,34 @@
+import json
+from typing import Iterable, Iterator
+
+
+def iter_ndjson_text(lines: Iterable[str], field: str = "response") -> Iterator[str]:
+    """Ollama (stream=true) : une ligne JSON par morceau, {"response": "...", "done": false}."""
+    for line in lines:
+        if not line or not line.strip():
+            continue
+        data = json.loads(line)
+        if data.get("error"):
+            raise RuntimeError(f"Ollama: {data['error']}")
+        text = data.get(field, "")
+        if text:
+            yield text
+        if data.get("done"):
+            return
+
+
+def iter_sse_text(lines: Iterable[str]) -> Iterator[str]:
+    """OpenRouter / OpenAI (stream=true) : 'data: {...}' par événement, 'data: [DONE]' à la fin."""
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue  # lignes vides, commentaires ': OPENROUTER PROCESSING'
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        event = json.loads(data)
+        if event.get("error"):
+            raise RuntimeError(f"OpenRouter: {event['error']}")
+        for choice in event.get("choices", []):
+            text = (choice.get("delta") or {}).get("content")
+            if text:
+                yield text
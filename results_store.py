@@ -0,0 +1,218 @@
+"""
+Stockage local des résultats d'évaluation (SQLite, ajout seul).
+
+    python app.py --problem "partie A" --store results.db --test "6 ⊕ 6"
+    python app.py batch --in problems.jsonl --out res.jsonl --store results.db
+    python app.py results results.db --ruleset 3fa2 --op ⊕        # JSONL sur stdout
+    python app.py results results.db --slowest --days 7
+
+One row per run (problem, provider, model, rule-set hash, orientation, stage timings) and one
+row per evaluated expression (kind 'eval' or 'test', canonical operator and operands of 'a OP b'
+expressions, result, error, duration in ns). Rule sets are keyed by engine_pool.dsl_digest, the
+sha256 of the canonical DSL, so reformatted copies of one block share their results; the DSL
+text itself is stored once in `rulesets`, and runs and evaluations refer to it by integer id
+(short index keys: 64 hex digits per row would double the size of the indexes).
+
+The expressions of a run go in with one executemany, and transactions are committed every
+`commit_every` runs (WAL journal, synchronous=NORMAL). Two indexes only, each one costs every
+insert: (ruleset, op) for "all ⊕ results of this rule set", and a covering (ts, op, ruleset, ns)
+index so that "slowest laws this week" scans only that week's rows without touching the table.
+"""
+import argparse, json, sqlite3, sys, time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rulesets (
+    id INTEGER PRIMARY KEY, dsl_hash TEXT NOT NULL UNIQUE, dsl TEXT NOT NULL, first_seen REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, ts REAL NOT NULL, problem TEXT, provider TEXT, model TEXT,
+    ruleset INTEGER, orientation TEXT, timings TEXT, final TEXT, error TEXT);
+CREATE TABLE IF NOT EXISTS evals (
+    run_id INTEGER NOT NULL, ts REAL NOT NULL, ruleset INTEGER, kind TEXT NOT NULL,
+    expr TEXT NOT NULL, op TEXT, a REAL, b REAL, result, error TEXT, ns INTEGER);
+CREATE INDEX IF NOT EXISTS runs_ruleset ON runs (ruleset);
+CREATE INDEX IF NOT EXISTS evals_ruleset_op ON evals (ruleset, op);
+CREATE INDEX IF NOT EXISTS evals_ts ON evals (ts, op, ruleset, ns);
+"""
+
+_EVAL_COLUMNS = ("run_id", "ts", "ruleset", "kind", "expr", "op", "a", "b", "result", "error", "ns")
+
+
+def _value(res):
+    if res is None or isinstance(res, (int, float, str)):
+        return res  # colonne sans affinité : SQLite garde le type
+    return json.dumps(res, ensure_ascii=False, default=str)
+
+
+class ResultsStore:
+    """Append-only SQLite store of runs and evaluations. Not shared between threads: one writer."""
+
+    def __init__(self, path: str, commit_every: int = 64):
+        from rule_engine import RuleEngine
+        self.path = path
+        self.commit_every = commit_every
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA cache_size=-65536")  # 64 Mo : les pages d'index chaudes restent en mémoire
+        self.db.executescript(SCHEMA)
+        self._parser = RuleEngine()  # _norm_op seulement : opérateur canonique des expressions
+        self._rulesets: Dict[str, tuple] = {}  # texte DSL -> (id, empreinte)
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- Écriture ----------
+    def ruleset(self, dsl: str) -> tuple:
+        """(id, canonical sha256) of DSL (engine_pool.dsl_digest), recorded in `rulesets` on first sight."""
+        known = self._rulesets.get(dsl)
+        if known is None:
+            from engine_pool import dsl_digest
+            digest = dsl_digest(dsl)
+            self.db.execute("INSERT OR IGNORE INTO rulesets (dsl_hash, dsl, first_seen) VALUES (?, ?, ?)",
+                            (digest, dsl, time.time()))
+            row = self.db.execute("SELECT id FROM rulesets WHERE dsl_hash = ?", (digest,)).fetchone()
+            if len(self._rulesets) >= 1024:
+                self._rulesets.clear()
+            known = self._rulesets[dsl] = (row[0], digest)
+        return known
+
+    def ruleset_hash(self, dsl: str) -> str:
+        return self.ruleset(dsl)[1]
+
+    def _split(self, expr: str):
+        tokens = expr.split()
+        if len(tokens) != 3:
+            return None, None, None  # expression composée : pas d'opérateur unique
+        try:
+            a, b = float(tokens[0]), float(tokens[2])
+        except ValueError:
+            a = b = None
+        return self._parser._norm_op(tokens[1]), a, b
+
+    def record_run(self, problem: str, provider: str, model: str, dsl: str, orientation: str = "+",
+                   evals: Iterable[dict] = (), tests: Iterable[dict] = (), timings: Optional[dict] = None,
+                   final: str = "", error: Optional[str] = None, ts: Optional[float] = None) -> int:
+        """
+        Stores one run and its evaluation items ({"expr", "result", "error"[, "ns"]}, as returned
+        by app.solve_problem). Returns the run id.
+        """
+        ts = time.time() if ts is None else ts
+        rid = self.ruleset(dsl)[0] if dsl and dsl.strip() else None
+        cur = self.db.execute(
+            "INSERT INTO runs (ts, problem, provider, model, ruleset, orientation, timings, final, error)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (ts, problem, provider, model, rid, orientation, json.dumps(timings or {}), final, error))
+        run_id = cur.lastrowid
+        rows = []
+        split = self._split
+        for kind, items in (("eval", evals), ("test", tests)):
+            for it in items:
+                op, a, b = split(it["expr"])
+                rows.append((run_id, ts, rid, kind, it["expr"], op, a, b, _value(it.get("result")),
+                             it.get("error"), it.get("ns")))
+        if rows:
+            self.db.executemany(f"INSERT INTO evals VALUES ({', '.join('?' * len(_EVAL_COLUMNS))})", rows)
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+        return run_id
+
+    def record_result(self, res: dict, problem: str, provider: str, model: str, orientation: str = "+") -> int:
+        """record_run for a solve_problem() result (or a batch line)."""
+        payload = res.get("payload") or {}
+        return self.record_run(problem, provider, model, payload.get("dsl", ""), orientation,
+                               res.get("evals", ()), res.get("tests", ()), res.get("timings"),
+                               payload.get("final", ""), res.get("error"))
+
+    def flush(self):
+        self.db.commit()
+        self._pending = 0
+
+    def close(self):
+        if self.db is not None:
+            self.flush()
+            self.db.close()
+            self.db = None
+
+    # ---------- Requêtes ----------
+    def resolve_ruleset(self, prefix: str) -> str:
+        """Full hash of the rule set whose hash starts with PREFIX (ValueError if none or ambiguous)."""
+        rows = self.db.execute("SELECT dsl_hash FROM rulesets WHERE dsl_hash >= ? AND dsl_hash < ? LIMIT 2",
+                               (prefix, prefix + "\uffff")).fetchall()
+        if len(rows) != 1:
+            raise ValueError(f"{'No' if not rows else 'Ambiguous'} rule set for hash prefix '{prefix}'")
+        return rows[0][0]
+
+    def results(self, dsl_hash: Optional[str] = None, op: Optional[str] = None, since: Optional[float] = None,
+                errors: Optional[bool] = None, limit: Optional[int] = None) -> Iterator[dict]:
+        """Evaluation rows (with their rule set's "dsl_hash"), streamed; OP may be any alias spelling."""
+        where, args = [], []
+        if dsl_hash is not None:
+            row = self.db.execute("SELECT id FROM rulesets WHERE dsl_hash = ?", (dsl_hash,)).fetchone()
+            if row is None:
+                return
+            where.append("e.ruleset = ?"); args.append(row[0])
+        if op is not None:
+            where.append("e.op = ?"); args.append(self._parser._norm_op(op))
+        if since is not None:
+            where.append("e.ts >= ?"); args.append(since)
+        if errors is not None:
+            where.append("e.error IS NOT NULL" if errors else "e.error IS NULL")
+        sql = (f"SELECT {', '.join('e.' + c for c in _EVAL_COLUMNS)}, r.dsl_hash"
+               " FROM evals e LEFT JOIN rulesets r ON r.id = e.ruleset")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if limit is not None:
+            sql += " LIMIT ?"; args.append(limit)
+        for row in self.db.execute(sql, args):
+            yield dict(zip(_EVAL_COLUMNS + ("dsl_hash",), row))
+
+    def slowest_laws(self, since: Optional[float] = None, limit: int = 10) -> List[dict]:
+        """Timed operators by mean duration since SINCE (epoch seconds): {"dsl_hash", "op", "calls", "mean_us", "max_us"}."""
+        rows = self.db.execute(
+            "SELECT r.dsl_hash, s.op, s.n, s.mean, s.mx FROM ("
+            "  SELECT ruleset, op, COUNT(ns) AS n, AVG(ns) AS mean, MAX(ns) AS mx FROM evals INDEXED BY evals_ts"
+            "  WHERE ts >= ? AND op IS NOT NULL AND ns IS NOT NULL"
+            "  GROUP BY ruleset, op ORDER BY mean DESC LIMIT ?"
+            ") s LEFT JOIN rulesets r ON r.id = s.ruleset ORDER BY s.mean DESC", (since or 0.0, limit)).fetchall()
+        return [{"dsl_hash": h, "op": op, "calls": n, "mean_us": mean / 1e3, "max_us": mx / 1e3}
+                for h, op, n, mean, mx in rows]
+
+    def counts(self) -> dict:
+        return {table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("rulesets", "runs", "evals")}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="app.py results", description="Interroger le stockage des résultats")
+    p.add_argument("db", help="base SQLite (--store de app.py)")
+    p.add_argument("--ruleset", help="empreinte du jeu de règles (un préfixe suffit)")
+    p.add_argument("--op", help="opérateur (toute graphie acceptée par le moteur)")
+    p.add_argument("--days", type=float, help="seulement les N derniers jours")
+    p.add_argument("--errors", action="store_true", help="seulement les évaluations en erreur")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--slowest", action="store_true", help="lois les plus lentes (durée moyenne)")
+    args = p.parse_args(argv)
+    since = time.time() - args.days * 86400 if args.days else None
+    with ResultsStore(args.db) as store:
+        if args.slowest:
+            for r in store.slowest_laws(since, args.limit or 10):
+                print(f"{r['op']:>4} {r['dsl_hash'][:12]}  {r['calls']:>9} appel(s)  "
+                      f"moy {r['mean_us']:10.1f} µs  max {r['max_us']:10.1f} µs")
+            return 0
+        try:
+            digest = store.resolve_ruleset(args.ruleset) if args.ruleset else None
+        except ValueError as ex:
+            p.error(str(ex))
+        for row in store.results(digest, args.op, since, True if args.errors else None, args.limit):
+            print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,48 @@
-import re, math
-from typing import Callable, Dict
+import os, re, math, threading
+from collections import OrderedDict
+from time import perf_counter_ns
+from typing import Callable, Dict, Optional, Set
+from law_compiler import compile_law, vectorize_law, load_numpy, LawError
+from engine_metrics import EngineMetrics
 
 class EvaluationError(Exception):
     pass
 
+# Un seul motif de dispatch pour toutes les directives DSL
+_DIRECTIVE_RE = re.compile(r"(DEFINE|REPLACE|DELETE|ENABLE|DISABLE|SELECT)\s+(.+)$", re.IGNORECASE)
+_WITH_RE = re.compile(r"(.+?)\s+WITH\s+(.+)$", re.IGNORECASE)
+_MAX_PARSE_CACHE = 10_000  # lignes / lois mémorisées avant remise à zéro
+_SELECT_RE = re.compile(r"(.+?)\s+WITH\s*\{\s*(.+?)\s*\}\s*USING\s*ORIENTATION\s*([+\-])$", re.IGNORECASE)
+
 class RuleEngine:
     """
     Maintains a registry of operations and applies them to simple binary expressions like '3 ⊕ 7'.
     Supports multi-law SELECT depending on orientation.
     Adds operator aliasing so Windows shells can use ASCII fallbacks like '+O' or '*O'.
+    With cache_size > 0, results of evaluate_expression are memoized in a bounded LRU keyed by
+    (canonical op, a, b, orientation); rule changes invalidate only the affected operator.
+    With metrics=True, per-operator calls, errors, latency histograms, SELECT branches and alias
+    resolution paths are recorded (see engine_metrics.py and stats()).
+    freeze() returns an immutable RuleSet snapshot (see ruleset.py) that threads can share
+    without locking; rule changes are serialized by a writer lock and publish a new snapshot.
     """
-    def __init__(self, orientation: str = "+"):
+    def __init__(self, orientation: str = "+", cache_size: int = 0, metrics: bool = False):
         self.orientation = orientation
         self.ops: Dict[str, Dict] = {}
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._cache_keys: Dict[str, Set[tuple]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.metrics: Optional[EngineMetrics] = EngineMetrics() if metrics else None
+        self.legacy_alias_uses: Dict[str, int] = {}
+        self._directive_cache: Dict[str, tuple] = {}
+        self._law_cache: Dict[str, Callable] = {}
+        self._vec_cache: Dict[str, Optional[Callable]] = {}
+        self._functions: Dict[str, Callable] = {}
+        self._lock = threading.RLock()  # écrivains : chargements de règles et publication des snapshots
+        self._generation = 0
+        self._frozen = None
         self._law_globals = {
             "math": math,
             "__builtins__": {
@@ -78,106 +108,381 @@ class RuleEngine:
 
     def _norm_op(self, op: str) -> str:
         token = op.strip()
+        m = self.metrics
         # unicode direct → OK
         if token in self.aliases:
+            if m is not None: m.alias_paths["direct"] += 1
             return self.aliases[token]
+        # legacy support : compté (voir stats()) plutôt qu'un avertissement à chaque appel ;
+        # testé avant la casse, sinon '+O', 'cO'... passeraient inaperçus par leur minuscule
+        if token in self._legacy_aliases:
+            if m is not None: m.alias_paths["legacy"] += 1
+            self.legacy_alias_uses[token] = self.legacy_alias_uses.get(token, 0) + 1
+            return self._legacy_aliases[token]
         # case-insensitive
         key = token.lower()
         if key in self.aliases:
+            if m is not None: m.alias_paths["lower"] += 1
             return self.aliases[key]
-        # legacy support + warning
-        if token in self._legacy_aliases:
-            mapped = self._legacy_aliases[token]
-            print(f"[warn] Legacy alias '{token}' → use the new ASCII alias instead "
-                  f"(e.g. opO/otO/maO/thO/buO or ovO/niO/diO/coO). Mapping to '{mapped}'.")
-            return mapped
+        if m is not None: m.alias_paths["raw"] += 1
         return token
 
-    def load_rules_from_text(self, text: str):
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip() and not ln.strip().startswith("#")]
-        for line in lines:
-            if line.upper().startswith("DEFINE "):
-                self._parse_define(line)
-            elif line.upper().startswith("REPLACE "):
-                self._parse_replace(line)
-            elif line.upper().startswith("DELETE "):
-                self._parse_delete(line)
-            elif line.upper().startswith("ENABLE "):
-                self._parse_enable(line, True)
-            elif line.upper().startswith("DISABLE "):
-                self._parse_enable(line, False)
-            elif line.upper().startswith("SELECT "):
-                self._parse_select(line)
+    def load_rules_from_text(self, text: str) -> Set[str]:
+        """
+        Applies a DSL block and returns the set of canonical operators whose definition actually
+        changed. Parsed directives are memoized per line content and compiled laws per source,
+        so reloading a block that barely changed only recompiles the new laws; the result cache
+        is invalidated for the changed operators only.
+        """
+        before: Dict[str, tuple] = {}
+        with self._lock:
+            try:
+                for ln in text.splitlines():
+                    line = ln.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    directive = self._directive_cache.get(line)
+                    if directive is None:
+                        directive = self._parse_directive(line)
+                        if directive is None:
+                            continue
+                        if len(self._directive_cache) >= _MAX_PARSE_CACHE:
+                            self._directive_cache.clear()
+                        self._directive_cache[line] = directive
+                    op = directive[1]
+                    if op not in before:
+                        before[op] = self._op_signature(op)
+                    self._apply_directive(directive)
+            finally:
+                changed = {op for op, sig in before.items() if self._op_signature(op) != sig}
+                for op in changed:
+                    self._invalidate(op)
+                if changed:
+                    self._publish()
+        return changed
+
+    def register_function(self, name: str, fn: Callable):
+        """
+        Makes FN callable from laws under NAME ('DEFINE Δ WITH relation(a, b)'). Laws are compiled
+        against the functions known at load time: register before loading the DSL that uses them.
+        """
+        if not name.isidentifier() or name in ("a", "b") or name.startswith("_"):
+            raise EvaluationError(f"Invalid function name '{name}'")
+        if name in self._law_globals["__builtins__"] or (name in self._law_globals and name not in self._functions):
+            raise EvaluationError(f"Function name '{name}' would shadow '{name}' in laws")
+        with self._lock:
+            self._law_globals[name] = fn
+            self._functions[name] = fn
+            # lois déjà compilées (ou refusées) sans ce nom : à recompiler au prochain chargement
+            self._law_cache.clear()
+            self._vec_cache.clear()
+            self._directive_cache.clear()
 
     def _compile_law(self, expr: str):
-        code = compile(expr, "<law>", "eval")
-        def fn(a, b):
-            return eval(code, self._law_globals, {"a": a, "b": b})
+        try:
+            return compile_law(expr, self._law_globals)
+        except LawError as ex:
+            raise EvaluationError(str(ex)) from None
+
+    def _vectorized_law(self, law) -> Optional[Callable]:
+        """Array version of a compiled law, or None when it cannot be vectorized (cached per law source)."""
+        expr = getattr(law, "expr", None)
+        if expr is None or load_numpy() is None:
+            return None
+        if expr not in self._vec_cache:
+            self._vec_cache[expr] = vectorize_law(expr, self._law_globals)
+        return self._vec_cache[expr]
+
+    def _law(self, expr: str):
+        fn = self._law_cache.get(expr)
+        if fn is None:
+            if len(self._law_cache) >= _MAX_PARSE_CACHE:
+                self._law_cache.clear()
+            fn = self._law_cache[expr] = self._compile_law(expr)
         return fn
 
-    def _parse_define(self, line: str):
-        m = re.match(r"DEFINE\s+(.+?)\s+WITH\s+(.+)$", line, flags=re.IGNORECASE)
-        if not m: raise EvaluationError(f"Bad DEFINE: {line}")
-        op_raw, law_expr = m.group(1).strip(), m.group(2).strip()
-        op = self._norm_op(op_raw)
-        self.ops[op] = {"enabled": True, "law": self._compile_law(law_expr)}
-
-    def _parse_replace(self, line: str):
-        m = re.match(r"REPLACE\s+(.+?)\s+WITH\s+(.+)$", line, flags=re.IGNORECASE)
-        if not m: raise EvaluationError(f"Bad REPLACE: {line}")
-        op_raw, law_expr = m.group(1).strip(), m.group(2).strip()
-        op = self._norm_op(op_raw)
-        if op not in self.ops: raise EvaluationError(f"Unknown op for REPLACE: {op_raw}")
-        self.ops[op]["law"] = self._compile_law(law_expr)
-        if "laws" in self.ops[op]:
-            del self.ops[op]["laws"]
-
-    def _parse_delete(self, line: str):
-        m = re.match(r"DELETE\s+(.+)$", line, flags=re.IGNORECASE)
-        if not m: raise EvaluationError(f"Bad DELETE: {line}")
-        op_raw = m.group(1).strip()
-        op = self._norm_op(op_raw)
-        self.ops.pop(op, None)
-
-    def _parse_enable(self, line: str, enable: bool):
-        m = re.match(r"(EN|DIS)ABLE\s+(.+)$", line, flags=re.IGNORECASE)
-        if not m: raise EvaluationError(f"Bad ENABLE/DISABLE: {line}")
-        op_raw = m.group(2).strip()
-        op = self._norm_op(op_raw)
-        if op not in self.ops: raise EvaluationError(f"Unknown op: {op_raw}")
-        self.ops[op]["enabled"] = enable
-
-    def _parse_select(self, line: str):
-        m = re.match(r"SELECT\s+(.+?)\s+WITH\s*\{\s*(.+?)\s*\}\s*USING\s*ORIENTATION\s*([+\-])$", line, flags=re.IGNORECASE)
-        if not m: raise EvaluationError(f"Bad SELECT: {line}")
-        op_raw = m.group(1).strip()
-        laws_blob = m.group(2).strip()
-        orientation = m.group(3).strip()
-        op = self._norm_op(op_raw)
-        laws = [x.strip() for x in laws_blob.split(";") if x.strip()]
-        compiled = [self._compile_law(expr) for expr in laws]
-        self.ops[op] = {"enabled": True, "laws": compiled, "selector_orientation": orientation}
+    def _op_signature(self, op: str):
+        spec = self.ops.get(op)
+        if spec is None:
+            return None
+        laws = spec.get("laws") or [spec.get("law")]
+        return (spec.get("enabled"), tuple(getattr(f, "expr", id(f)) for f in laws),
+                spec.get("selector_orientation"))
 
-    def evaluate_expression(self, expr: str):
-        tokens = expr.strip().split()
-        if len(tokens) != 3:
-            raise EvaluationError("Expression must be 'a OP b' with spaces, e.g., '3 ⊕ 7' or '3 +O 7'")
-        try:
-            a = float(tokens[0]); b = float(tokens[2])
-        except ValueError:
-            raise EvaluationError("Operands must be numeric")
+    def _parse_directive(self, line: str):
+        """'DEFINE ⊕ WITH a+b' -> ('DEFINE', '⊕', '⊕', 'a+b'); None for non-directive lines."""
+        m = _DIRECTIVE_RE.match(line)
+        if not m:
+            return None
+        kind, rest = m.group(1).upper(), m.group(2)
+        if kind in ("DEFINE", "REPLACE"):
+            m = _WITH_RE.match(rest)
+            if not m: raise EvaluationError(f"Bad {kind}: {line}")
+            op_raw = m.group(1).strip()
+            return (kind, self._norm_op(op_raw), op_raw, m.group(2).strip())
+        if kind == "SELECT":
+            m = _SELECT_RE.match(rest)
+            if not m: raise EvaluationError(f"Bad SELECT: {line}")
+            op_raw = m.group(1).strip()
+            laws = tuple(x.strip() for x in m.group(2).split(";") if x.strip())
+            return (kind, self._norm_op(op_raw), op_raw, laws, m.group(3))
+        op_raw = rest.strip()
+        return (kind, self._norm_op(op_raw), op_raw)
 
-        op_token = tokens[1]
-        op = self._norm_op(op_token)
+    def _apply_directive(self, directive: tuple):
+        kind, op, op_raw = directive[:3]
+        if kind == "DEFINE":
+            self.ops[op] = {"enabled": True, "law": self._law(directive[3])}
+        elif kind == "REPLACE":
+            if op not in self.ops: raise EvaluationError(f"Unknown op for REPLACE: {op_raw}")
+            self.ops[op]["law"] = self._law(directive[3])
+            self.ops[op].pop("laws", None)
+        elif kind == "DELETE":
+            self.ops.pop(op, None)
+        elif kind in ("ENABLE", "DISABLE"):
+            if op not in self.ops: raise EvaluationError(f"Unknown op: {op_raw}")
+            self.ops[op]["enabled"] = kind == "ENABLE"
+        elif kind == "SELECT":
+            compiled = [self._law(expr) for expr in directive[3]]
+            self.ops[op] = {"enabled": True, "laws": compiled, "selector_orientation": directive[4]}
 
+    def _resolve_law(self, op: str, op_token: str):
         if op not in self.ops or not self.ops[op].get("enabled", False):
             raise EvaluationError(f"Operation '{op_token}' is not defined or disabled")
 
         spec = self.ops[op]
         if "law" in spec:
-            return spec["law"](a, b)
+            return spec["law"]
         elif "laws" in spec:
             orient = spec.get("selector_orientation", self.orientation)
+            if self.metrics is not None:
+                self.metrics.branch(op, orient)
             idx = 0 if orient == "+" else -1
-            return spec["laws"][idx](a, b)
+            return spec["laws"][idx]
         raise EvaluationError("Malformed operation spec")
+
+    # ---------- Snapshots ----------
+    def freeze(self):
+        """
+        Immutable RuleSet of the current operators: every alias spelling resolves in one dict
+        lookup to its law, SELECT orientation applied. The same object is returned until the
+        rules change; once an engine has been frozen, each change publishes the next snapshot
+        atomically, so freeze() never waits on a reader.
+        """
+        snap = self._frozen
+        if snap is not None and snap.orientation == self.orientation:
+            return snap
+        with self._lock:
+            snap = self._frozen
+            if snap is None or snap.orientation != self.orientation:
+                from ruleset import RuleSet
+                snap = self._frozen = RuleSet(self, self._generation)
+            return snap
+
+    def _publish(self):
+        """Called by writers, under the lock, after the operators changed."""
+        self._generation += 1
+        if self._frozen is not None:
+            from ruleset import RuleSet
+            self._frozen = RuleSet(self, self._generation)
+
+    # ---------- Cache de résultats ----------
+    def _invalidate(self, op: str):
+        """Drops the cached results of OP only."""
+        for key in self._cache_keys.pop(op, ()):
+            self._cache.pop(key, None)
+
+    def cache_clear(self):
+        self._cache.clear()
+        self._cache_keys.clear()
+        self.cache_hits = self.cache_misses = 0
+
+    # ---------- Métriques ----------
+    def stats(self) -> dict:
+        """
+        {"enabled", "ops": {op: {"calls", "errors", "error_rate", "mean_us", "p50_us", "p99_us",
+        "max_us", "histogram_ns", "select_branches"}}, "alias_paths", "legacy_aliases", "cache"}.
+        Percentiles are bucket upper bounds from the log2 histogram.
+        """
+        snap = self.metrics.snapshot() if self.metrics is not None else {"ops": {}, "alias_paths": {}}
+        snap.update(enabled=self.metrics is not None, legacy_aliases=dict(self.legacy_alias_uses),
+                    cache=self.cache_info())
+        return snap
+
+    def reset_stats(self):
+        self.legacy_alias_uses.clear()
+        if self.metrics is not None:
+            self.metrics.reset()
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"hits": self.cache_hits, "misses": self.cache_misses,
+                "size": len(self._cache), "maxsize": self.cache_size}
+
+    def _cache_put(self, key: tuple, value):
+        self._cache[key] = value
+        self._cache_keys.setdefault(key[0], set()).add(key)
+        if len(self._cache) > self.cache_size:
+            old, _ = self._cache.popitem(last=False)
+            keys = self._cache_keys.get(old[0])
+            if keys is not None:
+                keys.discard(old)
+
+    def _is_op_token(self, token: str) -> bool:
+        return (token in self.aliases or token.lower() in self.aliases
+                or token in self._legacy_aliases or token in self.ops)
+
+    def _apply(self, op: str, op_token: str, a, b):
+        """Applies canonical OP to (a, b), going through the result cache and metrics when enabled."""
+        m = self.metrics
+        if m is None:
+            return self._apply_cached(op, op_token, a, b)
+        t0 = perf_counter_ns()
+        try:
+            res = self._apply_cached(op, op_token, a, b)
+        except Exception:
+            m.record(op, perf_counter_ns() - t0, error=True)
+            raise
+        m.record(op, perf_counter_ns() - t0)
+        return res
+
+    def _apply_cached(self, op: str, op_token: str, a, b):
+        if not self.cache_size:
+            return self._resolve_law(op, op_token)(a, b)
+
+        key = (op, a, b, self.orientation)
+        try:
+            res = self._cache[key]
+        except KeyError:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return res
+        res = self._resolve_law(op, op_token)(a, b)
+        self._cache_put(key, res)
+        return res
+
+    def evaluate_expression(self, expr: str):
+        tokens = expr.strip().split()
+        if len(tokens) > 3 or "(" in expr:
+            return self.compile_expression(expr).evaluate()
+        if len(tokens) != 3:
+            raise EvaluationError("Expression must be 'a OP b' with spaces, e.g., '3 ⊕ 7' or '3 +O 7'")
+        try:
+            a = float(tokens[0]); b = float(tokens[2])
+        except ValueError:
+            raise EvaluationError("Operands must be numeric")
+
+        return self._apply(self._norm_op(tokens[1]), tokens[1], a, b)
+
+    def compile_expression(self, text: str):
+        """
+        Parses a compound expression such as '((n ⊕ n) ◇ k) τ 0' once and returns a reusable
+        CompiledExpression (see expression.py) evaluated with variable bindings.
+        """
+        from expression import compile_expression
+        return compile_expression(self, text)
+
+    def export_module(self, path: str, source_text: str = "") -> str:
+        """Writes the current rule set as a plain importable Python module (see codegen.py)."""
+        from codegen import export_module
+        return export_module(self, path, source_text)
+
+    def load_module(self, module) -> Set[str]:
+        """
+        Installs the operators of a module generated by export_module (module object or file
+        path) without parsing or compiling any DSL. Returns the operators that changed.
+        """
+        if isinstance(module, str):
+            import importlib.util
+            name = os.path.splitext(os.path.basename(module))[0]
+            spec = importlib.util.spec_from_file_location(name, module)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            module = mod
+        with self._lock:
+            before = {op: self._op_signature(op) for op in module.OPS}
+            for op, fn in module.OPS.items():
+                self.ops[op] = {"enabled": True, "law": fn}
+            changed = {op for op, sig in before.items() if self._op_signature(op) != sig}
+            for op in changed:
+                self._invalidate(op)
+            if changed:
+                self._publish()
+        return changed
+
+    def evaluate_batch(self, op: str, a, b):
+        """
+        Applies OP element-wise over whole arrays: evaluate_batch('⊕', degrees, ks).
+        Scalars broadcast against arrays. The law runs once over the arrays when it can be
+        vectorized (ternaries become np.where, math.* maps to numpy); otherwise, or if the
+        vectorized run fails, it falls back to per-element evaluation with scalar semantics.
+        Returns a numpy array, or a list when numpy is not installed.
+        """
+        canon = self._norm_op(op)
+        law = self._resolve_law(canon, op)
+        if self.metrics is None:
+            return self._evaluate_batch(law, a, b)
+        t0 = perf_counter_ns()
+        try:
+            res = self._evaluate_batch(law, a, b)
+        except Exception:
+            self.metrics.record(canon, perf_counter_ns() - t0, error=True)
+            raise
+        self.metrics.record(canon, perf_counter_ns() - t0, count=max(1, res.size if hasattr(res, "size") else len(res)))
+        return res
+
+    def _evaluate_batch(self, law, a, b):
+        np = load_numpy()
+        if np is None:  # numpy reste optionnel : boucle Python
+            a_seq = list(a) if isinstance(a, (list, tuple)) else None
+            b_seq = list(b) if isinstance(b, (list, tuple)) else None
+            n = len(a_seq) if a_seq is not None else (len(b_seq) if b_seq is not None else 1)
+            a_seq = a_seq if a_seq is not None else [a] * n
+            b_seq = b_seq if b_seq is not None else [b] * n
+            if len(a_seq) != len(b_seq):
+                raise EvaluationError("Operands must have the same length")
+            return [law(float(x), float(y)) for x, y in zip(a_seq, b_seq)]
+
+        try:
+            a_arr, b_arr = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+        except ValueError:
+            raise EvaluationError("Operands must be numeric arrays with compatible shapes")
+
+        vlaw = self._vectorized_law(law)
+        if vlaw is not None:
+            try:
+                with np.errstate(divide="raise", invalid="raise", over="raise"):
+                    res = np.asarray(vlaw(a_arr, b_arr))
+                return np.array(np.broadcast_to(res, a_arr.shape))
+            except Exception:
+                pass  # sémantique scalaire (ZeroDivisionError, types…) : boucle élément par élément
+
+        out = [law(x, y) for x, y in zip(a_arr.ravel().tolist(), b_arr.ravel().tolist())]
+        if all(isinstance(v, (int, float)) for v in out):
+            return np.array(out).reshape(a_arr.shape)
+        res = np.empty(len(out), dtype=object)  # types mêlés : pas de conversion en chaînes
+        res[:] = out
+        return res.reshape(a_arr.shape)
+
+
+def main(argv=None):
+    import argparse
+    p = argparse.ArgumentParser(prog="rule_engine", description="Outils du moteur de règles DSL")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("compile", help="Exporter un bloc DSL en module Python importable")
+    c.add_argument("dsl", help="fichier DSL (DEFINE/REPLACE/SELECT ...)")
+    c.add_argument("-o", "--output", default="rules_gen.py")
+    c.add_argument("--orientation", choices=["+", "-"], default="+")
+    args = p.parse_args(argv)
+
+    with open(args.dsl, "r", encoding="utf-8") as f:
+        text = f.read()
+    engine = RuleEngine(orientation=args.orientation)
+    engine.load_rules_from_text(text)
+    engine.export_module(args.output, source_text=text)
+    print(f"{len(engine.ops)} opérateur(s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Instantanés immuables d'un jeu de règles : engine.freeze().
+
+    rules = engine.freeze()
+    with ThreadPoolExecutor(8) as ex:
+        list(ex.map(rules.evaluate_expression, exprs))
+
+A RuleSet is built once from the engine's current operators and never changes afterwards, so
+any number of threads can share it without a lock. Every spelling RuleEngine._norm_op accepts
+(Unicode symbol, ASCII alias in any letter case, legacy alias, raw operator name) is a key of one
+flat dispatch dict whose value is the law itself, SELECT orientation already applied: evaluating
+'a OP b' is one dict lookup and one call. Disabled or undefined operators are simply absent.
+
+Once frozen, the engine publishes a new RuleSet after every change (load_rules_from_text,
+load_module) under its writer lock; readers that already hold a snapshot keep using it until
+they call freeze() again. Snapshots bypass the engine's result cache and metrics, which are
+mutable per-engine state.
+"""
+from itertools import product
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator
+
+from rule_engine import EvaluationError
+
+
+def _case_variants(name: str) -> Iterator[str]:
+    """Every spelling of NAME whose lower() is NAME ('oto' -> 'oto', 'otO', ..., 'OTO')."""
+    choices = [(c, c.upper()) if c.upper() != c and len(c.upper()) == 1 and c.upper().lower() == c else (c,)
+               for c in name]
+    return ("".join(p) for p in product(*choices))
+
+
+class RuleSet:
+    """
+    Frozen operators of a RuleEngine. `dispatch` maps every accepted spelling to its law, `ops`
+    every enabled canonical operator; `version` is the engine generation it was taken at.
+    """
+    __slots__ = ("dispatch", "ops", "disabled", "orientation", "version", "_names", "_batch")
+
+    def __init__(self, engine, version: int = 0):
+        laws: Dict[str, Callable] = {}
+        disabled = set()
+        for op in engine.ops:
+            if engine.ops[op].get("enabled", False):
+                laws[op] = engine._resolve_law(op, op)
+            else:
+                disabled.add(op)
+
+        # du moins prioritaire au plus prioritaire, comme _norm_op : nom brut, casse, legacy, alias exact
+        dispatch: Dict[str, Callable] = dict(laws)
+        for name, op in engine.aliases.items():
+            if op in laws:
+                dispatch.update((v, laws[op]) for v in _case_variants(name))
+        for table in (engine._legacy_aliases, engine.aliases):
+            dispatch.update((name, laws[op]) for name, op in table.items() if op in laws)
+
+        init = object.__setattr__
+        init(self, "dispatch", MappingProxyType(dispatch))
+        init(self, "ops", MappingProxyType(laws))
+        init(self, "disabled", frozenset(disabled))
+        init(self, "orientation", engine.orientation)
+        init(self, "version", version)
+        init(self, "_names", frozenset(engine.aliases) | frozenset(engine._legacy_aliases))
+        init(self, "_batch", engine._evaluate_batch)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RuleSet is immutable: publish a new one with engine.freeze()")
+
+    def __repr__(self):
+        return f"RuleSet(v{self.version}, {len(self.ops)} op(s), {len(self.dispatch)} spelling(s))"
+
+    def __contains__(self, op: str) -> bool:
+        return op in self.dispatch
+
+    def resolve(self, op: str) -> Callable:
+        """The law behind any spelling of OP."""
+        fn = self.dispatch.get(op)
+        if fn is None:
+            fn = self.dispatch.get(op.strip())
+            if fn is None:
+                raise EvaluationError(f"Operation '{op}' is not defined or disabled")
+        return fn
+
+    def evaluate(self, op: str, a, b):
+        fn = self.dispatch.get(op)
+        if fn is None:
+            fn = self.resolve(op)
+        return fn(a, b)
+
+    def evaluate_expression(self, expr: str):
+        """Same contract as RuleEngine.evaluate_expression, against the frozen operators."""
+        tokens = expr.strip().split()
+        if len(tokens) > 3 or "(" in expr:
+            return self.compile_expression(expr).evaluate()
+        if len(tokens) != 3:
+            raise EvaluationError("Expression must be 'a OP b' with spaces, e.g., '3 ⊕ 7' or '3 +O 7'")
+        try:
+            a = float(tokens[0]); b = float(tokens[2])
+        except ValueError:
+            raise EvaluationError("Operands must be numeric")
+        return self.evaluate(tokens[1], a, b)
+
+    def evaluate_many(self, exprs: Iterable[str]) -> list:
+        ev = self.evaluate_expression
+        return [ev(e) for e in exprs]
+
+    def evaluate_batch(self, op: str, a, b):
+        """RuleEngine.evaluate_batch with the frozen law (vectorized laws are cached by the engine)."""
+        return self._batch(self.resolve(op), a, b)
+
+    def compile_expression(self, text: str):
+        """CompiledExpression bound to this snapshot: later engine reloads do not affect it."""
+        from expression import compile_expression
+        return compile_expression(self, text)
+
+    # ---------- Interface utilisée par expression.py ----------
+    def _is_op_token(self, token: str) -> bool:
+        return token in self.dispatch or token in self._names or token.lower() in self._names
+
+    def _norm_op(self, op: str) -> str:
+        return op.strip()  # toutes les graphies sont déjà des clés de dispatch
+
+    def _apply(self, op: str, op_token: str, a, b):
+        fn = self.dispatch.get(op)
+        if fn is None:
+            raise EvaluationError(f"Operation '{op_token}' is not defined or disabled")
+        return fn(a, b)
@@ -0,0 +1,306 @@
+"""
+Évaluation isolée des lois : processus pré-lancés, avec budget de temps et de mémoire par appel.
+
+    with SandboxPool(dsl, workers=4, timeout=1.0, memory_mb=256) as sb:
+        sb.evaluate_many(["6 ⊕ 6", "30 ♣ 1e8"])   # [{"expr", "result", "error"}, ...]
+        sb.evaluate_expression("6 ⊕ 6")             # 11.0, or raises EvaluationError
+
+    python app.py --problem "partie A" --sandbox --law-timeout 0.5 --law-memory 256
+
+Laws come from an LLM: 'math.factorial(int(b))' or 'int(a) ** int(b)' with large operands can
+run for minutes or allocate gigabytes, and so can compiling them. The parent therefore only
+checks the DSL (directives, law syntax and names: law_compiler.check_law), without folding or
+compiling anything. Each worker process loads the DSL once, compiles a law on the first call of
+its operator and evaluates whole batches of expressions; before each expression it publishes the
+index of the expression (and the operator it is applying) in shared memory. The parent watches those counters: an
+expression that does not finish within `timeout` seconds gets its worker killed and replaced,
+and the rest of the batch is resubmitted. Memory is capped per worker with RLIMIT_AS (worker
+footprint at start + memory_mb; Unix only), so an oversized allocation fails with MemoryError
+inside the worker instead of swapping the host. Compiling a law is part of its first call and
+runs under the same budgets.
+
+Each timeout, memory failure or crash is a strike against the operator; after `max_strikes`
+strikes it is disabled (DISABLE in the parent's checked engine and in every worker), and later calls fail
+fast with the usual "not defined or disabled" error. ProcessPoolExecutor cannot kill a single
+busy worker, hence the plain multiprocessing processes and pipes.
+"""
+import os, threading, time
+from collections import deque
+from typing import Dict, List, Optional
+
+from law_compiler import check_law, LawError
+from rule_engine import RuleEngine, EvaluationError
+
+
+class LawBudgetExceeded(EvaluationError):
+    """A law ran out of time or memory (or killed its worker) in the sandbox."""
+
+
+def _vm_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _limit_memory(memory_mb: int) -> bool:
+    """RLIMIT_AS = current address space + MEMORY_MB; False where it cannot be applied."""
+    try:
+        import resource
+    except ImportError:  # Windows : seul le délai s'applique
+        return False
+    base = _vm_bytes()
+    if not base:  # sans /proc (macOS), RLIMIT_AS n'est de toute façon pas appliqué
+        return False
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = base + (memory_mb << 20)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    return True
+
+
+class _UncompiledLaw:
+    """A law that passed check_law; only the workers compile it."""
+    __slots__ = ("expr",)
+
+    def __init__(self, expr: str):
+        self.expr = expr
+
+    def __call__(self, a, b):
+        raise EvaluationError(f"Law '{self.expr}' is only compiled in the sandbox workers")
+
+
+class _CheckedEngine(RuleEngine):
+    """RuleEngine that validates its laws without folding or compiling them."""
+
+    def _compile_law(self, expr: str):
+        try:
+            check_law(expr, self._law_globals)
+        except LawError as ex:
+            raise EvaluationError(str(ex)) from None
+        return _UncompiledLaw(expr)
+
+
+class _WorkerEngine(_CheckedEngine):
+    """
+    Worker side: publishes the operator it is applying, for the parent's watchdog, and compiles
+    the laws of an operator on its first call (so a law that hangs or explodes while compiling
+    is charged to that call like any other).
+    """
+
+    def _apply(self, op: str, op_token: str, a, b):
+        self._current[1] = self._op_ids.get(op, -1)
+        if op not in self._compiled:
+            self._compile_op(op)
+        return RuleEngine._apply(self, op, op_token, a, b)
+
+    def _compile_op(self, op: str):
+        spec = self.ops.get(op)
+        if spec is None or not spec.get("enabled", False):
+            return  # _resolve_law signale l'opérateur absent ou désactivé
+        if "law" in spec:
+            spec["law"] = RuleEngine._compile_law(self, spec["law"].expr)
+        else:
+            spec["laws"] = [RuleEngine._compile_law(self, law.expr) for law in spec["laws"]]
+        self._compiled.add(op)
+
+
+def _worker_main(conn, dsl: str, orientation: str, ops, current, memory_mb: int):
+    if memory_mb:
+        _limit_memory(memory_mb)
+    engine = _WorkerEngine(orientation=orientation)
+    engine.load_rules_from_text(dsl)
+    engine._current, engine._op_ids = current, {op: i for i, op in enumerate(ops)}
+    engine._compiled = set()
+    disabled = set()
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        exprs, off = msg
+        for op in off:
+            if op not in disabled:
+                engine.load_rules_from_text(f"DISABLE {op}")
+                disabled.add(op)
+        # valeurs à plat + erreurs creuses : un lot de floats se sérialise bien plus vite que des tuples
+        values, errors, ev = [], {}, engine.evaluate_expression
+        for i, expr in enumerate(exprs):
+            current[0] = i
+            try:
+                values.append(ev(expr))
+            except MemoryError:
+                values.append(None)
+                errors[i] = (2, current[1])
+            except Exception as ex:  # même contrat que app.solve_problem : l'erreur est rapportée
+                values.append(None)
+                errors[i] = (1, str(ex))
+        conn.send((values, errors))
+
+
+class _Worker:
+    __slots__ = ("proc", "conn", "current", "start", "chunk", "seen", "since")
+
+    def __init__(self, proc, conn, current):
+        self.proc, self.conn, self.current = proc, conn, current
+        self.start, self.chunk, self.seen, self.since = 0, None, -1, 0.0
+
+
+class SandboxPool:
+    """
+    Pre-started worker processes evaluating the laws of DSL under per-call budgets.
+    workers=0 uses os.cpu_count(). Calls are serialized (one batch at a time per pool).
+    `engine` is the parent's checked view of the DSL (operators, enabled flags): it cannot
+    evaluate anything.
+    """
+
+    def __init__(self, dsl: str, workers: int = 0, timeout: float = 1.0, memory_mb: int = 256,
+                 max_strikes: int = 3, orientation: str = "+", batch_size: int = 2048):
+        import multiprocessing as mp
+        # valide la DSL (syntaxe et noms seulement) avant de lancer les workers, sans rien compiler
+        self.engine = _CheckedEngine(orientation=orientation)
+        self.engine.load_rules_from_text(dsl)
+        self.dsl, self.orientation = dsl, orientation
+        self.ops = tuple(self.engine.ops)
+        self.timeout, self.memory_mb = timeout, memory_mb
+        self.max_strikes, self.batch_size = max_strikes, batch_size
+        self.strikes: Dict[str, int] = {}
+        self.disabled: List[str] = []
+        self.restarts = 0
+        self._ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+        self._lock = threading.Lock()
+        self._workers = [self._spawn() for _ in range(workers or os.cpu_count() or 1)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spawn(self) -> _Worker:
+        parent, child = self._ctx.Pipe()
+        current = self._ctx.Array("i", 2, lock=False)  # [expression en cours, opérateur en cours]
+        current[0] = current[1] = -1
+        proc = self._ctx.Process(target=_worker_main, daemon=True,
+                                 args=(child, self.dsl, self.orientation, self.ops, current, self.memory_mb))
+        proc.start()
+        child.close()
+        return _Worker(proc, parent, current)
+
+    def _replace(self, w: _Worker) -> _Worker:
+        w.proc.kill()
+        w.proc.join()
+        w.conn.close()
+        self.restarts += 1
+        new = self._spawn()
+        self._workers[self._workers.index(w)] = new
+        return new
+
+    def _strike(self, op_id: int) -> Optional[str]:
+        op = self.ops[op_id] if 0 <= op_id < len(self.ops) else None
+        if op is None:
+            return None
+        self.strikes[op] = self.strikes.get(op, 0) + 1
+        if self.strikes[op] >= self.max_strikes and op not in self.disabled:
+            self.disabled.append(op)
+            self.engine.load_rules_from_text(f"DISABLE {op}")
+        return op
+
+    def _run(self, exprs: List[str]):
+        """
+        (values, errors): one value per expression (None on error) and {index: (status, message)}
+        with status 1 for evaluation errors, 2 for exceeded budgets.
+        """
+        from multiprocessing.connection import wait
+        values: list = [None] * len(exprs)
+        errors: Dict[int, tuple] = {}
+        size = max(1, min(self.batch_size, -(-len(exprs) // len(self._workers))))
+        todo = deque((lo, exprs[lo:lo + size]) for lo in range(0, len(exprs), size))
+        idle = list(self._workers)
+        busy: Dict[object, _Worker] = {}
+        tick = min(0.05, self.timeout / 4)
+
+        def submit(w, start, chunk):
+            w.start, w.chunk, w.seen, w.since = start, chunk, -1, time.monotonic()
+            w.current[0] = w.current[1] = -1
+            w.conn.send((chunk, tuple(self.disabled)))
+            busy[w.conn] = w
+
+        def fail(w, msg):
+            # l'expression en cours est perdue ; le reste du lot (déjà évalué ou non) repart sur un worker neuf
+            i = max(w.current[0], 0)
+            op = self._strike(w.current[1])
+            errors[w.start + i] = (2, msg.format(op=op or "?", expr=w.chunk[i]))
+            if i + 1 < len(w.chunk):
+                todo.appendleft((w.start + i + 1, w.chunk[i + 1:]))
+            if i:
+                todo.appendleft((w.start, w.chunk[:i]))
+            del busy[w.conn]
+            idle.append(self._replace(w))
+
+        while todo or busy:
+            while todo and idle:
+                submit(idle.pop(), *todo.popleft())
+            for conn in wait(list(busy), tick):
+                w = busy[conn]
+                try:
+                    vals, errs = conn.recv()
+                except (EOFError, OSError):
+                    fail(w, "Worker died evaluating '{expr}' (law '{op}')")
+                    continue
+                values[w.start:w.start + len(vals)] = vals
+                for i, (status, value) in errs.items():
+                    if status == 2:
+                        op = self._strike(value)
+                        value = f"Law '{op or '?'}' exceeded its {self.memory_mb} MB memory budget"
+                    errors[w.start + i] = (status, value)
+                del busy[conn]
+                idle.append(w)
+            now = time.monotonic()
+            for w in list(busy.values()):
+                i = w.current[0]
+                if i != w.seen:
+                    w.seen, w.since = i, now
+                elif i >= 0 and now - w.since > self.timeout:
+                    fail(w, "Law '{op}' exceeded its %gs time budget on '{expr}'" % self.timeout)
+        return values, errors
+
+    def evaluate_many(self, exprs: List[str]) -> List[dict]:
+        """[{"expr", "result", "error"}] in order, as app.solve_problem reports evaluations."""
+        exprs = list(exprs)
+        with self._lock:
+            values, errors = self._run(exprs)
+        out = [{"expr": e, "result": v, "error": None} for e, v in zip(exprs, values)]
+        for i, (_, msg) in errors.items():
+            out[i]["error"] = msg
+        return out
+
+    def evaluate_expression(self, expr: str):
+        with self._lock:
+            values, errors = self._run([expr])
+        if errors:
+            status, msg = errors[0]
+            raise (LawBudgetExceeded if status == 2 else EvaluationError)(msg)
+        return values[0]
+
+    def stats(self) -> dict:
+        return {"workers": len(self._workers), "restarts": self.restarts,
+                "strikes": dict(self.strikes), "disabled": list(self.disabled)}
+
+    def close(self):
+        for w in self._workers:
+            try:
+                w.conn.send(None)
+            except OSError:
+                pass
+        for w in self._workers:
+            w.proc.join(1.0)
+            if w.proc.is_alive():
+                w.proc.kill()
+                w.proc.join()
+            w.conn.close()
+        self._workers = []
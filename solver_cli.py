@@ -1,34 +1,109 @@
-import sys
-from rule_engine import RuleEngine
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python solver_cli.py \"<expression>\"")
-        sys.exit(1)
-
-    expr = sys.argv[1]
-
-    # Préparer l’engin
-    engine = RuleEngine()
-    dsl = (
-        "DEFINE ⊕ WITH (a-1)*(a-2)/2 + 1\n"
-        "DEFINE ⊗ WITH 1 if b<=a else 0\n"
-        "DEFINE ◇ WITH a-b\n"
-        "DEFINE τ WITH 1 if (a-b)>=2 else 0\n"
-        "DEFINE ♠ WITH (a+1)//3\n"
-        "DEFINE ○ WITH 1\n"
-        "DEFINE ⊂ WITH a+b\n"
-        "DEFINE Δ WITH 'nested' if a<b else 'separated'\n"
-        "DEFINE χ WITH a+b\n"
-    )
-    engine.load_rules_from_text(dsl)
-
-    try:
-        result = engine.evaluate_expression(expr)
-        print(f"{expr} => {result}")
-    except Exception as e:
-        print(f"Erreur: {e}")
-
-if __name__ == "__main__":
-    main()
+import json, os, sys
+from engine_metrics import report_stats
+
+DSL = (
+    "DEFINE ⊕ WITH (a-1)*(a-2)/2 + 1\n"
+    "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+    "DEFINE ◇ WITH a-b\n"
+    "DEFINE τ WITH 1 if (a-b)>=2 else 0\n"
+    "DEFINE ♠ WITH (a+1)//3\n"
+    "DEFINE ○ WITH 1\n"
+    "DEFINE ⊂ WITH a+b\n"
+    "DEFINE Δ WITH 'nested' if a<b else 'separated'\n"
+    "DEFINE χ WITH a+b\n"
+)
+
+# Démon (solver_daemon.py) à utiliser s'il tourne ; sinon évaluation dans le processus
+SERVER_ENV = "SOLVER_DAEMON"
+
+
+def _request(server: str, path: str, body=None, timeout: float = 2.0):
+    """
+    Minimal HTTP/1.1 exchange over a plain socket: urllib/http.client would cost more import
+    time than the evaluation itself. Raises OSError on connection or HTTP errors.
+    """
+    import socket
+    hostport = server.split("://", 1)[-1].rstrip("/")
+    host, _, port = hostport.rpartition(":")
+    data = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+    head = (f"{'GET' if body is None else 'POST'} {path} HTTP/1.1\r\nHost: {hostport}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n")
+    with socket.create_connection((host or "127.0.0.1", int(port or 80)), timeout=timeout) as sock:
+        sock.sendall(head.encode("ascii") + data)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    status_line, _, rest = b"".join(chunks).partition(b"\r\n")
+    _, _, payload = rest.partition(b"\r\n\r\n")
+    parts = status_line.split()
+    if len(parts) < 2 or not parts[1].startswith(b"2"):
+        raise OSError(f"{server}{path}: {status_line.decode('latin-1', 'replace')}")
+    return json.loads(payload)
+
+
+def evaluate_remote(server: str, exprs, ruleset: str = "default", orientation: str = "+"):
+    """[{"expr", "result", "error"}] from the daemon at SERVER; raises OSError if it cannot be reached."""
+    body = {"exprs": list(exprs), "ruleset": ruleset, "orientation": orientation}
+    return _request(server, "/eval", body)["results"]
+
+
+def evaluate_local(exprs, stats: bool = False):
+    from rule_engine import RuleEngine  # client léger : le moteur n'est chargé qu'en repli
+    engine = RuleEngine(metrics=stats)
+    engine.load_rules_from_text(DSL)
+    out = []
+    for expr in exprs:
+        try:
+            out.append({"expr": expr, "result": engine.evaluate_expression(expr), "error": None})
+        except Exception as e:
+            out.append({"expr": expr, "result": None, "error": str(e)})
+    return out, engine
+
+
+def main():
+    argv = sys.argv[1:]
+    stats = None
+    server = os.environ.get(SERVER_ENV)
+    if "--server" in argv:
+        i = argv.index("--server")
+        server = argv[i + 1] if i + 1 < len(argv) else None
+        del argv[i:i + 2]
+    if "--local" in argv:
+        argv.remove("--local")
+        server = None
+    if "--stats" in argv:
+        # --stats [FICHIER|-] : table, ou JSON sur stdout / dans FICHIER
+        i = argv.index("--stats")
+        nxt = argv[i + 1] if i + 1 < len(argv) else None
+        take = nxt is not None and (nxt == "-" or nxt.endswith(".json"))
+        stats = nxt if take else ""
+        del argv[i:i + 1 + take]
+    if not argv:
+        print("Usage: python solver_cli.py \"<expression>\" [--stats [FICHIER|-]] [--server URL | --local]")
+        sys.exit(1)
+
+    expr = argv[0]
+
+    results = engine = None
+    if server:
+        try:
+            results = evaluate_remote(server, [expr])
+        except (OSError, ValueError):
+            results = None  # démon absent ou injoignable : repli local
+    if results is None:
+        results, engine = evaluate_local([expr], stats=stats is not None)
+
+    item = results[0]
+    if item["error"] is None:
+        print(f"{expr} => {item['result']}")
+    else:
+        print(f"Erreur: {item['error']}")
+    if stats is not None:
+        report_stats(engine.stats() if engine is not None else _request(server, "/stats"), stats)
+
+if __name__ == "__main__":
+    main()
     
\ No newline at end of file
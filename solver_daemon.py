@@ -0,0 +1,258 @@
+"""
+Serveur du solveur : garde les RuleEngine compilés en mémoire entre les requêtes.
+
+    python solver_daemon.py --port 8765
+    SOLVER_DAEMON=http://127.0.0.1:8765 python solver_cli.py "6 ⊕ 6"
+
+JSON over HTTP/1.1 (keep-alive) on localhost, one thread per connection:
+
+    POST /eval   {"expr": "6 ⊕ 6"} or {"exprs": [...]}, optional "ruleset", "orientation"
+                 -> {"results": [{"expr", "result", "error"}, ...]}
+    POST /rules  {"dsl": "...", optional "ruleset", "replace"}
+                 -> {"ruleset", "ops", "changed"}
+    GET  /stats?ruleset=default&orientation=+    -> RuleEngine.stats()
+    GET  /health                                  -> {"ok": true, "rulesets": [...]}
+
+The "default" ruleset holds solver_cli's built-in laws. Uploading DSL to an existing ruleset
+applies it incrementally (load_rules_from_text) to the engines already built for it; without
+a name the ruleset is named after the sha256 of its DSL. At most --max-engines engines and
+--max-rulesets rulesets are kept, least recently used first out (an evicted ruleset answers
+404 until it is uploaded again; "default" stays).
+"""
+import argparse, hashlib, json, threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from rule_engine import RuleEngine, EvaluationError
+from solver_cli import DSL
+
+DEFAULT_HOST, DEFAULT_PORT = "127.0.0.1", 8765
+MAX_BODY = 16 * 1024 * 1024
+
+
+class UnknownRuleset(KeyError):
+    pass
+
+
+def _state_dsl(engine: RuleEngine) -> str:
+    """One directive per operator reproducing ENGINE's current rules (an append history, compacted)."""
+    out = []
+    for op, spec in engine.ops.items():
+        if "laws" in spec:
+            laws = " ; ".join(law.expr for law in spec["laws"])
+            out.append(f"SELECT {op} WITH {{ {laws} }} USING ORIENTATION {spec['selector_orientation']}")
+        else:
+            out.append(f"DEFINE {op} WITH {spec['law'].expr}")
+        if not spec.get("enabled", True):
+            out.append(f"DISABLE {op}")
+    return "\n".join(out)
+
+
+class SolverState:
+    """
+    Rulesets (DSL source) and their compiled engines, shared by all handler threads. Both are
+    LRU-bounded; the "default" ruleset is never evicted. Each ruleset also keeps a probe engine
+    holding its current laws: uploads are validated and diffed on it, so an append only parses
+    the appended DSL, after which the ruleset's source is compacted to one directive per
+    operator. Engines are built outside the state lock: a slow compile only delays its own
+    request.
+    """
+
+    def __init__(self, max_engines: int = 64, max_rulesets: int = 1024):
+        self.max_engines = max_engines
+        self.max_rulesets = max_rulesets
+        self.sources: "OrderedDict[str, List[str]]" = OrderedDict(default=[DSL])  # blocs DSL reçus
+        self._probes: Dict[str, RuleEngine] = {}
+        self._engines: "OrderedDict[Tuple[str, str], RuleEngine]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # un chargement à la fois ; les évaluations continuent
+
+    def engine(self, ruleset: str = "default", orientation: str = "+") -> RuleEngine:
+        if orientation not in ("+", "-"):
+            raise ValueError(f"orientation must be '+' or '-', not {orientation!r}")
+        key = (ruleset, orientation)
+        while True:
+            with self._lock:
+                if ruleset not in self.sources:
+                    raise UnknownRuleset(ruleset)
+                self.sources.move_to_end(ruleset)
+                engine = self._engines.get(key)
+                if engine is not None:
+                    self._engines.move_to_end(key)
+                    return engine
+                blocks = self.sources[ruleset]  # chaque chargement installe une nouvelle liste
+            engine = RuleEngine(orientation=orientation, metrics=True)
+            engine.load_rules_from_text("\n".join(blocks))
+            with self._lock:
+                if self.sources.get(ruleset) is not blocks:
+                    continue  # DSL changée pendant la compilation : on recommence sur la nouvelle
+                engine = self._engines.setdefault(key, engine)
+                self._engines.move_to_end(key)
+                while len(self._engines) > self.max_engines:
+                    self._engines.popitem(last=False)
+                return engine
+
+    def _drop_engines(self, ruleset: str):
+        for key in [k for k in self._engines if k[0] == ruleset]:
+            del self._engines[key]
+
+    def _probe(self, ruleset: str, blocks: List[str]) -> RuleEngine:
+        probe = self._probes.get(ruleset)
+        if probe is None:
+            probe = self._probes[ruleset] = RuleEngine()
+            probe.load_rules_from_text("\n".join(blocks))
+        return probe
+
+    def load(self, dsl: str, ruleset: str = None, replace: bool = False) -> dict:
+        if ruleset is None:
+            ruleset = hashlib.sha256(dsl.encode("utf-8")).hexdigest()[:16]
+            replace = True  # même contenu -> même jeu : renvoyer une DSL déjà connue ne change rien
+        with self._load_lock:
+            with self._lock:
+                blocks = list(self.sources.get(ruleset, ()))
+            old = self._probe(ruleset, blocks) if blocks else None
+            if blocks and not replace:
+                # ajout : seul le nouveau bloc est analysé ; un échec laisse un état partiel à reconstruire
+                probe = old
+                try:
+                    changed = probe.load_rules_from_text(dsl)
+                except EvaluationError:
+                    del self._probes[ruleset]
+                    raise
+                with self._lock:
+                    self.sources[ruleset] = [_state_dsl(probe)]  # l'historique ne s'allonge pas
+                    for key, engine in self._engines.items():
+                        if key[0] == ruleset:
+                            engine.load_rules_from_text(dsl)
+            elif blocks == [dsl]:
+                probe, changed = old, set()  # moteurs déjà à jour : on les garde chauds
+            else:
+                # validation sur un moteur neuf : une DSL invalide ne touche pas aux moteurs en service
+                probe = RuleEngine()
+                probe.load_rules_from_text(dsl)
+                ops = set(probe.ops) | set(old.ops if old else ())
+                changed = {op for op in ops
+                           if probe._op_signature(op) != (old._op_signature(op) if old else None)}
+                with self._lock:
+                    self.sources[ruleset] = [dsl]
+                    if changed:
+                        self._drop_engines(ruleset)
+            self._probes[ruleset] = probe
+            with self._lock:
+                self.sources.move_to_end(ruleset)
+                self._evict(keep=ruleset)
+        return {"ruleset": ruleset, "ops": sorted(probe.ops), "changed": sorted(changed)}
+
+    def _evict(self, keep: str):
+        """Drops least recently used rulesets (and their engines) beyond max_rulesets."""
+        pinned = {"default", keep}
+        while len(self.sources) > self.max_rulesets:
+            victim = next((name for name in self.sources if name not in pinned), None)
+            if victim is None:
+                break
+            del self.sources[victim]
+            self._probes.pop(victim, None)
+            self._drop_engines(victim)
+
+    def evaluate(self, exprs: List[str], ruleset: str = "default", orientation: str = "+") -> List[dict]:
+        engine = self.engine(ruleset, orientation)
+        out = []
+        for expr in exprs:
+            try:
+                out.append({"expr": expr, "result": engine.evaluate_expression(expr), "error": None})
+            except Exception as ex:  # même contrat que solver_cli : toute erreur est rapportée
+                out.append({"expr": expr, "result": None, "error": str(ex)})
+        return out
+
+
+class SolverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: SolverState = None
+
+    def _send(self, status: int, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ValueError("request body too large")
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("JSON object expected")
+        return body
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/health":
+            return self._send(200, {"ok": True, "rulesets": sorted(self.state.sources)})
+        if url.path == "/stats":
+            try:
+                engine = self.state.engine(query.get("ruleset", "default"), query.get("orientation", "+"))
+            except UnknownRuleset as ex:
+                return self._send(404, {"error": f"unknown ruleset {ex.args[0]!r}"})
+            except ValueError as ex:
+                return self._send(400, {"error": str(ex)})
+            return self._send(200, engine.stats())
+        self._send(404, {"error": f"unknown path {url.path}"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        try:
+            body = self._body()
+            if path == "/eval":
+                exprs = body["exprs"] if "exprs" in body else [body["expr"]]
+                if not isinstance(exprs, list) or not all(isinstance(e, str) for e in exprs):
+                    raise ValueError("'exprs' must be a list of strings")
+                results = self.state.evaluate(exprs, body.get("ruleset", "default"),
+                                              body.get("orientation", "+"))
+                return self._send(200, {"results": results})
+            if path == "/rules":
+                return self._send(200, self.state.load(body["dsl"], body.get("ruleset"),
+                                                       bool(body.get("replace"))))
+        except UnknownRuleset as ex:
+            return self._send(404, {"error": f"unknown ruleset {ex.args[0]!r}"})
+        except KeyError as ex:
+            return self._send(400, {"error": f"missing field {ex.args[0]!r}"})
+        except (ValueError, EvaluationError) as ex:
+            return self._send(400, {"error": str(ex)})
+        self._send(404, {"error": f"unknown path {path}"})
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_engines: int = 64,
+                max_rulesets: int = 1024) -> ThreadingHTTPServer:
+    handler = type("BoundSolverHandler", (SolverHandler,), {"state": SolverState(max_engines, max_rulesets)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Démon du solveur : moteurs de règles gardés en mémoire")
+    p.add_argument("--host", default=DEFAULT_HOST)
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--max-engines", type=int, default=64, help="moteurs compilés gardés (LRU)")
+    p.add_argument("--max-rulesets", type=int, default=1024, help="jeux de règles gardés (LRU)")
+    args = p.parse_args(argv)
+    server = make_server(args.host, args.port, args.max_engines, args.max_rulesets)
+    print(f"solver_daemon à l'écoute sur http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Balayage de paramètres : un opérateur évalué sur des plages / grilles entières, en parallèle.
+
+    python app.py sweep --op ⊕ --a 1:10000001 --out H.npy
+    python app.py sweep --op ◇ --a 3:200 --b 0:5000 --grid --out marges.npy --workers 8
+    python app.py sweep --op τ --a 1:100 --b 0,1,2,5 --grid --format csv --out seuils.csv
+
+Axes are "start:stop[:step]" (Python range semantics, floats allowed), a comma list or a single
+value. Without --grid, A and B are zipped (a single value broadcasts); with --grid the result is
+the len(A) x len(B) table. The domain is split into row chunks evaluated by a process pool whose
+workers load the rule set once (by default the DSL of MockProvider's "Partie A") and go through
+RuleEngine.evaluate_batch, so each chunk is one vectorized call when the law allows it.
+
+Output never holds the whole grid in memory: for .npy and raw memmap outputs each worker writes
+its rows straight into the memory-mapped file; CSV chunks are written in order as they complete.
+"""
+import argparse, json, os, sys, time
+from collections import deque
+from typing import Optional, Sequence, Tuple, Union
+
+from law_compiler import load_numpy
+from rule_engine import RuleEngine, EvaluationError
+
+Axis = Union[range, Tuple[float, ...]]
+
+_state = {}  # état du processus worker (moteur, axes, sortie mappée)
+
+
+def parse_axis(spec: str) -> Axis:
+    """'1:11' -> range(1, 11); '0:1:0.25' -> (0.0, 0.25, 0.5, 0.75); '1,2,5' -> (1.0, 2.0, 5.0)."""
+    spec = spec.strip()
+    try:
+        if ":" in spec:
+            parts = spec.split(":")
+            if len(parts) not in (2, 3):
+                raise ValueError(spec)
+            if all(_is_int(p) for p in parts):
+                return range(*(int(p) for p in parts))
+            np = _numpy()
+            return tuple(np.arange(*(float(p) for p in parts)).tolist())
+        return tuple(float(x) for x in spec.split(","))
+    except ValueError:
+        raise ValueError(f"Bad axis '{spec}': expected start:stop[:step], a comma list or a number") from None
+
+
+def _is_int(text: str) -> bool:
+    return text.strip().lstrip("+-").isdigit()
+
+
+def _numpy():
+    np = load_numpy()
+    if np is None:
+        raise RuntimeError("sweep requires numpy")
+    return np
+
+
+def axis_values(axis: Axis, lo: int = 0, hi: Optional[int] = None):
+    np = _numpy()
+    part = axis[lo:hi]
+    if isinstance(part, range):
+        return np.arange(part.start, part.stop, part.step, dtype=float)
+    return np.asarray(part, dtype=float)
+
+
+def default_dsl(problem: str = "Harnack partie A") -> str:
+    from providers.mock_provider import MockProvider
+    return MockProvider().solve(problem)["dsl"]
+
+
+def result_shape(a: Axis, b: Axis, grid: bool) -> Tuple[int, ...]:
+    if grid:
+        return (len(a), len(b))
+    if len(a) != len(b) and 1 not in (len(a), len(b)):
+        raise ValueError(f"Axes of lengths {len(a)} and {len(b)} cannot be zipped (use --grid)")
+    return (max(len(a), len(b)),)
+
+
+def chunks(shape: Sequence[int], chunk_cells: int):
+    """(lo, hi) row ranges of about CHUNK_CELLS cells each."""
+    row = shape[1] if len(shape) > 1 else 1
+    step = max(1, chunk_cells // max(row, 1))
+    for lo in range(0, shape[0], step):
+        yield lo, min(lo + step, shape[0])
+
+
+# ---------- côté worker ----------
+def _init_worker(dsl: str, orientation: str, op: str, a: Axis, b: Axis, grid: bool, target):
+    engine = RuleEngine(orientation=orientation)
+    engine.load_rules_from_text(dsl)
+    _state.update(engine=engine, op=op, a=a, b=b, grid=grid, out=None)
+    if target is not None:
+        np = _numpy()
+        kind, path, dtype, shape = target
+        if kind == "npy":
+            _state["out"] = np.load(path, mmap_mode="r+")
+        else:
+            _state["out"] = np.memmap(path, dtype=dtype, mode="r+", shape=tuple(shape))
+    _state["b_full"] = axis_values(b) if grid else None
+
+
+def _zip_operand(axis: Axis, lo: int, hi: int):
+    return axis_values(axis, 0, 1)[0] if len(axis) == 1 else axis_values(axis, lo, hi)
+
+
+def _eval_chunk(lo: int, hi: int):
+    """Evaluates rows [lo, hi); writes them into the mapped output or returns them."""
+    st = _state
+    if st["grid"]:
+        a, b = axis_values(st["a"], lo, hi)[:, None], st["b_full"][None, :]
+    else:
+        a, b = _zip_operand(st["a"], lo, hi), _zip_operand(st["b"], lo, hi)
+        n = hi - lo
+        if getattr(a, "ndim", 0) == 0 and getattr(b, "ndim", 0) == 0:
+            a = _numpy().full(n, a)
+    res = st["engine"].evaluate_batch(st["op"], a, b)
+    if st["out"] is not None:
+        if _numpy().asarray(res).dtype.kind not in "biuf":
+            raise ValueError(f"'{st['op']}' returns non-numeric values in rows {lo}:{hi}: use --format csv")
+        st["out"][lo:hi] = res
+        st["out"].flush()
+        return lo, hi, None
+    return lo, hi, res
+
+
+# ---------- côté principal ----------
+def _spread(axis: Axis, k: int):
+    """Indices of up to K cells spread over AXIS, first and last included."""
+    np = _numpy()
+    return np.unique(np.linspace(0, len(axis) - 1, min(len(axis), k)).round().astype(int))
+
+
+def _probe_dtype(dsl: str, orientation: str, op: str, a: Axis, b: Axis, grid: bool = False,
+                 samples: int = 64):
+    """
+    Output dtype from SAMPLES cells spread over the domain (not only the first one): float64 when
+    they are all numeric, else the promoted non-numeric dtype (CSV only). _eval_chunk still
+    checks every chunk, for values the probe did not see.
+    """
+    np = _numpy()
+    engine = RuleEngine(orientation=orientation)
+    engine.load_rules_from_text(dsl)
+    pick = lambda axis, idx: np.asarray([axis[int(i)] for i in idx], dtype=float)
+    if grid:
+        side = max(2, int(samples ** 0.5))
+        av, bv = pick(a, _spread(a, side))[:, None], pick(b, _spread(b, side))[None, :]
+    else:
+        idx = _spread(range(max(len(a), len(b))), samples)
+        av = pick(a, idx if len(a) > 1 else [0])
+        bv = pick(b, idx if len(b) > 1 else [0])
+    res = np.asarray(engine.evaluate_batch(op, av, bv))
+    return np.dtype(float) if res.dtype.kind in "biuf" else res.dtype
+
+
+def _write_csv(f, a: Axis, b: Axis, grid: bool, lo: int, hi: int, res):
+    np = _numpy()
+    if grid:
+        av = np.repeat(axis_values(a, lo, hi), len(b))
+        bv = np.tile(axis_values(b), hi - lo)
+    else:
+        n = hi - lo
+        av = np.broadcast_to(_zip_operand(a, lo, hi), (n,))
+        bv = np.broadcast_to(_zip_operand(b, lo, hi), (n,))
+    res = np.asarray(res).ravel()
+    if res.dtype.kind in "biuf":
+        np.savetxt(f, np.column_stack([av, bv, res]), fmt="%.17g", delimiter=",")
+    else:
+        f.writelines(f"{x:.17g},{y:.17g},{r}\n" for x, y, r in zip(av.tolist(), bv.tolist(), res.tolist()))
+
+
+def run_sweep(op: str, a: Axis, b: Axis, out: str, fmt: str = "npy", grid: bool = False,
+              workers: int = 0, chunk_cells: int = 1 << 20, dsl: Optional[str] = None,
+              orientation: str = "+") -> dict:
+    """
+    Evaluates OP over the axes and writes OUT. workers=0 uses os.cpu_count(); workers=1 runs in
+    this process. Returns {"shape", "dtype", "cells", "chunks", "seconds"}.
+    """
+    np = _numpy()
+    dsl = default_dsl() if dsl is None else dsl
+    shape = result_shape(a, b, grid)
+    dtype = _probe_dtype(dsl, orientation, op, a, b, grid)
+    if fmt in ("npy", "memmap") and dtype.kind not in "biuf":
+        raise ValueError(f"'{op}' returns {dtype} values: use --format csv")
+
+    target = None
+    if fmt == "npy":
+        np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape).flush()
+        target = ("npy", out, dtype.str, shape)
+    elif fmt == "memmap":
+        np.memmap(out, dtype=dtype, mode="w+", shape=shape).flush()
+        with open(out + ".json", "w", encoding="utf-8") as f:
+            json.dump({"dtype": dtype.str, "shape": list(shape), "op": op, "grid": grid}, f)
+        target = ("memmap", out, dtype.str, shape)
+    elif fmt != "csv":
+        raise ValueError(f"Unknown format '{fmt}'")
+
+    workers = workers or os.cpu_count() or 1
+    initargs = (dsl, orientation, op, a, b, grid, target)
+    tasks = list(chunks(shape, chunk_cells))
+    csv_file = open(out, "w", encoding="utf-8") if fmt == "csv" else None
+    t0 = time.perf_counter()
+    try:
+        if csv_file is not None:
+            csv_file.write(f"a,b,{op}\n")
+
+        def consume(lo, hi, res):
+            if csv_file is not None:
+                _write_csv(csv_file, a, b, grid, lo, hi, res)
+
+        if workers == 1 or len(tasks) == 1:
+            _init_worker(*initargs)
+            for lo, hi in tasks:
+                consume(*_eval_chunk(lo, hi))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+                pending = deque()
+                for lo, hi in tasks:
+                    # fenêtre bornée et ordonnée : au plus 2 blocs en attente par worker
+                    if len(pending) >= workers * 2:
+                        consume(*pending.popleft().result())
+                    pending.append(pool.submit(_eval_chunk, lo, hi))
+                while pending:
+                    consume(*pending.popleft().result())
+    finally:
+        _state.clear()  # libère le moteur et la sortie mappée du mode sans pool
+        if csv_file is not None:
+            csv_file.close()
+    cells = int(np.prod(shape))
+    return {"shape": list(shape), "dtype": dtype.str, "cells": cells, "chunks": len(tasks),
+            "seconds": time.perf_counter() - t0}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="app.py sweep", description="Évaluer un opérateur sur des plages / grilles")
+    p.add_argument("--op", required=True, help="opérateur ou alias (⊕, maO, thO...)")
+    p.add_argument("--a", required=True, help="axe A : start:stop[:step], liste 1,2,5 ou valeur")
+    p.add_argument("--b", default="0", help="axe B (défaut 0)")
+    p.add_argument("--grid", action="store_true", help="produit cartésien A x B au lieu de zip")
+    p.add_argument("--out", required=True)
+    p.add_argument("--format", choices=["npy", "memmap", "csv"],
+                   help="défaut : d'après l'extension de --out (.npy, .csv, sinon memmap brut + .json)")
+    p.add_argument("--workers", type=int, default=0, help="processus (0 = nombre de CPU, 1 = sans pool)")
+    p.add_argument("--chunk", type=int, default=1 << 20, help="cellules par bloc")
+    p.add_argument("--dsl", help="fichier DSL (défaut : Partie A de MockProvider)")
+    p.add_argument("--problem", help="problème pour MockProvider au lieu de la Partie A")
+    p.add_argument("--orientation", choices=["+", "-"], default="+")
+    args = p.parse_args(argv)
+
+    fmt = args.format or {".npy": "npy", ".csv": "csv"}.get(os.path.splitext(args.out)[1].lower(), "memmap")
+    if args.dsl:
+        with open(args.dsl, "r", encoding="utf-8") as f:
+            dsl = f.read()
+    else:
+        dsl = default_dsl(args.problem) if args.problem else None
+    try:
+        a, b = parse_axis(args.a), parse_axis(args.b)
+        info = run_sweep(args.op, a, b, args.out, fmt, args.grid, args.workers, args.chunk, dsl,
+                         args.orientation)
+    except (ValueError, RuntimeError, EvaluationError) as ex:
+        p.error(str(ex))
+    except ArithmeticError as ex:  # ZeroDivisionError & co levées par la loi elle-même
+        p.error(f"'{args.op}' : {type(ex).__name__}: {ex}")
+    rate = info["cells"] / info["seconds"] if info["seconds"] else float("inf")
+    print(f"{info['cells']} cellule(s) {tuple(info['shape'])} -> {args.out} [{fmt}] "
+          f"en {info['seconds']:.2f}s ({rate:,.0f}/s, {info['chunks']} bloc(s))", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
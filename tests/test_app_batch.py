@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import app
+except ImportError:  # dépendances de app.py absentes
+    app = None
+
+PROBLEMS = [
+    {"id": "a1", "problem": "Harnack partie A"},
+    {"id": "b1", "problem": "partie B ovales"},
+    {"request_id": "c1", "body": "autre chose"},
+]
+
+
+@unittest.skipIf(app is None, "app.py non importable")
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.inp = os.path.join(self.tmp.name, "problems.jsonl")
+        self.out = os.path.join(self.tmp.name, "results.jsonl")
+        self._write(PROBLEMS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, problems):
+        with open(self.inp, "w", encoding="utf-8") as f:
+            for p in problems:
+                f.write(json.dumps(p, ensure_ascii=False) + "\n")
+
+    def _results(self):
+        with open(self.out, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def _batch(self, *extra):
+        return app.main(["batch", "--in", self.inp, "--out", self.out, "--no-cache", "--workers", "2", *extra])
+
+    def test_one_line_per_problem(self):
+        self.assertEqual(self._batch(), 0)
+        results = {r["id"]: r for r in self._results()}
+        self.assertEqual(set(results), {"a1", "b1", "c1"})
+        evals = {e["expr"]: e["result"] for e in results["a1"]["evals"]}
+        self.assertEqual(evals["22 buO 0"], 7)
+        self.assertEqual(results["b1"]["evals"][2], {"expr": "2 diO 3", "result": "nested", "error": None})
+        self.assertEqual(set(results["c1"]["timings"]), {"provider", "sanitize", "load", "evals", "total"})
+
+    def test_resume_skips_done_ids(self):
+        self._batch()
+        with open(self.out, "a", encoding="utf-8") as f:
+            f.write('{"id": "d1", "payl')  # ligne tronquée par une interruption
+        self._write(PROBLEMS + [{"id": "d1", "problem": "Harnack"}])
+        self._batch()
+        ids = [r["id"] for r in self._results()]
+        self.assertEqual(sorted(ids), ["a1", "b1", "c1", "d1"])
+
+    def test_process_pool(self):
+        self.assertEqual(self._batch("--processes"), 0)
+        self.assertEqual(len(self._results()), 3)
+
+if __name__ == "__main__":
+    unittest.main()
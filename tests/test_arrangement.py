@@ -0,0 +1,162 @@
+import math
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from hilbertB.arrangement import (Arrangement, Oval, bind_arrangement, build_forest,
+                                  example_arrangement)
+from rule_engine import RuleEngine, EvaluationError
+
+
+def brute_parents(ovals):
+    """Référence O(n²) : plus petit ovale contenant le point le plus à gauche."""
+    parents = []
+    for i, o in enumerate(ovals):
+        x, y = o.leftmost()
+        best, best_area = -1, None
+        for j, p in enumerate(ovals):
+            if j != i and abs(p.area()) > abs(o.area()) and p.contains_point(x + 1e-9, y):
+                if best_area is None or p.area() < best_area:
+                    best, best_area = j, p.area()
+        parents.append(best)
+    return parents
+
+
+def random_disjoint_circles(rnd, n, gap=0.3):
+    circles = []
+    while len(circles) < n:
+        c = (rnd.uniform(0, 10), rnd.uniform(0, 10), rnd.uniform(0.2, 3))
+        if all(not (abs(c[2] - d[2]) - gap <= math.dist(c[:2], d[:2]) <= c[2] + d[2] + gap)
+               for d in circles):
+            circles.append(c)
+    return circles
+
+
+class TestArrangement(unittest.TestCase):
+    def setUp(self):
+        self.arr = example_arrangement()
+
+    def test_example_tree(self):
+        assert self.arr.parent == [-1, 0, 1, -1, -1]
+        assert self.arr.roots == [0, 3, 4]
+        assert [self.arr.depth(i) for i in range(5)] == [1, 2, 3, 1, 1]
+        assert self.arr.depth() == 3
+        assert self.arr.contains(0, 2) and not self.arr.contains(2, 0)
+        assert self.arr.relation(2, 0) == "nested"
+        assert self.arr.relation(1, 4) == "separated"
+        assert self.arr.nest_size(0) == 3 and self.arr.nest_size() == 5
+        assert self.arr.complexity() == {"ovals": 5, "outer": 3, "empty": 3, "depth": 3, "nested_pairs": 3}
+        assert self.arr.scheme() == "2 ⊔ 1<1<1>>"
+        assert Arrangement().scheme() == "0"
+
+    def test_polygons(self):
+        arr = Arrangement([
+            Oval.polygon([(0, 0), (10, 0), (10, 10), (0, 10)]),
+            Oval.polygon([(1, 1), (5, 1), (5, 5), (1, 5)]),
+            Oval.polygon([(6, 9), (9, 9), (9, 1), (6, 1)]),  # sens horaire
+            Oval.polygon([(7, 2), (8, 2), (8, 3), (7, 3)]),
+            Oval.polygon([(11, 0), (12, 0), (12, 10), (11, 10)]),
+            Oval.polygon([(2, 2), (4, 3), (2, 4), (3, 3)]),  # non convexe
+            Oval.circle(3, 7, 1.5),
+            Oval.polygon([(2.5, 6.8), (3.5, 6.8), (3, 7.5)]),
+        ])
+        assert arr.parent == [-1, 0, 0, 2, -1, 1, 0, 6]
+        assert arr.parent == brute_parents(arr.ovals)
+
+    def test_random_circles_match_brute_force(self):
+        rnd = random.Random(1)
+        for _ in range(60):
+            ovals = [Oval.circle(*c) for c in random_disjoint_circles(rnd, 15)]
+            assert build_forest(ovals) == brute_parents(ovals)
+
+    def test_random_polygons_match_brute_force(self):
+        rnd = random.Random(2)
+        for _ in range(60):
+            ovals = []
+            for cx, cy, r in random_disjoint_circles(rnd, 15):
+                k, rot = rnd.choice([12, 20, 40]), rnd.uniform(0, 2 * math.pi)
+                pts = [(cx + r * math.cos(rot + 2 * math.pi * t / k), cy + r * math.sin(rot + 2 * math.pi * t / k))
+                       for t in range(k)]
+                if rnd.random() < 0.5:
+                    pts.reverse()
+                ovals.append(Oval.polygon(pts) if rnd.random() < 0.7 else Oval.circle(cx, cy, 0.99 * r))
+            assert build_forest(ovals) == brute_parents(ovals)
+
+    def test_intersecting_ovals_are_rejected(self):
+        with self.assertRaises(ValueError):
+            Arrangement.from_circles([(0, 0, 1), (1.5, 0, 1)]).build()
+        with self.assertRaises(ValueError):
+            Oval.circle(0, 0, 0)
+
+    def test_json_roundtrip(self):
+        self.arr.add_polygon([(3, 3), (4, 3), (4, 4)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "arr.json")
+            self.arr.save(path)
+            back = Arrangement.load(path)
+        assert back.parent == self.arr.parent == [-1, 0, 1, -1, -1, -1]
+        assert [o.to_json() for o in back.ovals] == [o.to_json() for o in self.arr.ovals]
+
+    def test_large_nests(self):
+        # 20 000 ovales : 4 000 nids de profondeur 5 sur une grille, puis un seul nid
+        circles = [((k % 80) * 3.0, (k // 80) * 3.0, 1.2 - 0.2 * d) for k in range(4000) for d in range(5)]
+        t0 = time.perf_counter()
+        arr = Arrangement.from_circles(circles).build()
+        assert time.perf_counter() - t0 < 10
+        assert arr.complexity() == {"ovals": 20000, "outer": 4000, "empty": 4000, "depth": 5,
+                                    "nested_pairs": 40000}
+        deep = Arrangement.from_circles((0, 0, 1 + 1e-3 * i) for i in range(20000))
+        assert deep.depth() == 20000 and deep.roots == [19999]
+
+
+class TestArrangementDSL(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine()
+        self.binding = bind_arrangement(self.engine, example_arrangement())
+
+    def test_operators(self):
+        ev = self.engine.evaluate_expression
+        assert ev("0 Δ 2") == "nested"
+        assert ev("3 Δ 4") == "separated"
+        assert ev("2 ○ 0") == 3
+        assert ev("2 ⊂ 0") == 1 and ev("0 ⊂ 2") == 0
+        assert ev("0 χ 3") == 4
+
+    def test_swap_arrangement(self):
+        self.binding.arrangement = Arrangement.from_circles([(0, 0, 2), (0, 0, 1)])
+        assert self.engine.evaluate_expression("1 ○ 0") == 2
+        assert self.engine.evaluate_expression("1 Δ 0") == "nested"
+
+    def test_swap_invalidates_cached_results(self):
+        engine = RuleEngine(cache_size=64)
+        binding = bind_arrangement(engine, example_arrangement())
+        engine.load_rules_from_text("DEFINE ◇ WITH a-b")
+        snap = engine.freeze()
+        assert engine.evaluate_expression("2 ○ 0") == 3 and engine.evaluate_expression("3 Δ 4") == "separated"
+        engine.evaluate_expression("3 ◇ 1")
+        binding.arrangement = Arrangement.from_circles([(0, 0, 3), (0, 0, 2), (0, 0, 1), (0, 0, 0.5), (0, 0, 0.2)])
+        assert engine.evaluate_expression("2 ○ 0") == 3 and engine.evaluate_expression("4 ○ 0") == 5
+        assert engine.evaluate_expression("3 Δ 4") == "nested"
+        assert engine.cache_info()["size"] == 4  # ◇ n'appelle pas l'arrangement : gardé
+        assert engine.freeze() is not snap and engine.freeze().version > snap.version
+
+    def test_register_function(self):
+        self.engine.load_rules_from_text("DEFINE ♣ WITH parent_of(a)")
+        assert self.engine.evaluate_expression("2 ♣ 0") == 1
+        with self.assertRaises(EvaluationError):
+            self.engine.register_function("_hidden", len)
+        for shadow in ("math", "int", "abs"):
+            with self.assertRaises(EvaluationError):
+                self.engine.register_function(shadow, len)
+        self.engine.register_function("depth", lambda i=-1: 0)  # redéfinir une fonction enregistrée reste permis
+
+    def test_export_refuses_registered_functions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                self.engine.export_module(os.path.join(tmp, "rules.py"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+
+class _FakeLLM(BaseHTTPRequestHandler):
+    """Faux Ollama/OpenRouter : 429 au premier essai de chaque prompt, puis réponse après 50 ms."""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    seen = set()
+    in_flight = 0
+    max_in_flight = 0
+    connections = set()
+
+    def do_POST(self):
+        cls = type(self)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["prompt"] if "prompt" in body else body["messages"][-1]["content"]
+        with cls.lock:
+            cls.connections.add(self.client_address)
+            first = prompt not in cls.seen
+            cls.seen.add(prompt)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            if first:
+                return self._send(429, {"error": "rate limited"})
+            time.sleep(0.05)
+            content = json.dumps({"dsl": "DEFINE ⊕ WITH a+b", "evals": [prompt], "final": ""})
+            if "prompt" in body:
+                self._send(200, {"response": content})
+            else:
+                self._send(200, {"choices": [{"message": {"content": content}}]})
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipIf(requests is None, "requests requis")
+class TestAsyncProviders(unittest.TestCase):
+    def setUp(self):
+        _FakeLLM.seen = set()
+        _FakeLLM.max_in_flight = 0
+        _FakeLLM.connections = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeLLM)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _collect(self, provider, prompts):
+        async def run():
+            return [item async for item in provider.solve_many(prompts)]
+        return asyncio.run(run())
+
+    def test_ollama_solve_many_bounded_with_retries(self):
+        from providers.async_providers import AsyncOllamaProvider
+        provider = AsyncOllamaProvider(endpoint=self.url + "/api/generate", max_in_flight=4, backoff=0.01)
+        prompts = [f"problème {i}" for i in range(12)]
+        results = self._collect(provider, prompts)
+        provider.close()
+        self.assertEqual(sorted(i for i, _ in results), list(range(12)))
+        for i, res in results:
+            self.assertEqual(res["evals"], [provider._build_prompt(prompts[i])])
+        self.assertLessEqual(_FakeLLM.max_in_flight, 4)
+        self.assertLessEqual(len(_FakeLLM.connections), 4)  # keep-alive : connexions réutilisées
+
+    def test_openrouter_sync_interface(self):
+        from providers.async_providers import AsyncOpenRouterProvider
+        os.environ["OPENROUTER_API_KEY"] = "test"
+        try:
+            provider = AsyncOpenRouterProvider(endpoint=self.url + "/chat", backoff=0.01)
+            self.assertEqual(provider.solve("3 ⊕ 7")["evals"], ["3 ⊕ 7"])
+            provider.close()
+        finally:
+            del os.environ["OPENROUTER_API_KEY"]
+
+    def test_gives_up_after_retries(self):
+        from providers.async_providers import AsyncOllamaProvider
+        provider = AsyncOllamaProvider(endpoint=self.url + "/api/generate", retries=0)
+        results = self._collect(provider, ["jamais vu"])
+        provider.close()
+        self.assertIsInstance(results[0][1], requests.HTTPError)
+
+
+@unittest.skipIf(requests is None, "requests requis")
+class TestDefaultAsolve(unittest.TestCase):
+    def test_blocking_provider_runs_on_the_pool(self):
+        from providers.async_providers import AsyncProviderMixin
+        from providers.mock_provider import MockProvider
+
+        class AsyncMock(AsyncProviderMixin, MockProvider):
+            def __init__(self):
+                MockProvider.__init__(self)
+                self._init_async(max_in_flight=2)
+
+        provider = AsyncMock()
+        async def run():
+            return [item async for item in provider.solve_many(["partie a", "partie b"])]
+        results = dict(asyncio.run(run()))
+        self.assertEqual(results[0], MockProvider().solve("partie a"))
+        self.assertEqual(provider.solve("partie b"), results[1])
+        provider.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from rule_engine import RuleEngine, EvaluationError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy requis pour evaluate_batch vectorisé")
+class TestEvaluateBatch(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine()
+        dsl = (
+            "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+            "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+            "DEFINE ◇ WITH a-b\n"
+            "DEFINE τ WITH 1 if (a-b) >= 2 else 0\n"
+            "DEFINE ♠ WITH math.floor((a+1)/3)\n"
+            "DEFINE ○ WITH 1\n"
+            "DEFINE Δ WITH 'nested' if a<b else 'separated'\n"
+        )
+        self.engine.load_rules_from_text(dsl)
+
+    def test_matches_scalar_path(self):
+        a = np.arange(1, 40, dtype=float)
+        b = a[::-1].copy()
+        for op in ["⊕", "⊗", "◇", "τ", "♠", "○", "Δ"]:
+            res = self.engine.evaluate_batch(op, a, b)
+            expected = [self.engine.evaluate_expression(f"{x:g} {op} {y:g}") for x, y in zip(a, b)]
+            self.assertEqual(res.tolist(), expected, op)
+
+    def test_scalar_broadcast_and_aliases(self):
+        res = self.engine.evaluate_batch("opO", [6, 8], 0)
+        self.assertEqual(res.tolist(), [11, 22])
+        self.assertEqual(self.engine.evaluate_batch("diO", [2, 3], [3, 2]).tolist(), ["nested", "separated"])
+
+    def test_fallback_per_element(self):
+        self.engine.load_rules_from_text(
+            "DEFINE χ WITH math.factorial(int(a))\n"
+            "DEFINE ⊂ WITH 1/a if a != 0 else 0\n"
+        )
+        self.assertEqual(self.engine.evaluate_batch("χ", [3, 4], 0).tolist(), [6, 24])
+        self.assertEqual(self.engine.evaluate_batch("⊂", [0, 4], 0).tolist(), [0, 0.25])
+
+    def test_bool_ops_return_operands(self):
+        self.engine.load_rules_from_text(
+            "DEFINE χ WITH a or b\n"
+            "DEFINE ⊂ WITH a and b\n"
+            "DEFINE ○ WITH (a > 2 and a - b) or b * 2\n"
+        )
+        a, b = [3, 0, 4, 0], [5, 5, 4, 0]
+        for op in ["χ", "⊂", "○"]:
+            expected = [self.engine.evaluate_expression(f"{x} {op} {y}") for x, y in zip(a, b)]
+            self.assertEqual(self.engine.evaluate_batch(op, a, b).tolist(), expected, op)
+
+    def test_fallback_keeps_mixed_types(self):
+        self.engine.load_rules_from_text("DEFINE χ WITH 1 if a>b else str(a)")
+        res = self.engine.evaluate_batch("χ", [2, 0], [1, 1])
+        self.assertEqual(res.tolist(), [1, "0.0"])
+        self.assertEqual(res.dtype, object)
+        self.engine.load_rules_from_text('DEFINE χ WITH 1 if a>b else "x"')
+        self.assertEqual(self.engine.evaluate_batch("χ", [2, 0], [1, 1]).tolist(), [1, "x"])
+
+    def test_select_orientation(self):
+        self.engine.load_rules_from_text("SELECT ⊕ WITH { a+b ; a*b } USING ORIENTATION -")
+        self.assertEqual(self.engine.evaluate_batch("⊕", [2, 3], [5, 5]).tolist(), [10, 15])
+
+    def test_undefined_op(self):
+        with self.assertRaises(EvaluationError):
+            self.engine.evaluate_batch("χ", [1], [1])
+
+if __name__ == "__main__":
+    unittest.main()
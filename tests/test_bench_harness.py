@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import harness
+
+
+def _res(mean, half):
+    return {"mean": mean, "ci_low": mean - half, "ci_high": mean + half}
+
+
+class TestBenchHarness(unittest.TestCase):
+    def test_summarize_interval_contains_mean(self):
+        s = harness.summarize([1.0, 1.1, 0.9, 1.0])
+        assert s["n"] == 4
+        assert s["ci_low"] < s["mean"] < s["ci_high"]
+        assert abs(s["mean"] - 1.0) < 1e-12
+
+    def test_compare_needs_disjoint_intervals(self):
+        base = {"x": _res(1.0, 0.01), "y": _res(1.0, 0.01), "z": _res(1.0, 0.5), "w": _res(1.0, 0.01)}
+        cur = {"x": _res(1.5, 0.01), "y": _res(0.5, 0.01), "z": _res(1.5, 0.5), "new": _res(1.0, 0.0)}
+        verdicts = {name: v for name, _, v in harness.compare(cur, base)}
+        assert verdicts == {"x": "REGRESSION", "y": "improvement", "z": "same"}
+
+    def test_measure_reports_per_call_time(self):
+        res = harness.measure(lambda: None, repeat=3, min_time=0.001)
+        assert res["n"] == 3 and res["number"] >= 1
+        assert 0 <= res["mean"] < 0.001
@@ -0,0 +1,59 @@
+import unittest
+from rule_engine import RuleEngine
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine(cache_size=4)
+        self.engine.load_rules_from_text(
+            "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+            "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+        )
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.engine.evaluate_expression("6 ⊕ 6"), 11)
+        self.assertEqual(self.engine.evaluate_expression("6 opO 6"), 11)   # même clé canonique
+        self.assertEqual(self.engine.evaluate_expression("6.0 +O 6"), 11)
+        info = self.engine.cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (2, 1, 1))
+
+    def test_bounded_lru(self):
+        for n in range(10):
+            self.engine.evaluate_expression(f"{n} ⊕ 0")
+        self.assertEqual(self.engine.cache_info()["size"], 4)
+        self.engine.evaluate_expression("9 ⊕ 0")
+        self.assertEqual(self.engine.cache_hits, 1)
+        self.engine.evaluate_expression("0 ⊕ 0")
+        self.assertEqual(self.engine.cache_hits, 1)
+
+    def test_invalidation_is_per_operator(self):
+        self.engine.evaluate_expression("6 ⊕ 6")
+        self.engine.evaluate_expression("11 ⊗ 10")
+        self.engine.load_rules_from_text("REPLACE ⊕ WITH a+b")
+        self.assertEqual(self.engine.cache_info()["size"], 1)
+        self.assertEqual(self.engine.evaluate_expression("6 ⊕ 6"), 12)
+        self.assertEqual(self.engine.evaluate_expression("11 ⊗ 10"), 1)
+        self.assertEqual(self.engine.cache_hits, 1)
+
+    def test_disable_and_select_invalidate(self):
+        self.engine.evaluate_expression("2 ⊗ 3")
+        self.engine.load_rules_from_text("DISABLE ⊗")
+        with self.assertRaises(Exception):
+            self.engine.evaluate_expression("2 ⊗ 3")
+        self.engine.load_rules_from_text("ENABLE ⊗\nSELECT ⊗ WITH { a*b ; a-b } USING ORIENTATION -")
+        self.assertEqual(self.engine.evaluate_expression("2 ⊗ 3"), -1)
+
+    def test_orientation_in_key(self):
+        self.engine.evaluate_expression("6 ⊕ 6")
+        self.engine.orientation = "-"
+        self.engine.evaluate_expression("6 ⊕ 6")
+        self.assertEqual(self.engine.cache_misses, 2)
+
+    def test_disabled_by_default(self):
+        engine = RuleEngine()
+        engine.load_rules_from_text("DEFINE ⊕ WITH a+b")
+        engine.evaluate_expression("1 ⊕ 2")
+        self.assertEqual(engine.cache_info()["size"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from rule_engine import RuleEngine, EvaluationError
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+    "DEFINE ♠ WITH math.floor((a+1)/3)\n"
+    "SELECT Δ WITH { 'nested' if a<b else 'separated' ; a*b } USING ORIENTATION +\n"
+    "DEFINE χ WITH a+b\n"
+    "DISABLE χ\n"
+)
+
+
+class TestExportModule(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rules_gen.py")
+        self.engine = RuleEngine()
+        self.engine.load_rules_from_text(DSL)
+        self.engine.export_module(self.path, source_text=DSL)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_generated_module_matches_engine(self):
+        loaded = RuleEngine()
+        self.assertEqual(loaded.load_module(self.path), {"⊕", "⊗", "♠", "Δ"})
+        for expr in ["6 ⊕ 0", "8 opO 0", "8 OPLUS 0", "11 otO 12", "22 buO 0", "2 diO 3", "3 Δ 2"]:
+            self.assertEqual(loaded.evaluate_expression(expr), self.engine.evaluate_expression(expr), expr)
+        with self.assertRaises(EvaluationError):
+            loaded.evaluate_expression("1 χ 2")
+
+    def test_standalone_module(self):
+        out = subprocess.run(
+            [sys.executable, "-c", "import rules_gen as r; print(r.evaluate_expression('2 dO 3'), r.DISABLED)"],
+            cwd=self.tmp.name, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(out.strip(), "nested {'χ'}")
+
+    def test_cli_compile(self):
+        dsl_path = os.path.join(self.tmp.name, "dsl.txt")
+        out_path = os.path.join(self.tmp.name, "cli_gen.py")
+        with open(dsl_path, "w", encoding="utf-8") as f:
+            f.write(DSL.replace("ORIENTATION +", "ORIENTATION -"))
+        subprocess.run([sys.executable, os.path.join(ROOT, "rule_engine.py"), "compile", dsl_path, "-o", out_path],
+                       check=True, capture_output=True)
+        engine = RuleEngine()
+        engine.load_module(out_path)
+        self.assertEqual(engine.evaluate_expression("2 Δ 3"), 6)
+
+if __name__ == "__main__":
+    unittest.main()
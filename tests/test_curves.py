@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from law_compiler import load_numpy
+from rule_engine import RuleEngine
+
+np = load_numpy()
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+QUARTIC = "(x**2 + 4*y**2 - 1)*(4*x**2 + y**2 - 1) + 0.05"  # M-quartique : 4 ovales
+
+
+class TestPolynomial(unittest.TestCase):
+    def test_parse(self):
+        from hilbertB.curves import Polynomial
+        p = Polynomial.parse("(x - 1)^2 + 2*x*y - y**3/2")
+        assert p.coeffs == {(2, 0): 1.0, (1, 0): -2.0, (0, 0): 1.0, (1, 1): 2.0, (0, 3): -0.5}
+        assert p.degree == 3
+        assert p(1.0, 2.0) == 0.0
+        assert str(Polynomial.parse("x**2 + y**2 - 1")) == "x**2 + y**2 - 1"
+        for bad in ("x**y", "sin(x)", "x/y", "0*x", "x +"):
+            with self.assertRaises(ValueError):
+                Polynomial.parse(bad)
+
+
+@unittest.skipIf(np is None, "numpy requis")
+class TestExtractOvals(unittest.TestCase):
+    def test_sample_matches_direct_evaluation(self):
+        from hilbertB.curves import Polynomial, sample
+        p = Polynomial.parse(QUARTIC)
+        xs, ys = np.linspace(-2, 2, 7), np.linspace(-1, 3, 5)
+        assert np.allclose(sample(p.matrix(), xs, ys), p(xs[None, :], ys[:, None]))
+
+    def test_circle(self):
+        from hilbertB.curves import extract_ovals
+        res = extract_ovals("x**2 + y**2 - 1", res=200)
+        assert res.count == 1 and not res.branches and res.within_harnack
+        assert abs(res.arrangement.ovals[0].area() - np.pi) < 1e-3
+
+    def test_m_quartic_and_nests(self):
+        from hilbertB.curves import extract_ovals
+        res = extract_ovals(QUARTIC, res=400)
+        assert res.count == 4 == res.bound
+        assert res.arrangement.scheme() == "4"
+        res = extract_ovals("(x**2 + y**2 - 1)*(x**2 + y**2 - 4) + 0.01", box=(-3, 3, -3, 3), res=300)
+        assert res.arrangement.scheme() == "1<1>"
+        assert res.as_dict()["depth"] == 2
+
+    def test_tiles_and_workers_give_same_ovals(self):
+        from hilbertB.curves import extract_ovals
+        whole = extract_ovals(QUARTIC, res=300, tile=1000)
+        tiled = extract_ovals(QUARTIC, res=300, tile=37, workers=2)
+        shapes = lambda r: sorted((round(o.area(), 9), len(o.data)) for o in r.arrangement.ovals)
+        assert shapes(whole) == shapes(tiled)
+
+    def test_open_branches_and_harnack(self):
+        from hilbertB.curves import extract_ovals
+        res = extract_ovals("y - x**3", res=100)
+        assert res.count == 0 and len(res.branches) == 1
+        engine = RuleEngine()
+        engine.load_rules_from_text("DEFINE ⊕ WITH 0")  # borne volontairement fausse
+        assert not extract_ovals("x**2 + y**2 - 1", res=50, engine=engine).within_harnack
+
+    def test_cli(self):
+        out = subprocess.run([sys.executable, "app.py", "curve", QUARTIC, "--res", "200", "--workers", "1"],
+                             cwd=ROOT, capture_output=True, text=True, timeout=60)
+        assert out.returncode == 0, out.stderr
+        assert "4 ovale(s)" in out.stdout and "H(4) = 4 : OK" in out.stdout
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import unittest
+
+from rule_engine import RuleEngine
+from dsl_stream import StreamingSession
+from providers.mock_provider import MockProvider
+from providers.stream_utils import iter_ndjson_text, iter_sse_text
+
+
+def chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamingSession(unittest.TestCase):
+    def setUp(self):
+        self.payload = MockProvider().solve("Harnack partie A")
+
+    def _run(self, text, **kw):
+        session = StreamingSession(RuleEngine())
+        timeline = []
+        for i, chunk in enumerate(chunks(text, **kw)):
+            for event in session.feed(chunk):
+                timeline.append((i, event))
+        payload = session.finish()
+        return session, timeline, payload
+
+    def test_json_stream_loads_rules_before_end(self):
+        for ascii_only in (False, True):
+            text = json.dumps(self.payload, ensure_ascii=ascii_only)
+            session, timeline, _ = self._run(text)
+            n_chunks = len(chunks(text))
+            rules = [i for i, e in timeline if e[0] == "rule"]
+            evals = [(i, e) for i, e in timeline if e[0] == "eval"]
+            self.assertEqual(len(rules), 5)
+            self.assertLess(rules[0], n_chunks // 3)          # bien avant la fin du flux
+            self.assertEqual(len(evals), 8)
+            self.assertLess(evals[0][0], n_chunks - 1)
+            self.assertEqual(dict((e[1], e[2]) for _, e in evals)["22 buO 0"], 7)
+
+    def test_raw_dsl_stream(self):
+        text = "```\nDEFINE ⊕ WITH a+b\nDEFINE ⊗ WITH a*b\n```"
+        session, timeline, payload = self._run(text, size=3)
+        self.assertEqual(session.rules, ["DEFINE ⊕ WITH a+b", "DEFINE ⊗ WITH a*b"])
+        self.assertEqual(timeline[0][1], ("rule", "DEFINE ⊕ WITH a+b"))
+        self.assertEqual(payload["dsl"], "DEFINE ⊕ WITH a+b\nDEFINE ⊗ WITH a*b")
+
+    def test_eval_waits_for_its_operator(self):
+        session = StreamingSession(RuleEngine())
+        session.feed('{"evals": ["3 ⊗ 4", "3 ⊕ 4"], "dsl": "DEFINE ⊕ WITH a+b\\n')
+        self.assertEqual(session.results, [("3 ⊕ 4", 7, None)])
+        session.feed('DEFINE ⊗ WITH a*b"}')
+        self.assertEqual(session.results[-1], ("3 ⊗ 4", 12, None))
+
+    def test_split_escapes_and_surrogates(self):
+        payload = {"dsl": "DEFINE Δ WITH '😀\\n' if a<b else 'é'\nDEFINE ⊕ WITH a+b", "evals": ["1 Δ 2", "2 ⊕ 2"]}
+        text = json.dumps(payload, ensure_ascii=True)
+        session, timeline, _ = self._run(text, size=1)
+        self.assertEqual(session.rules, payload["dsl"].split("\n"))
+        self.assertEqual(session.results, [("1 Δ 2", "😀\n", None), ("2 ⊕ 2", 4, None)])
+        self.assertEqual(session.text, text)
+
+    def test_malformed_directive_is_an_event(self):
+        session = StreamingSession(RuleEngine())
+        events = session.feed('{"dsl": "DEFINE ⊕ a+b\\nDEFINE ⊗ WITH a*b\\n", "evals": ["2 ⊗ 3"]}')
+        self.assertEqual(events[0][:2], ("error", "DEFINE ⊕ a+b"))
+        self.assertEqual(events[1:], [("rule", "DEFINE ⊗ WITH a*b"), ("eval", "2 ⊗ 3", 6, None)])
+        payload = session.finish(lambda answer: answer)
+        self.assertEqual((session.rules, len(session.errors)), (["DEFINE ⊗ WITH a*b"], 1))
+        self.assertEqual(payload["evals"], ["2 ⊗ 3"])
+
+    def test_finish_reports_undefined(self):
+        session = StreamingSession(RuleEngine())
+        session.feed('{"dsl": "DEFINE ⊕ WITH a+b", "evals": ["1 χ 2"]}')
+        session.finish()
+        self.assertEqual(session.results[0][0], "1 χ 2")
+        self.assertIsNotNone(session.results[0][2])
+
+
+class TestStreamParsers(unittest.TestCase):
+    def test_ndjson(self):
+        lines = [json.dumps({"response": "DEF", "done": False}), "",
+                 json.dumps({"response": "INE", "done": True}), json.dumps({"response": "x"})]
+        self.assertEqual("".join(iter_ndjson_text(lines)), "DEFINE")
+
+    def test_sse(self):
+        lines = [": OPENROUTER PROCESSING", "",
+                 "data: " + json.dumps({"choices": [{"delta": {"content": "DEF"}}]}),
+                 "data: " + json.dumps({"choices": [{"delta": {"role": "assistant"}}]}),
+                 "data: " + json.dumps({"choices": [{"delta": {"content": "INE"}}]}),
+                 "data: [DONE]", "data: " + json.dumps({"choices": [{"delta": {"content": "x"}}]})]
+        self.assertEqual("".join(iter_sse_text(lines)), "DEFINE")
+
+if __name__ == "__main__":
+    unittest.main()
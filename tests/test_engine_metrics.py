@@ -0,0 +1,83 @@
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import os
+import unittest
+
+from rule_engine import RuleEngine
+from engine_metrics import format_stats
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ◇ WITH a/b\n"
+    "SELECT χ WITH { a+b ; a-b } USING ORIENTATION -\n"
+)
+
+
+class TestEngineMetrics(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine(metrics=True)
+        self.engine.load_rules_from_text(DSL)
+        self.engine.reset_stats()
+
+    def test_counts_latency_errors_and_branches(self):
+        e = self.engine
+        for _ in range(3):
+            e.evaluate_expression("6 ⊕ 6")
+        with self.assertRaises(ZeroDivisionError):
+            e.evaluate_expression("1 ◇ 0")
+        e.evaluate_expression("2 ◇ 1")
+        e.evaluate_expression("5 χ 2")
+        st = e.stats()
+        assert st["enabled"]
+        assert st["ops"]["⊕"]["calls"] == 3 and st["ops"]["⊕"]["errors"] == 0
+        assert sum(st["ops"]["⊕"]["histogram_ns"].values()) == 3
+        assert st["ops"]["◇"]["errors"] == 1 and st["ops"]["◇"]["error_rate"] == 0.5
+        assert st["ops"]["χ"]["select_branches"] == {"-": 1}
+        assert st["ops"]["⊕"]["mean_us"] > 0
+
+    def test_alias_paths_and_legacy_counter_without_print(self):
+        e = self.engine
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            e.evaluate_expression("6 ⊕ 6")
+            e.evaluate_expression("6 OPO 6")
+            e.evaluate_expression("6 cO 6")
+            e.evaluate_expression("6 cO 6")
+        assert out.getvalue() == ""
+        st = e.stats()
+        assert st["alias_paths"]["direct"] == 1 and st["alias_paths"]["lower"] == 1
+        assert st["alias_paths"]["legacy"] == 2
+        assert st["legacy_aliases"] == {"cO": 2}
+        assert "cO×2" in format_stats(st)
+
+    def test_disabled_by_default(self):
+        e = RuleEngine()
+        e.load_rules_from_text(DSL)
+        e.evaluate_expression("6 ⊕ 6")
+        e.evaluate_expression("6 cO 6")
+        st = e.stats()
+        assert not st["enabled"] and st["ops"] == {}
+        assert st["legacy_aliases"] == {"cO": 1}
+
+    def test_batch_and_compound_are_recorded(self):
+        e = self.engine
+        e.compile_expression("(n ⊕ n) ◇ 2").evaluate({"n": 5})
+        e.evaluate_batch("⊕", [3, 4, 5], 0)
+        st = e.stats()["ops"]
+        assert st["⊕"]["calls"] == 4 and st["◇"]["calls"] == 1
+
+    def test_solver_cli_stats_json(self):
+        out = subprocess.run([sys.executable, "solver_cli.py", "6 ⊕ 6", "--stats", "-"],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        assert out.startswith("6 ⊕ 6 => 11.0")
+        stats = json.loads(out.split("\n", 1)[1])
+        assert stats["ops"]["⊕"]["calls"] == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from engine_pool import EnginePool, canonical_dsl, dsl_digest
+from rule_engine import RuleEngine, EvaluationError
+
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+    "SELECT χ WITH { a+b ; a-b } USING ORIENTATION -\n"
+)
+
+SAME = (
+    "# même jeu de règles, autre tenant\n"
+    "define +O with ((a - 1) * (a - 2)) / 2 + 1\n"
+    "\n"
+    "  DEFINE otimes WITH 1 if b <= a else 0\n"
+    "SELECT cO WITH {a + b;a - b} USING ORIENTATION -\n"
+)
+
+
+class CountingEngine(RuleEngine):
+    loads = 0
+
+    def load_rules_from_text(self, text):
+        CountingEngine.loads += 1
+        return super().load_rules_from_text(text)
+
+
+class TestCanonicalDSL(unittest.TestCase):
+    def test_equivalent_blocks(self):
+        assert canonical_dsl(SAME) == canonical_dsl(DSL)
+        assert canonical_dsl(DSL).splitlines()[0] == "DEFINE ⊕ WITH (a - 1) * (a - 2) / 2 + 1"
+        assert dsl_digest(SAME) == dsl_digest(DSL)
+        assert dsl_digest(DSL) != dsl_digest(DSL.replace("a-b", "b-a"))
+        # l'ordre compte : la dernière définition l'emporte
+        assert dsl_digest("DEFINE ⊕ WITH a\nDEFINE ⊕ WITH b") != dsl_digest("DEFINE ⊕ WITH b\nDEFINE ⊕ WITH a")
+
+    def test_malformed(self):
+        with self.assertRaises(EvaluationError):
+            canonical_dsl("DEFINE ⊕ a+b")
+
+
+class TestEnginePool(unittest.TestCase):
+    def setUp(self):
+        CountingEngine.loads = 0
+        self.pool = EnginePool(engine_factory=CountingEngine)
+
+    def test_shared_by_canonical_hash(self):
+        e1 = self.pool.get(DSL)
+        assert self.pool.get(DSL) is e1
+        assert self.pool.get(SAME) is e1
+        assert self.pool.get(SAME) is e1
+        assert self.pool.get(DSL, "-") is not e1  # l'orientation fait partie de la clé
+        assert CountingEngine.loads == 2
+        st = self.pool.stats()
+        assert (st["hits"], st["canonical_hits"], st["misses"]) == (3, 1, 2)
+        assert st["hit_rate"] == 3 / 5
+        assert e1.evaluate_expression("6 ⊕ 6") == 11 and self.pool.freeze(SAME).evaluate("χ", 5, 2) == 3
+
+    def test_lru_by_count_and_bytes(self):
+        pool = EnginePool(max_engines=3)
+        blocks = [f"DEFINE ⊕ WITH a+{k}" for k in range(5)]
+        engines = [pool.get(b) for b in blocks]
+        assert len(pool) == 3 and pool.stats()["evictions"] == 2
+        assert pool.get(blocks[4]) is engines[4]
+        assert pool.get(blocks[0]) is not engines[0]
+
+        small = EnginePool(max_bytes=1)  # garde toujours le dernier moteur
+        small.get(blocks[0])
+        small.get(blocks[1])
+        assert len(small) == 1 and small.stats()["evictions"] == 1
+
+    def test_threads(self):
+        with ThreadPoolExecutor(8) as ex:
+            engines = list(ex.map(lambda k: self.pool.get(SAME if k % 2 else DSL), range(64)))
+        assert len({id(e) for e in engines}) == 1
+        assert self.pool.stats()["hits"] + self.pool.stats()["misses"] == 64
+
+
+if __name__ == "__main__":
+    unittest.main()
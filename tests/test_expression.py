@@ -0,0 +1,52 @@
+import unittest
+from rule_engine import RuleEngine, EvaluationError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestCompiledExpression(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine()
+        self.engine.load_rules_from_text(
+            "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+            "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+            "DEFINE ◇ WITH a-b\n"
+            "DEFINE τ WITH 1 if (a-b) >= 2 else 0\n"
+        )
+
+    def test_nested_with_variables(self):
+        f = self.engine.compile_expression("((n ⊕ n) ◇ k) τ 0")
+        self.assertEqual(f.variables, ("n", "k"))
+        self.assertEqual(f(n=8, k=20), 1)   # H(8)=22, marge 2
+        self.assertEqual(f(n=8, k=21), 0)
+        self.assertEqual(f.evaluate_many([{"n": 6, "k": 9}, {"n": 6, "k": 10}]), [1, 0])
+
+    def test_aliases_and_left_associativity(self):
+        f = self.engine.compile_expression("n opO n maO k")
+        self.assertEqual(f(n=6, k=10), 1)
+        self.assertEqual(self.engine.evaluate_expression("(6 ⊕ 6) ⊗ 10"), 1)
+
+    def test_reload_is_seen_without_recompiling(self):
+        f = self.engine.compile_expression("(n ⊕ 0) ◇ 1")
+        self.assertEqual(f(n=6), 10)
+        self.engine.load_rules_from_text("REPLACE ◇ WITH a+b")
+        self.assertEqual(f(n=6), 12)
+
+    def test_errors(self):
+        for bad in ["(6 ⊕ 6", "6 ⊕ ⊕ 6", "6 ⊕ 6)", "6 6 ⊕ 6", "()"]:
+            with self.assertRaises(EvaluationError, msg=bad):
+                self.engine.compile_expression(bad)
+        with self.assertRaises(EvaluationError):
+            self.engine.compile_expression("n ⊕ k")(n=1)
+
+    @unittest.skipIf(np is None, "numpy requis")
+    def test_batch_bindings(self):
+        f = self.engine.compile_expression("((n ⊕ n) ◇ k) τ 0")
+        res = f.evaluate_batch(n=np.array([6, 8, 8]), k=np.array([9, 20, 21]))
+        self.assertEqual(res.tolist(), [1, 1, 0])
+
+if __name__ == "__main__":
+    unittest.main()
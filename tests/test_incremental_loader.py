@@ -0,0 +1,57 @@
+import unittest
+from rule_engine import RuleEngine, EvaluationError
+
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+    "# commentaire\n"
+    "DEFINE ◇ WITH a-b\n"
+)
+
+
+class TestIncrementalLoader(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine(cache_size=16)
+        self.compiled = []
+        compile_law = self.engine._compile_law
+        def counting(expr):
+            self.compiled.append(expr)
+            return compile_law(expr)
+        self.engine._compile_law = counting
+
+    def test_reports_changed_operators(self):
+        self.assertEqual(self.engine.load_rules_from_text(DSL), {"⊕", "⊗", "◇"})
+        self.assertEqual(self.engine.load_rules_from_text(DSL), set())
+        changed = self.engine.load_rules_from_text(DSL.replace("a-b", "b-a") + "DISABLE ⊗\n")
+        self.assertEqual(changed, {"◇", "⊗"})
+        self.assertEqual(self.engine.load_rules_from_text("DELETE ⊕\nDELETE ⊕"), {"⊕"})
+
+    def test_laws_compiled_once(self):
+        self.engine.load_rules_from_text(DSL)
+        self.engine.load_rules_from_text(DSL + "REPLACE ◇ WITH a-b\n")
+        self.engine.load_rules_from_text("SELECT ⊕ WITH { a-b ; ((a-1)*(a-2))/2 + 1 } USING ORIENTATION -")
+        self.assertEqual(sorted(self.compiled), sorted(["((a-1)*(a-2))/2 + 1", "1 if b<=a else 0", "a-b"]))
+        self.assertEqual(self.engine.evaluate_expression("6 ⊕ 0"), 11)
+
+    def test_only_changed_operators_invalidated(self):
+        self.engine.load_rules_from_text(DSL)
+        self.engine.evaluate_expression("6 ⊕ 6")
+        self.engine.evaluate_expression("3 ◇ 1")
+        self.engine.load_rules_from_text(DSL.replace("a-b", "a-2*b"))
+        self.assertEqual(self.engine.cache_info()["size"], 1)
+        self.assertEqual(self.engine.evaluate_expression("3 ◇ 1"), 1)
+
+    def test_errors_unchanged(self):
+        with self.assertRaises(EvaluationError):
+            self.engine.load_rules_from_text("DEFINE ⊕ a+b")
+        with self.assertRaises(EvaluationError):
+            self.engine.load_rules_from_text("REPLACE χ WITH a")
+        with self.assertRaises(EvaluationError):
+            self.engine.load_rules_from_text("SELECT ⊕ WITH a ; b")
+
+    def test_case_insensitive_directives(self):
+        self.assertEqual(self.engine.load_rules_from_text("define ⊕ with a+b\nDisable ⊕"), {"⊕"})
+        self.assertFalse(self.engine.ops["⊕"]["enabled"])
+
+if __name__ == "__main__":
+    unittest.main()
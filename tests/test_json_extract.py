@@ -0,0 +1,46 @@
+import json
+import unittest
+
+from app import sanitize_payload
+from json_extract import JsonObjectScanner, extract_json_object, extract_json_text
+
+ANSWER = {"dsl": "DEFINE ⊕ WITH a+b", "evals": ["1 ⊕ 2"], "final": "ok {fin}"}
+
+
+class TestJsonExtract(unittest.TestCase):
+    def test_prefers_payload_object_over_earlier_examples(self):
+        text = ('Exemple : {"x": 1} puis {"dsl": "brouillon"} et {a, b}.\n'
+                "```json\n" + json.dumps(ANSWER, ensure_ascii=False) + "\n```\nFin {\"y\": 2}")
+        assert extract_json_object(text) == ANSWER
+
+    def test_braces_and_quotes_inside_strings(self):
+        obj = {"dsl": 'DEFINE ◇ WITH "}" if a else "{\\""', "evals": [], "final": "\\"}
+        text = "bla " + json.dumps(obj) + " bla"
+        assert extract_json_object(text) == obj
+        assert json.loads(extract_json_text(text)) == obj
+
+    def test_chunked_feed_matches_one_shot(self):
+        text = "Voici {n} ovales {\"a\": \"x\\\\\"} " + json.dumps(ANSWER, ensure_ascii=False) + " merci"
+        for size in (1, 2, 3, 7):
+            scanner = JsonObjectScanner()
+            for i in range(0, len(text), size):
+                scanner.feed(text[i:i + size])
+            assert scanner.close() == ANSWER, size
+
+    def test_unbalanced_prose_brace_before_answer(self):
+        text = 'on note {"la borne de Harnack... puis ' + json.dumps(ANSWER)
+        assert extract_json_object(text) == ANSWER
+
+    def test_no_object(self):
+        assert extract_json_object("pas de JSON ici {a, b}") is None
+        assert extract_json_text("rien") is None
+
+    def test_sanitize_payload_noisy_text(self):
+        text = "Je réfléchis {longtemps}...\n" * 1000 + "```json\n" + json.dumps(ANSWER) + "\n```"
+        assert sanitize_payload(text)["evals"] == ["1 ⊕ 2"]
+        with self.assertRaises(ValueError):
+            sanitize_payload("aucune réponse")
+
+
+if __name__ == "__main__":
+    unittest.main()
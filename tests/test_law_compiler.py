@@ -0,0 +1,54 @@
+import ast
+import math
+import unittest
+from rule_engine import RuleEngine, EvaluationError
+from law_compiler import compile_law, parse_law, LawError
+
+
+class TestLawCompiler(unittest.TestCase):
+    def setUp(self):
+        self.law_globals = RuleEngine()._law_globals
+
+    def test_native_function(self):
+        fn = compile_law("((a-1)*(a-2))/2 + 1", self.law_globals)
+        self.assertEqual(fn.__name__, "<lambda>")
+        self.assertEqual(fn(6.0, 0.0), 11)
+        self.assertEqual(fn.expr, "((a-1)*(a-2))/2 + 1")
+
+    def test_constant_folding(self):
+        tree = parse_law("a * (2**3 - 1) + math.floor(7/2) + math.pi", self.law_globals)
+        consts = [n for n in ast.walk(tree) if isinstance(n, ast.Constant)]
+        self.assertEqual(sorted(c.value for c in consts), sorted([7, 3, math.pi]))
+
+    def test_no_fold_on_error_or_huge_power(self):
+        fn = compile_law("1/0 if a > 0 else b", self.law_globals)
+        self.assertEqual(fn(0.0, 5.0), 5.0)
+        with self.assertRaises(ZeroDivisionError):
+            fn(1.0, 0.0)
+        parse_law("pow(a, 10**9) if a < 0 else 2**100000", self.law_globals)  # ne plie pas
+
+    def test_nested_power_folding_is_bounded(self):
+        tree = parse_law("(((9**64)**64)**64)**64 + a", self.law_globals)  # instantané
+        consts = [n.value for n in ast.walk(tree) if isinstance(n, ast.Constant)]
+        self.assertEqual(sorted(consts), [64, 64, 64, 9**64])
+        tree = parse_law("(3**2000) * (3**2000) + a", self.law_globals)
+        self.assertEqual(len([n for n in ast.walk(tree) if isinstance(n, ast.Constant)]), 2)
+        RuleEngine().load_rules_from_text("DEFINE ⊕ WITH (((9**64)**64)**64)**64 + a")
+
+    def test_math_bound_directly(self):
+        fn = compile_law("math.floor((a+1)/3)", self.law_globals)
+        self.assertIs(fn.__globals__["_math_floor"], math.floor)
+        self.assertEqual(fn(22.0, 0.0), 7)
+
+    def test_rejects_unknown_names(self):
+        for bad in ["__import__('os')", "open('x')", "c + 1", "math.__dict__", "a.__class__",
+                    "[x for x in range(3)]", "(lambda: 1)()"]:
+            with self.assertRaises(LawError, msg=bad):
+                compile_law(bad, self.law_globals)
+
+    def test_engine_reports_bad_law(self):
+        with self.assertRaises(EvaluationError):
+            RuleEngine().load_rules_from_text("DEFINE ⊕ WITH os.system('x')")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from law_compiler import load_numpy
+from rule_engine import RuleEngine
+
+np = load_numpy()
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@unittest.skipIf(np is None, "numpy requis")
+class TestPatchwork(unittest.TestCase):
+    def test_triangulation_covers_the_triangle(self):
+        from hilbertB.patchwork import square_count, triangles
+        rng = np.random.default_rng(0)
+        for n in (1, 2, 5, 8):
+            tris = triangles(n, rng.random(square_count(n)) < 0.5)
+            assert len(tris) == n * n
+            edges = tris[:, [1, 2], :] - tris[:, [0, 0], :]
+            area2 = edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0]
+            assert (np.abs(area2) == 1).all()  # triangles primitifs, aire totale n²/2
+        with self.assertRaises(ValueError):
+            triangles(4, [True])
+
+    def test_harnack_distribution_gives_m_curves(self):
+        from hilbertB.patchwork import patchwork, square_count
+        rng = np.random.default_rng(1)
+        for n in range(1, 10):
+            for _ in range(3):
+                curve = patchwork(n, rng.random(square_count(n)) < 0.5, "harnack")
+                assert curve.components == curve.bound == (n - 1) * (n - 2) / 2 + 1
+                assert curve.is_m_curve and curve.pseudo_lines == n % 2
+
+    def test_arrangement_feeds_the_operators(self):
+        from hilbertB.arrangement import bind_arrangement
+        from hilbertB.patchwork import patchwork
+        curve = patchwork(6, signs="harnack")
+        info = curve.as_dict()
+        # ⟨9 ⊔ 1⟨1⟩⟩ : le nid passe par l'ovale coupé par la droite à l'infini
+        assert info["affine_ovals"] == 10 and info["ovals_at_infinity"] == 1
+        assert info["scheme"] == "9 ⊔ 1<1>" and len(curve.arrangement) == 11
+        arr = curve.arrangement
+        outer = next(i for i in range(11) if arr.children(i))
+        inner = arr.children(outer)[0]
+        engine = RuleEngine()
+        bind_arrangement(engine, arr)
+        assert engine.evaluate_expression(f"{inner} ○ 0") == 2
+        assert engine.evaluate_expression(f"{inner} Δ {outer}") == "nested"
+        assert engine.evaluate_expression(f"{outer} χ {outer}") == 4
+
+    def test_harnack_schemes_in_rp2(self):
+        from hilbertB.patchwork import patchwork, square_count
+        rng = np.random.default_rng(2)
+        expected = {4: "4", 5: "J ⊔ 6", 6: "9 ⊔ 1<1>", 7: "J ⊔ 15", 8: "18 ⊔ 1<3>", 10: "30 ⊔ 1<6>"}
+        for n, scheme in expected.items():
+            for _ in range(3):
+                assert patchwork(n, rng.random(square_count(n)) < 0.5, "harnack", bound=0).as_dict()["scheme"] == scheme
+
+    def test_chart_geometry_matches_the_nesting(self):
+        from hilbertB.arrangement import Arrangement
+        from hilbertB.patchwork import patchwork, square_count
+        rng = np.random.default_rng(4)
+        crossing = 0
+        for n in (4, 5, 6, 7, 9, 12):
+            for seed in range(12):
+                curve = patchwork(n, rng.random(square_count(n)) < 0.5, "random", seed=seed, bound=0)
+                crossing += curve.at_infinity > 0
+                # le fichier --save relu (arbre recalculé par balayage) garde les mêmes nids
+                again = Arrangement.from_json(curve.arrangement.to_json())
+                assert again.parent == curve.arrangement.parent
+                assert len(again) + curve.pseudo_lines == curve.components
+        assert crossing > 20
+
+    def test_explicit_signs(self):
+        from hilbertB.patchwork import harnack_signs, patchwork
+        signs = harnack_signs(4)
+        assert signs[0, 0] == signs[2, 2] == 1 and signs[1, 0] == signs[3, 2] == -1
+        assert patchwork(4, signs=signs).as_dict() == patchwork(4, signs="harnack").as_dict()
+        assert 1 <= patchwork(4, signs=np.ones((5, 5), int)).components <= 4  # signes (±1)^i (±1)^j
+        with self.assertRaises(ValueError):
+            patchwork(4, signs=np.zeros((5, 5)))
+        with self.assertRaises(ValueError):
+            patchwork(4, signs="gudkov")
+
+    def test_sample_is_reproducible_across_workers(self):
+        from hilbertB.patchwork import sample
+        one = sample(6, 200, workers=1, seed=3, chunk=50)
+        two = sample(6, 200, workers=2, seed=3, chunk=50)
+        assert one["components"] == two["components"]
+        assert sum(one["components"].values()) == 200
+        assert max(one["components"]) <= 11
+        harnack = sample(5, 40, signs="harnack", workers=1)
+        assert harnack["m_curves"] == 40 and harnack["m_curve_rate"] == 1.0
+        assert harnack["top_schemes"][0] == ("J ⊔ 6", 40)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "m8.json")
+            out = subprocess.run([sys.executable, "app.py", "patchwork", "--degree", "8", "--signs", "harnack",
+                                  "--save", path, "--json"], cwd=ROOT, capture_output=True, text=True, timeout=60)
+            assert out.returncode == 0, out.stderr
+            assert json.loads(out.stdout)["components"] == 22
+            with open(path, encoding="utf-8") as f:
+                assert len(json.load(f)["ovals"]) == 22
+
+
+if __name__ == "__main__":
+    unittest.main()
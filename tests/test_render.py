@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from hilbertB.arrangement import Arrangement, example_arrangement
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@unittest.skipIf(matplotlib is None, "matplotlib requis")
+class TestRender(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_png_and_svg(self):
+        from hilbertB.render import render_arrangement
+        arr = example_arrangement()
+        arr.add_polygon([(1.2, -1.5), (1.8, -1.5), (1.5, -1.0)])
+        info = render_arrangement(arr, self.path("a.png"))
+        assert info == {"drawn": 6, "culled": 0, "vertices": 8}
+        with open(self.path("a.png"), "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+        render_arrangement(arr, self.path("a.svg"))
+        with open(self.path("a.svg"), encoding="utf-8") as f:
+            assert "<svg" in f.read()
+
+    def test_one_collection_per_kind(self):
+        from matplotlib.figure import Figure
+        from hilbertB.render import draw_arrangement
+        arr = Arrangement.from_circles((x * 3.0, 0, 1) for x in range(50))
+        arr.add_polygon([(0, 5), (1, 5), (1, 6)])
+        ax = Figure().add_subplot()
+        draw_arrangement(ax, arr)
+        assert len(ax.collections) == 2 and not ax.patches
+
+    def test_level_of_detail(self):
+        from hilbertB.render import render_arrangement
+        arr = Arrangement.from_circles([(0, 0, 100), (50, 50, 1e-3), (500, 500, 1)])
+        arr.add_polygon([(10 + 5 * (k % 2), 10 + k * 1e-3) for k in range(20000)][::2]
+                        + [(10, 30)])
+        info = render_arrangement(arr, self.path("lod.png"), box=(-110, 110, -110, 110), by_depth=False)
+        assert info["drawn"] == 2 and info["culled"] == 2  # trop petit, hors cadre
+        assert info["vertices"] < 1000  # polygone décimé
+
+    def test_directory_in_parallel(self):
+        from hilbertB.render import render_directory
+        src = self.path("src")
+        os.makedirs(src)
+        for k in range(3):
+            Arrangement.from_circles([(0, 0, 1), (0, 0, 0.5 + 0.1 * k)]).save(os.path.join(src, f"arr{k}.json"))
+        results = render_directory(src, self.path("img"), fmt="svg", workers=2)
+        assert [os.path.basename(r["out"]) for r in results] == ["arr0.svg", "arr1.svg", "arr2.svg"]
+        assert all(os.path.getsize(r["out"]) > 0 for r in results)
+
+    def test_app_plot_out(self):
+        out = self.path("fig.png")
+        run = subprocess.run([sys.executable, "app.py", "--problem", "Hilbert B", "--no-cache", "--plot", "--out", out],
+                             cwd=ROOT, capture_output=True, text=True, timeout=60,
+                             env=dict(os.environ, MPLBACKEND="", DISPLAY=""))
+        assert run.returncode == 0, run.stderr
+        assert os.path.getsize(out) > 0 and "Figure écrite" in run.stdout
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from results_store import ResultsStore
+
+DSL = "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\nDEFINE ◇ WITH a-b\n"
+RESPACED = "# même jeu\ndefine +O with ((a - 1) * (a - 2)) / 2 + 1\nDEFINE mao WITH a - b\n"
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "results.db")
+        self.store = ResultsStore(self.path, commit_every=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_record_and_query(self):
+        now = time.time()
+        self.store.record_run("partie A", "mock", "m", DSL, evals=[
+            {"expr": "6 ⊕ 6", "result": 11.0, "error": None, "ns": 2000},
+            {"expr": "6 opO 7", "result": 11.0, "error": None, "ns": 4000},
+            {"expr": "(6 ⊕ 6) ◇ 1", "result": 10.0, "error": None, "ns": 9000},
+        ], tests=[{"expr": "3 ◇ x", "result": None, "error": "Operands must be numeric", "ns": 500}],
+            timings={"total": 0.01}, ts=now - 10 * 86400)
+        self.store.record_run("partie A bis", "ollama", "llama3.1", RESPACED, evals=[
+            {"expr": "1 MAO 2", "result": -1.0, "error": None, "ns": 50000},
+            {"expr": "2 ◇ 2", "result": "nested", "error": None},
+        ], ts=now)
+        assert self.store.counts() == {"rulesets": 1, "runs": 2, "evals": 6}
+
+        digest = self.store.ruleset_hash(DSL)
+        assert self.store.ruleset_hash(RESPACED) == digest == self.store.resolve_ruleset(digest[:6])
+        rows = list(self.store.results(digest, "+O"))
+        assert [(r["expr"], r["a"], r["b"], r["result"]) for r in rows] == [("6 ⊕ 6", 6, 6, 11.0), ("6 opO 7", 6, 7, 11.0)]
+        assert rows[0]["dsl_hash"] == digest and rows[0]["kind"] == "eval"
+        assert sorted(str(r["result"]) for r in self.store.results(op="◇", since=now - 60)) == ["-1.0", "nested"]
+        errs = list(self.store.results(errors=True))
+        assert len(errs) == 1 and errs[0]["kind"] == "test" and errs[0]["op"] == "◇" and errs[0]["a"] is None
+
+        assert [(r["op"], r["calls"]) for r in self.store.slowest_laws()] == [("◇", 2), ("⊕", 2)]
+        week = self.store.slowest_laws(since=now - 7 * 86400)
+        assert len(week) == 1 and week[0]["mean_us"] == 50.0 and week[0]["dsl_hash"] == digest
+        with self.assertRaises(ValueError):
+            self.store.resolve_ruleset("zz")
+
+    def test_reopen_appends(self):
+        self.store.record_run("p", "mock", "m", DSL, evals=[{"expr": "1 ⊕ 1", "result": 1.0, "error": None}])
+        self.store.close()
+        with ResultsStore(self.path) as store:
+            store.record_run("p", "mock", "m", DSL, error="Aucune DSL reçue")
+            store.record_run("q", "mock", "m", "")
+            assert store.counts() == {"rulesets": 1, "runs": 3, "evals": 1}
+
+
+class TestAppStore(unittest.TestCase):
+    def test_main_and_batch_record_runs(self):
+        import app
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "r.db")
+            inp = os.path.join(tmp, "p.jsonl")
+            with open(inp, "w", encoding="utf-8") as f:
+                f.write('{"id": "a", "problem": "partie A"}\n{"id": "b", "problem": "partie B"}\n')
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                app.main(["--problem", "partie A", "--no-cache", "--store", db, "--test", "6 ⊕ 6"])
+                assert app.main(["batch", "--in", inp, "--out", os.path.join(tmp, "o.jsonl"),
+                                 "--no-cache", "--store", db]) == 0
+            with ResultsStore(db) as store:
+                runs = store.db.execute("SELECT problem, provider FROM runs ORDER BY id").fetchall()
+                assert runs[0] == ("partie A", "mock") and sorted(runs[1:]) == [("partie A", "mock"), ("partie B", "mock")]
+                tests = [r for r in store.results(op="⊕") if r["kind"] == "test"]
+                assert [(t["expr"], t["result"]) for t in tests] == [("6 ⊕ 6", 11.0)] and tests[0]["ns"] > 0
+                assert store.counts()["rulesets"] == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
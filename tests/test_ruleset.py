@@ -0,0 +1,85 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from rule_engine import RuleEngine, EvaluationError
+
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ⊗ WITH 1 if b<=a else 0\n"
+    "DEFINE ◇ WITH a-b\n"
+    "DEFINE τ WITH 1 if (a-b) >= 2 else 0\n"
+    "SELECT χ WITH { a+b ; a-b } USING ORIENTATION -\n"
+    "DEFINE ♣ WITH a*b\n"
+)
+
+
+class TestRuleSet(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine()
+        self.engine.load_rules_from_text(DSL)
+        self.rules = self.engine.freeze()
+
+    def test_every_spelling_matches_the_engine(self):
+        tokens = ["⊕", "opo", "OPO", "oPo", "+O", "+o", "O+", "oplus", "OPLUS", "OpLuS", "*O", "OTIMES",
+                  "◇", "MAO", "mO", "τ", "tho", "tO", "χ", "coo", "cO", "CO", "♣"]
+        for tok in tokens:
+            expr = f"7 {tok} 3"
+            assert self.rules.evaluate_expression(expr) == self.engine.evaluate_expression(expr), tok
+        assert self.rules.evaluate("χ", 7, 3) == 4  # orientation '-' déjà appliquée
+        assert self.rules.evaluate_expression("((8 ⊕ 8) ◇ 20) τ 0") == 1
+
+    def test_undefined_and_disabled(self):
+        self.engine.load_rules_from_text("DISABLE ◇")
+        rules = self.engine.freeze()
+        assert "◇" in rules.disabled and "mao" not in rules and "mao" in self.rules
+        for tok in ("◇", "♠", "nope"):
+            with self.assertRaises(EvaluationError):
+                rules.evaluate_expression(f"1 {tok} 2")
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.rules.version = 7
+        with self.assertRaises(TypeError):
+            self.rules.dispatch["⊕"] = max
+
+    def test_published_on_change_only(self):
+        assert self.engine.freeze() is self.rules
+        self.engine.load_rules_from_text(DSL)  # rien ne change
+        assert self.engine.freeze() is self.rules
+        f = self.rules.compile_expression("(n ⊕ n) ◇ k")
+        self.engine.load_rules_from_text("REPLACE ⊕ WITH a+b")
+        new = self.engine.freeze()
+        assert new.version == self.rules.version + 1
+        assert self.rules.evaluate("⊕", 6, 6) == 11 and new.evaluate("⊕", 6, 6) == 12
+        assert f(n=6, k=1) == 10  # lié à l'ancien snapshot
+
+    def test_readers_see_whole_snapshots_during_reloads(self):
+        # chaque bloc change ⊕ et ⊗ ensemble : un snapshot ne doit jamais mélanger deux blocs
+        stop = threading.Event()
+
+        def writer():
+            k = 0
+            while not stop.is_set():
+                k += 1
+                self.engine.load_rules_from_text(f"DEFINE ⊕ WITH a+{k}\nDEFINE ⊗ WITH b+{k}")
+
+        def reader(_):
+            bad = 0
+            for _ in range(2000):
+                rules = self.engine.freeze()
+                bad += rules.evaluate("+O", 0.0, 0.0) != rules.evaluate("*O", 0.0, 0.0)
+            return bad
+
+        t = threading.Thread(target=writer)
+        t.start()
+        try:
+            with ThreadPoolExecutor(8) as ex:
+                assert sum(ex.map(reader, range(8))) == 0
+        finally:
+            stop.set()
+            t.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import time
+import unittest
+from unittest import mock
+
+import rule_engine
+from rule_engine import EvaluationError, RuleEngine
+from sandbox import LawBudgetExceeded, SandboxPool
+
+DSL = (
+    "DEFINE ⊕ WITH ((a-1)*(a-2))/2 + 1\n"
+    "DEFINE ◇ WITH a/b\n"
+    "DEFINE ♣ WITH math.factorial(int(b))\n"   # 1e8 : des minutes de calcul
+    "DEFINE ♠ WITH str(a) * int(b)\n"          # 1e10 : 30 Go d'un coup
+)
+
+
+class TestSandboxPool(unittest.TestCase):
+    def setUp(self):
+        self.sb = SandboxPool(DSL, workers=2, timeout=0.2, memory_mb=64, max_strikes=2, batch_size=16)
+        self.ref = RuleEngine()
+        self.ref.load_rules_from_text(DSL)
+
+    def tearDown(self):
+        self.sb.close()
+
+    def test_batches_match_in_process(self):
+        exprs = [f"{n} ⊕ {n % 7}" for n in range(100)] + ["1 ◇ 0", "3 ♣ 5", "(6 ⊕ 6) ◇ 2", "1 nope 2"]
+        out = self.sb.evaluate_many(exprs)
+        for e, r in zip(exprs[:100], out):
+            assert r == {"expr": e, "result": self.ref.evaluate_expression(e), "error": None}
+        assert out[100]["result"] is None and "division" in out[100]["error"]
+        assert out[101]["result"] == 120 and out[102]["result"] == 5.5
+        assert out[103]["error"] is not None
+        assert self.sb.evaluate_many([]) == []
+
+    def test_timeout_kills_worker_and_keeps_the_batch(self):
+        exprs = [f"{n} ⊕ 0" for n in range(10)] + ["1 ♣ 1e8"] + [f"{n} ⊕ 0" for n in range(10, 20)]
+        out = self.sb.evaluate_many(exprs)
+        assert "time budget" in out[10]["error"] and "♣" in out[10]["error"]
+        assert [r["result"] for i, r in enumerate(out) if i != 10] == [
+            self.ref.evaluate_expression(e) for i, e in enumerate(exprs) if i != 10]
+        assert self.sb.restarts == 1 and self.sb.strikes == {"♣": 1}
+        assert self.sb.evaluate_expression("6 ♣ 4") == 24  # pas encore désactivée
+
+    @unittest.skipIf(not os.path.exists("/proc/self/statm"), "RLIMIT_AS appliqué sous Linux seulement")
+    def test_memory_budget(self):
+        with self.assertRaises(LawBudgetExceeded):
+            self.sb.evaluate_expression("1 ♠ 1e10")
+        assert self.sb.evaluate_expression("1 ♠ 2") == "1.01.0"
+        assert self.sb.restarts == 0  # MemoryError rattrapée dans le worker
+
+    def test_repeat_offender_is_disabled(self):
+        for _ in range(2):
+            with self.assertRaises(LawBudgetExceeded):
+                self.sb.evaluate_expression("1 ♣ 1e8")
+        assert self.sb.disabled == ["♣"] and not self.sb.engine.ops["♣"]["enabled"]
+        with self.assertRaises(EvaluationError) as cm:
+            self.sb.evaluate_expression("1 ♣ 3")
+        assert "disabled" in str(cm.exception)
+        assert self.sb.evaluate_expression("6 ⊕ 6") == 11
+
+    def test_parent_only_checks_the_dsl(self):
+        with self.assertRaises(EvaluationError):
+            SandboxPool("DEFINE ⊕ WITH os.system('x')", workers=1)
+        t = time.perf_counter()
+        with SandboxPool("DEFINE ⊕ WITH (((9**64)**64)**64)**64 + a\nDEFINE ⊗ WITH a*b", workers=1,
+                         timeout=0.5) as sb:
+            assert time.perf_counter() - t < 5
+            assert sb.ops == ("⊕", "⊗")
+            with self.assertRaises(EvaluationError):
+                sb.engine.evaluate_expression("2 ⊗ 3")  # rien n'est compilé dans le parent
+            with self.assertRaises(EvaluationError):  # délai dépassé ou OverflowError, dans le worker
+                sb.evaluate_expression("0 ⊕ 1")
+            assert sb.evaluate_expression("2 ⊗ 3") == 6
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "patch hérité par fork")
+    def test_compile_time_is_budgeted(self):
+        compile_law = rule_engine.compile_law
+
+        def slow(expr, law_globals):  # une loi dont la compilation ne termine pas
+            if "9**64" in expr:
+                time.sleep(30)
+            return compile_law(expr, law_globals)
+
+        with mock.patch("rule_engine.compile_law", slow):
+            t = time.perf_counter()
+            with SandboxPool("DEFINE ⊕ WITH 9**64 + a\nDEFINE ⊗ WITH a*b", workers=1, timeout=0.2) as sb:
+                out = sb.evaluate_many(["2 ⊗ 3", "1 ⊕ 1", "4 ⊗ 5"])
+        assert time.perf_counter() - t < 10
+        assert [r["result"] for r in out] == [6, None, 20]
+        assert "time budget" in out[1]["error"] and sb.strikes == {"⊕": 1}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from hilbertB.arrangement import Arrangement, example_arrangement
+from hilbertB.schemes import canonical_code, enumerate_schemes, parse_code, schemes, viro
+from rule_engine import RuleEngine
+from sweep import default_dsl
+
+
+class TestCanonicalForms(unittest.TestCase):
+    def test_code_and_viro(self):
+        code = canonical_code(example_arrangement())
+        assert code == "((()))()()"
+        assert viro(code) == example_arrangement().scheme() == "2 ⊔ 1<1<1>>"
+        assert parse_code("(())()") == [[[]], []]
+        assert viro("") == "0" and viro("", odd=True) == "J" and viro("()", odd=True) == "J ⊔ 1"
+        with self.assertRaises(ValueError):
+            parse_code("(()")
+
+    def test_isomorphic_arrangements_share_a_code(self):
+        a = Arrangement.from_circles([(0, 0, 3), (-1, 0, 0.5), (1, 0, 0.8), (1, 0, 0.3), (9, 0, 1)])
+        b = Arrangement.from_circles([(5, 5, 1), (0, 0, 4), (2, 0, 1.5), (2, 0, 1), (-2, 0, 1)])
+        assert canonical_code(a) == canonical_code(b) == "((())())()"
+
+
+class TestSchemes(unittest.TestCase):
+    def test_low_degrees(self):
+        assert [r["scheme"] for r in schemes(4)] == ["0", "1", "1<1>", "2", "3", "4"]
+        assert sorted(r["scheme"] for r in schemes(5))[:3] == ["J", "J ⊔ 1", "J ⊔ 1<1>"]
+        assert max(r["ovals"] for r in schemes(5)) == 6  # J compte parmi les H(5) = 7 composantes
+
+    def test_sextics(self):
+        found = {r["scheme"]: r for r in schemes(6)}
+        assert len(found) == len(schemes(6))  # pas de doublon isomorphe
+        assert "1<1<1>>" in found and "1 ⊔ 1<9>" in found and "10" in found
+        assert "11" in found and "12" not in found  # Harnack : H(6) = 11 (⊗)
+        assert "1<1> ⊔ 1<1>" not in found  # Bézout : une droite couperait 4 ovales deux fois
+        assert "1 ⊔ 1<1<1>>" not in found
+        assert found["1 ⊔ 1<9>"]["margin"] == 0.0 and found["10"]["threshold"] == 0
+
+    def test_engine_rules_drive_the_search(self):
+        engine = RuleEngine()
+        engine.load_rules_from_text(default_dsl() + "\nDEFINE τ WITH 0\nDEFINE ⊗ WITH 1 if b <= 5 else 0")
+        found = [r["scheme"] for r in schemes(6, engine)]
+        assert found == ["0", "1", "2", "3", "4", "5"]  # pas de nid, au plus 5 ovales
+
+    def test_degrees_6_to_8_are_fast(self):
+        t0 = time.perf_counter()
+        counts = [len(schemes(n)) for n in (6, 7, 8)]
+        assert time.perf_counter() - t0 < 10
+        assert counts == [68, 122, 6049]
+
+    def test_stream_and_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "s7.jsonl")
+            info = enumerate_schemes(7, out, workers=2)
+            assert info["schemes"] == info["written"] == 122
+            with open(out, encoding="utf-8") as f:
+                full = f.read()
+            with open(out + ".ckpt", encoding="utf-8") as f:
+                ckpt = f.read().splitlines()
+            # interruption : moitié des sous-arbres notés, dernière ligne coupée
+            with open(out, "w", encoding="utf-8") as f:
+                f.write(full[:len(full) // 2])
+            with open(out + ".ckpt", "w", encoding="utf-8") as f:
+                f.write("\n".join(ckpt[:len(ckpt) // 2]) + "\n")
+            info = enumerate_schemes(7, out, workers=1)
+            assert info["skipped"] == len(ckpt) // 2 - 1 and info["schemes"] == 122
+            with open(out, encoding="utf-8") as f:
+                codes = [json.loads(line)["code"] for line in f]
+            assert sorted(codes) == sorted(r["code"] for r in schemes(7))
+            with self.assertRaises(ValueError):
+                enumerate_schemes(6, out)  # checkpoint d'un autre degré
+
+
+if __name__ == "__main__":
+    unittest.main()
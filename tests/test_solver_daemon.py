@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import rule_engine
+
+from rule_engine import EvaluationError
+from solver_cli import evaluate_remote, _request
+from solver_daemon import SolverState, UnknownRuleset, make_server
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestSolverDaemon(unittest.TestCase):
+    def setUp(self):
+        self.server = make_server("127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_single_and_batched_eval(self):
+        res = evaluate_remote(self.url, ["6 ⊕ 6", "3 Δ 2", "1 zz 2", "(n ⊕ 4"])
+        assert [r["result"] for r in res[:2]] == [11.0, "separated"]
+        assert res[2]["error"] == "Operation 'zz' is not defined or disabled"
+        assert res[3]["result"] is None and res[3]["error"]
+
+    def test_dsl_upload_is_incremental_and_engine_stays_hot(self):
+        out = _request(self.url, "/rules", {"dsl": "DEFINE ⊕ WITH a*b", "ruleset": "r"})
+        assert out["changed"] == ["⊕"]
+        assert evaluate_remote(self.url, ["3 ⊕ 4"], ruleset="r")[0]["result"] == 12
+        engine = self.server.RequestHandlerClass.state.engine("r")
+        out = _request(self.url, "/rules", {"dsl": "DEFINE ◇ WITH a-b", "ruleset": "r"})
+        assert out["changed"] == ["◇"] and out["ops"] == ["⊕", "◇"]
+        assert self.server.RequestHandlerClass.state.engine("r") is engine
+        assert evaluate_remote(self.url, ["(3 ⊕ 4) ◇ 2"], ruleset="r")[0]["result"] == 10
+        # le jeu par défaut n'est pas touché
+        assert evaluate_remote(self.url, ["3 ⊕ 4"])[0]["result"] == 2.0
+
+    def test_unnamed_upload_and_errors(self):
+        first = _request(self.url, "/rules", {"dsl": "DEFINE ○ WITH 7"})
+        again = _request(self.url, "/rules", {"dsl": "DEFINE ○ WITH 7"})
+        assert first["ruleset"] == again["ruleset"] and again["changed"] == []
+        for path, body in (("/rules", {"dsl": "DEFINE ⊕ WITH a*"}), ("/eval", {"expr": "1 ⊕ 1", "ruleset": "nope"})):
+            with self.assertRaises(OSError):
+                _request(self.url, path, body)
+
+    def test_concurrent_clients(self):
+        exprs = [f"{n} ⊕ 0" for n in range(1, 41)]
+        with ThreadPoolExecutor(8) as ex:
+            results = list(ex.map(lambda e: evaluate_remote(self.url, [e])[0]["result"], exprs))
+        assert results == [(n - 1) * (n - 2) / 2 + 1 for n in range(1, 41)]
+        assert _request(self.url, "/stats")["ops"]["⊕"]["calls"] == 40
+
+    def test_cli_uses_server_and_falls_back(self):
+        def cli(*args, env=None):
+            return subprocess.run([sys.executable, "solver_cli.py", *args], cwd=ROOT, env=env,
+                                  capture_output=True, text=True, check=True).stdout
+        _request(self.url, "/rules", {"dsl": "REPLACE ⊕ WITH 42", "ruleset": "default"})
+        assert cli("6 ⊕ 6", "--server", self.url) == "6 ⊕ 6 => 42\n"
+        env = dict(os.environ, SOLVER_DAEMON=self.url)
+        assert cli("6 ⊕ 6", env=env) == "6 ⊕ 6 => 42\n"
+        assert cli("6 ⊕ 6", "--local", env=env) == "6 ⊕ 6 => 11.0\n"
+        assert cli("6 ⊕ 6", "--server", "http://127.0.0.1:1") == "6 ⊕ 6 => 11.0\n"
+
+
+class TestSolverState(unittest.TestCase):
+    def test_changed_without_engines_and_bounded_rulesets(self):
+        state = SolverState(max_rulesets=3)
+        assert state.load("DEFINE ⊕ WITH a*b", "r")["changed"] == ["⊕"]
+        out = state.load("DEFINE ◇ WITH a-b\nREPLACE ⊕ WITH a*b", "r")  # aucun moteur construit
+        assert out["changed"] == ["◇"] and out["ops"] == ["⊕", "◇"]
+        assert state.load("DELETE ◇", "r")["changed"] == ["◇"]
+        with self.assertRaises(EvaluationError):
+            state.load("REPLACE ◇ WITH 1", "r")
+        assert state.load("DEFINE ◇ WITH 2*a", "r")["changed"] == ["◇"]
+        assert state.evaluate(["3 ⊕ 4", "3 ◇ 0"], "r")[1]["result"] == 6
+
+        names = [state.load(f"DEFINE ○ WITH {k}")["ruleset"] for k in range(4)]
+        assert list(state.sources) == ["default", names[2], names[3]]
+        with self.assertRaises(UnknownRuleset):
+            state.engine(names[0])
+        assert state.evaluate(["1 ○ 1"], names[3])[0]["result"] == 3
+
+    def test_appends_are_compacted(self):
+        state = SolverState()
+        state.load("DEFINE ⊕ WITH a*b\nSELECT ◇ WITH { a-b ; b-a } USING ORIENTATION -", "r")
+        hot = state.engine("r")
+        for k in range(50):
+            state.load(f"REPLACE ⊕ WITH a*b + {k}", "r")
+        state.load("DISABLE ◇", "r")
+        assert state.sources["r"] == [
+            "DEFINE ⊕ WITH a*b + 49\nSELECT ◇ WITH { a-b ; b-a } USING ORIENTATION -\nDISABLE ◇"]
+        fresh = state.engine("r", "-")
+        for engine in (hot, fresh):
+            assert engine.evaluate_expression("2 ⊕ 3") == 55
+            assert not engine.ops["◇"]["enabled"]
+
+    def test_engines_are_built_outside_the_lock(self):
+        state = SolverState()
+        state.load("DEFINE ⊕ WITH 9**64 + a", "slow")
+        compile_law = rule_engine.compile_law
+
+        def slow(expr, law_globals):
+            if "9**64" in expr:
+                time.sleep(1.0)
+            return compile_law(expr, law_globals)
+
+        with mock.patch("rule_engine.compile_law", slow):
+            builder = threading.Thread(target=state.engine, args=("slow",))
+            builder.start()
+            time.sleep(0.1)
+            t = time.perf_counter()
+            assert state.evaluate(["6 ⊕ 6"], "default", "-")[0]["result"] == 11
+            assert time.perf_counter() - t < 0.5
+            builder.join()
+        assert ("slow", "+") in state._engines
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY = ("matplotlib", "requests", "numpy")
+
+
+def loaded_heavy_modules(code):
+    out = subprocess.run(
+        [sys.executable, "-c", code + f"\nimport sys; print('HEAVY:' + ','.join(m for m in {HEAVY!r} if m in sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    return out[-1][len("HEAVY:"):]
+
+
+class TestLazyStartup(unittest.TestCase):
+    def test_import_app_is_light(self):
+        self.assertEqual(loaded_heavy_modules("import app"), "")
+
+    def test_mock_run_without_plot_is_light(self):
+        code = "import app; app.main(['--problem', 'partie A', '--no-cache'])"
+        self.assertEqual(loaded_heavy_modules(code), "")
+
+    def test_provider_loaded_only_when_selected(self):
+        code = ("from providers.registry import create_provider\n"
+                "create_provider('mock')\n"
+                "import sys; assert 'providers.ollama_provider' not in sys.modules")
+        loaded_heavy_modules(code)
+
+    def test_registry(self):
+        from providers.registry import register_provider, create_provider, builtin_providers
+        from providers.mock_provider import MockProvider
+        self.assertEqual(builtin_providers()[:3], ["mock", "ollama", "openrouter"])
+        register_provider("mock2", "providers.mock_provider:MockProvider")
+        self.assertIsInstance(create_provider("mock2", model="x"), MockProvider)
+        with self.assertRaises(KeyError):
+            create_provider("inexistant")
+
+if __name__ == "__main__":
+    unittest.main()
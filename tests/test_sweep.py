@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from law_compiler import load_numpy
+from rule_engine import RuleEngine
+from sweep import default_dsl, main as sweep_main, parse_axis, run_sweep
+
+np = load_numpy()
+
+
+class TestSweepAxes(unittest.TestCase):
+    def test_parse_axis(self):
+        assert parse_axis("1:11") == range(1, 11)
+        assert parse_axis("0:10:3") == range(0, 10, 3)
+        assert parse_axis("1,2,5") == (1.0, 2.0, 5.0)
+        assert parse_axis("4") == (4.0,)
+        with self.assertRaises(ValueError):
+            parse_axis("1:2:3:4")
+
+
+@unittest.skipIf(np is None, "numpy requis")
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = RuleEngine()
+        self.engine.load_rules_from_text(default_dsl())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_zip_npy_matches_scalar_engine(self):
+        info = run_sweep("⊕", range(1, 5001), (0.0,), self.path("h.npy"), "npy", workers=1, chunk_cells=700)
+        h = np.load(self.path("h.npy"), mmap_mode="r")
+        assert info["shape"] == [5000] and info["chunks"] == 8
+        for n in (1, 2, 6, 4999, 5000):
+            assert h[n - 1] == self.engine.evaluate_expression(f"{n} ⊕ 0")
+
+    def test_grid_memmap_with_process_pool(self):
+        a, b = range(3, 40), range(0, 25, 2)
+        run_sweep("τ", a, b, self.path("t.dat"), "memmap", grid=True, workers=2, chunk_cells=50)
+        meta = json.load(open(self.path("t.dat") + ".json"))
+        t = np.memmap(self.path("t.dat"), dtype=meta["dtype"], mode="r", shape=tuple(meta["shape"]))
+        assert t.shape == (37, 13)
+        for i, x in enumerate(a):
+            for j, y in enumerate(b):
+                assert t[i, j] == self.engine.evaluate_expression(f"{x} τ {y}")
+
+    def test_csv_keeps_order_and_non_numeric_results(self):
+        dsl = default_dsl("partie B")
+        run_sweep("Δ", range(1, 9), (4.0,), self.path("d.csv"), "csv", workers=2, chunk_cells=3, dsl=dsl)
+        lines = open(self.path("d.csv"), encoding="utf-8").read().splitlines()
+        assert lines[0] == "a,b,Δ"
+        assert lines[1:4] == ["1,4,nested", "2,4,nested", "3,4,nested"]
+        assert lines[-1] == "8,4,separated" and len(lines) == 9
+        with self.assertRaises(ValueError):
+            run_sweep("Δ", range(1, 3), (4.0,), self.path("d.npy"), "npy", workers=1, dsl=dsl)
+
+    def test_mixed_result_types_are_caught(self):
+        dsl = "DEFINE ⊕ WITH a if a < 900 else 'grand'\nDEFINE ◇ WITH str(a) if a == 777 else a\nDEFINE ○ WITH 1/(a-3)\n"
+        with self.assertRaises(ValueError):  # vu par la sonde (dernière cellule)
+            run_sweep("⊕", range(1, 1000), (0.0,), self.path("p.npy"), "npy", workers=1, dsl=dsl)
+        with self.assertRaisesRegex(ValueError, "rows 700:800"):  # entre deux cellules sondées
+            run_sweep("◇", range(1, 5001), (0.0,), self.path("q.npy"), "npy", workers=1, chunk_cells=100, dsl=dsl)
+        run_sweep("⊕", range(895, 905), (0.0,), self.path("p.csv"), "csv", workers=1, dsl=dsl)
+        assert open(self.path("p.csv"), encoding="utf-8").read().splitlines()[-1] == "904,0,grand"
+        with open(self.path("r.dsl"), "w", encoding="utf-8") as f:
+            f.write(dsl)
+        with contextlib.redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit):
+            sweep_main(["--op", "○", "--a", "1:10", "--out", self.path("z.npy"), "--dsl", self.path("r.dsl"),
+                        "--workers", "1"])
+        assert "ZeroDivisionError" in err.getvalue()
+
+    def test_zip_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            run_sweep("◇", range(5), range(4), self.path("x.npy"), workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()